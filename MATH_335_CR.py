@@ -1,37 +1,242 @@
 # Repository available
 # https://github.com/CyCodeDev/Monty_Hall_Simulation
 # 
-import random
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, ttk
 import threading
+import math
+import os
+import time
+from array import array
+import numpy as np
+
+# Simulation core lives in the Tk-free montyhall package
+from montyhall import (
+    CHUNK, COMPARE_FIELDS, PlayMonteHall, check_doors, exact_win_probability, new_seed,
+    paired_difference_interval, simulate_until, wilson_interval,
+)
+from montyhall.cache import DEFAULT_CACHE_PATH, ResultCache, cached_simulate
+from montyhall.estimate import ESTIMATORS, estimate, exact_estimate, plain_standard_error
+from montyhall.ensemble import BAND, REPLICATE_CHUNK, coverage, ensemble_bands, envelope
+from montyhall.instrument import Instruments, phase
+from montyhall.parallel import compare, ensemble, estimate_run, tournament
+from montyhall.progress import RunProgress
+from montyhall.runner import RunControl, SimulationRun
+from montyhall.trace import TraceStore
+from montyhall.tournament import AGENT_CHUNK, STRATEGIES
+from montyhall.export import TableWriter, write_table
 
 
 DOOR = ["Door 1", "Door 2", "Door 3"]
+
+# The UI redraws simulate-mode progress at this fixed rate, however fast the
+# engine produces it
+FRAME_MS = 33
+
+# Fixed-N simulate runs save themselves here so they survive Cancel or closing
+# the window, and can be picked up again with "Resume saved run"
+CHECKPOINT_PATH  = os.path.join(os.path.expanduser("~"), ".montyhall_checkpoint.json")
+CHECKPOINT_EVERY = 10.0     # seconds
+
+# How often the Diagnostics panel is rewritten while a run is going
+DIAG_EVERY = 0.5            # seconds
+
+# Line colour of each estimator on the graph
+ESTIMATOR_COLOURS = {"plain": "#69ff47", "stratified": "#4fc3f7", "antithetic": "#ce93d8"}
+
+# Line colour of each tournament strategy's learning curve
+STRATEGY_COLOURS = {"epsilon_greedy": "#69ff47", "thompson": "#4fc3f7",
+                    "win_stay_lose_shift": "#ce93d8"}
+
+# Ensemble graph: median path, shaded percentile band and 1/sqrt(N) envelope
+ENSEMBLE_COLOURS = {"median": "#69ff47", "band": "#2e4a30", "envelope": "#4fc3f7"}
+
+# The Play console keeps this many rows (older ones are dropped) and draws
+# only the ones that fit in the widget
+CONSOLE_ROWS = 10_000
+
+# ASCII art printed under each Play result
+GOAT_ART = """
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢠⣤⣀⠀⠀⠀⢰⡶⣦⠀⠀⠀⣰⣾⣿⡄⠀⠀⣠⣴⣄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⠀⠀⠀⠀⢀⣿⠉⢻⣷⡄⢀⣿⠷⠻⣿⠁⠸⠋⠉⢹⡇⠀⡾⠛⢻⡿⠀⣤⡾⣻⠇⠀⠀⢠⡶⠀⠀⡀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣠⣤⣤⣤⣤⡀⠀⠀⠀⣿⡿⣦⣄⡀⣴⡿⠟⠋⠙⠿⠙⠉⠀⠀⠀⡀⠀⠀⠀⠀⠀⠀⠀⠀⠈⠁⠛⠉⢻⡟⠀⠠⣴⣿⡀⣠⡞⠁⢀⣴⠆⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣴⣿⠋⠁⠀⣠⡟⠁⠀⠀⠀⣽⣿⠟⠻⡶⠈⠗⠀⠀⠀⠀⠀⣀⣠⣴⣪⣡⣾⣷⡿⣷⣾⣿⣿⣟⣃⠀⠀⠀⠈⠀⠀⣾⠏⣨⣿⠋⢀⣴⠟⠁⣀⣴⠞
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠉⠻⣷⣴⠿⠛⠛⠛⠛⣷⡄⠸⣷⠀⠀⠀⠀⠀⠀⠀⠀⠘⢧⣿⣿⠛⣟⣿⣏⣤⠾⠿⠾⠷⣶⣌⠁⠀⠀⠀⠀⠀⠀⠀⢴⠟⠁⠀⠛⠁⣠⡾⠋⠁⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢻⣿⡄⠀⠀⠀⠀⣼⡟⠀⠁⠀⠀⠀⠀⢀⣤⡴⠶⠛⠛⠋⠉⠉⠀⠀⠀⠀⠑⠄⢀⠀⠀⠉⢳⣄⡀⠀⠀⠀⠀⠀⠀⠀⠐⠟⣀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢿⣿⣀⣀⣠⣼⠟⠀⠀⠀⠀⠀⠀⢀⣿⠃⢀⡀⣀⣤⠤⠤⢤⣀⠀⠀⠀⣀⡿⢧⠤⣄⠛⠛⠛⠛⠻⣄⠀⠀⠀⠀⠀⠀⠘⠛⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠰⠾⠿⠛⠛⠋⠁⠀⠀⠀⠀⠀⠀⢰⣿⣃⣴⠛⠋⠁⠀⠀⠀⠀⠈⠘⢦⡈⠁⠀⠀⠐⠒⠀⠠⣴⠓⠛⠛⣄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢶⣿⡇⠁⠁⡤⢐⣴⣦⣤⡀⠀⠀⠀⠈⠻⣄⠀⠀⠀⠀⠁⠀⠈⢻⡟⢻⡿⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣠⣤
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⣠⡴⠞⢻⡇⠀⠀⣴⣡⣤⣤⣮⢻⡄⠀⠀⠀⠀⠀⢹⡄⠀⠀⠀⠀⠀⠀⠙⢾⡷⡦⣤⣄⣀⣀⣀⣀⣀⣀⡤⠞⠉⣻
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣀⣠⣤⠤⠶⠚⠛⠉⠀⠀⠀⢸⡇⠀⠠⣿⠛⠛⠛⢉⣸⠇⠀⠀⠀⠀⠀⠀⠸⠄⠀⠀⠀⠀⠀⠀⠈⠛⢮⠊⠀⠉⠉⠉⠉⠉⠁⠀⠀⣰⡇
+⣀⣀⣀⣀⣀⣀⣤⣤⡤⠴⠶⠚⠛⠋⠉⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠈⢷⠀⠀⠈⢻⣒⣒⣫⠏⡀⠀⠀⠀⠀⠀⠀⠀⠀⢀⡶⠛⠛⠛⠛⢿⠛⠉⣷⡀⠀⠀⠀⠀⠀⠀⠀⣸⠋⠀
+⣭⣿⠍⠉⠉⠉⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⡀⠄⠐⠫⠀⢸⡇⠀⠻⠽⠁⠈⠁⠀⠀⠀⠀⢀⡶⠦⠀⠸⣤⠞⣻⠆⠀⠈⡀⣴⠟⢳⣀⣀⠀⠀⢀⣠⠜⠃⠀⠀
+⡼⠻⣦⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣤⢾⡥⠤⣤⣀⠀⠀⠘⣧⡀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣞⠁⠀⠀⠀⠀⠈⠙⢦⣀⣀⣡⠏⠀⢨⠇⠉⠉⠉⠉⠁⠀⠀⠀⠀
+⠀⠀⠈⠛⢦⣀⣀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⣠⠴⠋⠁⠀⠀⠀⣿⠈⠀⠀⠀⠀⠉⠛⣦⣀⠀⠀⠀⠀⠀⠀⠀⠀⣀⣀⣀⠀⠀⠀⠀⠉⢽⠁⠀⣠⠞⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠈⠉⠛⠛⠛⠛⠛⠛⠛⠋⠉⠉⠁⠀⠀⠀⠀⠀⢸⣿⠀⠀⠀⢰⡀⠀⠀⠏⠫⠀⠀⠀⠀⢀⠀⣴⣋⣽⣿⣉⣹⡟⠒⠶⠤⢤⠶⣺⠟⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠠⢾⡿⠀⠀⠀⠀⣷⠀⠀⠀⠀⠀⠀⠀⠀⡞⣸⣿⣿⣿⣿⣿⣿⣿⣷⣶⣶⠛⠋⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢴⣿⠇⠀⠀⠀⠀⠹⣷⡀⠀⠀⠀⠀⢠⣎⠀⣿⣿⣿⣿⣿⣿⣿⣿⣿⣿⡃⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣻⡟⠀⠀⠀⠀⠀⠀⠹⣿⡀⠀⠀⠀⠀⠙⡆⢿⡿⢿⣻⢍⠉⠉⠙⠲⣄⠉⠻⣄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠠⢾⡟⠀⠀⠀⠀⠀⠀⠀⠀⠹⣿⣄⠀⠀⠀⠀⠀⢸⣧⡟⢹⣦⡠⠀⠀⠀⠈⢣⠀⠙⢦⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣽⠃⠀⠀⠀⠀⠀⠀⠀⠀⠀⠘⣿⣄⠀⠀⠀⠀⠀⢣⣳⣞⢀⡟⢧⡄⠀⠀⠀⠛⡂⠀⠻⣄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢹⡆⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠈⢿⣦⡀⠀⠀⠀⠀⠙⢿⣿⡧⣯⣙⡾⣗⡤⠤⣀⣀⣀⡿⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠘⣧⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣿⣿⣦⠀⠀⠀⠀⠀⠈⠛⢳⣮⣥⣥⣭⣿⣿⣿⠋⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢹⡆⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠘⣿⣿⣷⣦⡀⢀⣀⢀⢀⣴⢾⣷⡶⠞⠛⠋⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢻⡄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠘⣿⣿⣿⣿⣿⣿⣻⢆⠞⠰⣽⢿⣍⢢⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠻⣆⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣿⡿⢿⣿⣿⠙⣿⡾⡆⠃⠈⢧⡟⡇⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠙⢧⡄⠀⠀⠀⠀⠀⠀⠀⣠⠞⠁⠀⢸⡿⠃⠀⡏⢇⡟⡄⢠⡟⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠙⠳⢤⣀⠀⠀⠰⠊⠀⠀⠀⢠⡿⠃⠀⠘⠀⡿⣸⡃⠻⢷⣶⣒⠲⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠈⠑⠢⣄⠀⠀⠀⢠⡟⠁⠀⠀⠀⠀⠷⣿⣷⣶⣖⡒⣿⠄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠉⠐⣰⠋⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠈⠋⠃⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+"""
+CAR_ART = """
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣠⠴⠖⠛⠛⠛⠛⠛⠛⠛⠛⠛⠛⠛⠛⠛⠻⠿⢿⣿⠽⠽⠿⢷⣒⠦⢄⣀⣀⣀⣀⣀⣀⡀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣠⠞⠉⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢠⠏⡟⠀⠀⠀⠀⠈⢹⡛⢮⡻⣏⠙⢿⡿⠿⠇⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⡴⠋⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢠⠏⣸⠀⠀⠀⠀⠀⠀⠈⢧⣀⡙⡎⠳⣿⣀⣀⣀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⣀⣀⣀⣤⣴⠾⠯⠤⠤⠤⠤⠤⠤⢤⣤⣤⠤⠀⠀⠀⠀⠀⠀⣀⣀⣀⣀⣀⣞⣀⣏⣧⣄⣀⡈⠹⠖⠒⠛⠳⣍⣀⣀⡤⠤⠝⠛⢷⡀⠀
+⠀⠀⠀⠀⠀⠀⠀⢀⣀⣤⠤⠶⠛⠋⠉⠘⠋⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠉⠉⠁⠀⠀⣀⡠⢤⠤⠖⠚⠛⢉⣉⠀⠀⠈⡇⠙⠋⠀⣀⣀⠤⠴⠒⠋⠉⡇⠀⠀⠀⣀⢀⡈⢧⠀
+⠀⠀⠀⠀⣠⣶⣾⡿⠋⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣀⡤⠴⠒⠉⣉⠤⣶⣾⣠⠴⠚⠉⠉⠈⠳⣄⣠⡷⠖⠉⠉⠁⠀⠀⠀⠀⠀⢀⠇⠀⠀⣤⡿⢿⣿⣾⣿
+⠀⠀⣴⢿⡽⠋⠙⠒⠒⠒⠒⠒⠲⠤⠤⠤⠤⠀⠀⠤⠤⠤⠔⠒⠋⠉⣠⡤⠖⠋⣣⣤⡾⠛⠉⣀⣴⣶⣯⣖⣦⡀⠹⡀⢰⠀⠀⠀⠀⠀⠀⠀⠀⠀⣸⠀⠀⢰⣿⣿⡿⣿⣿⠸
+⢠⡾⣩⡿⣡⣴⣶⣖⣒⣂⣤⣤⣤⣄⣄⣀⡠⢤⣀⠀⠀⠀⠀⣤⠖⡫⠑⠓⣦⣴⠟⣁⣀⣀⣴⣿⢿⣛⡉⠻⣷⣵⡀⢹⣸⠀⠀⠀⠀⠀⠀⠀⠀⢀⡇⠀⠀⢸⣿⣿⣧⣿⡽⠀
+⢸⣷⣿⣼⡟⠙⠻⠿⠿⡁⠀⢠⠾⠿⠿⠿⠿⠟⢛⡆⠀⠀⡼⠷⠶⠖⠛⠛⣿⠟⠉⠁⠀⣸⣿⣧⣾⣞⣯⠱⣾⣿⣇⠀⢿⠀⠀⠀⠀⠀⠀⠀⠀⣼⣀⡀⠀⣿⣿⣿⣯⣿⡇⢰
+⣸⣦⣿⣿⠉⠉⠓⠒⠒⠚⠛⠓⠲⠶⠦⠤⠤⠤⢼⣷⠀⠀⡇⠀⠀⠀⠀⢸⡟⠀⠀⠀⢀⣿⡇⣦⢹⣷⢿⣀⢚⣻⡇⠀⠸⡄⠀⣀⣠⠤⠴⣞⣫⣯⠤⠖⠒⡿⣿⣻⣿⡏⠀⠘
+⣸⣻⣿⣿⣿⣽⠳⣶⣶⣦⣦⣤⣤⣤⣤⣤⠤⠄⣸⣿⠀⠀⢹⣤⣄⣤⣤⣾⡇⠀⠀⠀⢸⡟⣷⣿⣿⣿⠚⠛⢭⣿⡇⠀⢀⣏⠭⠽⠚⣛⣉⡥⠶⠒⠚⠛⠉⠁⠸⠿⠿⠀⠀⠀
+⢻⠠⢽⣿⡻⠿⣼⡿⣿⡿⣿⣿⣿⣿⣿⣿⡿⡀⣸⣿⠀⠀⠸⠿⡿⠿⠿⠋⡇⠀⠀⣠⣾⡇⡿⣋⣀⣏⢻⡦⢼⣾⠓⠋⣁⣴⠴⠛⠛⠉⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠸⠿⣿⣿⣾⣮⣯⣭⣿⣛⣻⣻⣿⠿⠿⠥⠼⢿⠛⣿⣧⣶⣶⣿⣥⣭⣉⡹⠽⠟⠋⠁⣸⡇⢧⢿⡏⢸⡆⢁⣼⠛⠚⠉⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠉⠉⠙⠛⠓⠛⠿⠿⠿⠿⢿⣿⣾⣿⣿⣟⣿⣷⣖⣀⣀⣐⣀⣐⣒⣊⣉⣉⣁⣳⠘⢦⡣⠬⣵⣾⠏⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠁⠁⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠛⠓⠒⠛⠒⠛⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
+"""
+
+# Each piece of art split into console rows once; every round that shows it
+# points at these same tuples instead of copying ~3 KB of text
+ART_ROWS = {
+    "car":  tuple((line, "win") for line in CAR_ART.strip("\n").split("\n")) + (("", ()),),
+    "goat": tuple((line, "loss") for line in GOAT_ART.strip("\n").split("\n")) + (("", ()),),
+}
+
+
 # ----------------------------------------------------------------------
-# Single interactive play
+# Graph series (decimated to the canvas pixel grid)
 # ----------------------------------------------------------------------
-def PlayMonteHall(door, switch):
-    winning_door = random.randint(0, 2)
-    all_indices = {0, 1, 2}
-
-    remaining = list(all_indices - {door, winning_door})
-    shown_index = random.choice(remaining)
+# Keeps every (trial, rate) point in two flat arrays (16 bytes a point rather
+# than a tuple of boxed numbers), but the canvas line only ever gets at most
+# one min/max pair per pixel column, in the order they happened. Trials only
+# grow, so a new point either widens the last column or starts a new one and
+# only the tail of the coordinate list changes. The line costs O(width) to
+# update no matter how many points the run has produced.
+class GraphSeries:
+    def __init__(self, colour="#69ff47"):
+        self.colour = colour
+        self.line   = None      # persistent canvas items the series is drawn into
+        self.dot    = None
+        self.trials = array("q")
+        self.rates  = array("d")
+        self.coords = []        # flat canvas coordinates for the line
+        self.box    = None      # (x0, y0, x1, y1, n) the coords were built for
+        self._col   = None      # [px, y_min, y_max, min_is_last] of the last column
+        self._tail  = 0         # how many coords the last column contributes
+
+    def __len__(self):
+        return len(self.trials)
+
+    def last(self):
+        return self.trials[-1], self.rates[-1]
+
+    def clear(self):
+        # Drops the points but keeps the canvas items to draw the next ones into
+        self.trials = array("q")
+        self.rates  = array("d")
+        self.box    = None
+
+    def rescale(self, box):
+        self.box    = box
+        self.coords = []
+        self._col   = None
+        self._tail  = 0
+        for trial, rate in zip(self.trials, self.rates):
+            self._add(trial, rate)
+
+    def append(self, trial, rate):
+        self.trials.append(trial)
+        self.rates.append(rate)
+        if self.box is not None:
+            self._add(trial, rate)
+
+    def to_canvas(self, trial, rate):
+        x0, y0, x1, y1, n = self.box
+        return x0 + (trial / n) * (x1 - x0), y1 - rate * (y1 - y0)
+
+    def _add(self, trial, rate):
+        cx, cy = self.to_canvas(trial, rate)
+        px = int(cx)
+        col = self._col
+        if col is None or col[0] != px:
+            col = self._col = [px, cy, cy, True]
+            self._tail = 0
+        elif cy < col[1]:
+            col[1], col[3] = cy, True
+        elif cy > col[2]:
+            col[2], col[3] = cy, False
+        else:
+            return
 
-    switch_candidates = list(all_indices - {shown_index})
-    final_door = next(i for i in switch_candidates if i != door)
-    if not switch:
-        final_door = door
+        px, y_min, y_max, min_is_last = col
+        if y_min == y_max:
+            tail = [px, y_min]
+        elif min_is_last:
+            tail = [px, y_max, px, y_min]
+        else:
+            tail = [px, y_min, px, y_max]
+        if self._tail:
+            del self.coords[-self._tail:]
+        self.coords.extend(tail)
+        self._tail = len(tail)
 
-    won = final_door == winning_door
-    return won, shown_index, winning_door
 
 
-# Batch TRIALS
+# ----------------------------------------------------------------------
+# Play console log (ring buffer of rows)
+# ----------------------------------------------------------------------
+# A fixed list of max_rows slots used as a ring: appending a row is O(1) and
+# once the ring is full the oldest row is overwritten, so a session of any
+# length holds at most max_rows (line, tag) pairs. Rows are shared tuples
+# (see ART_ROWS), so a full ring of art costs a pointer per row. The widget
+# asks for window(first, n) and draws only that.
+class ConsoleLog:
+    def __init__(self, max_rows=CONSOLE_ROWS):
+        self.max_rows = max_rows
+        self.rows     = [None] * max_rows
+        self.start    = 0       # slot of the oldest row
+        self.count    = 0
+        self.total    = 0       # rows ever appended, dropped ones included
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def dropped(self):
+        return self.total - self.count
+
+    def append(self, rows):
+        for row in rows:
+            if self.count < self.max_rows:
+                self.rows[(self.start + self.count) % self.max_rows] = row
+                self.count += 1
+            else:
+                self.rows[self.start] = row
+                self.start = (self.start + 1) % self.max_rows
+            self.total += 1
 
-# def SimMonteHall(N, switch):
-#    return [PlayMonteHall(random.randint(0, 2), switch)[0] for _ in range(N)]
+    def window(self, first, n):
+        # Rows first .. first + n - 1, counted from the oldest one kept
+        first = max(first, 0)
+        stop  = min(first + n, self.count)
+        return [self.rows[(self.start + i) % self.max_rows] for i in range(first, stop)]
 
+    def clear(self):
+        self.rows  = [None] * self.max_rows
+        self.start = self.count = self.total = 0
 
 
 # START TKINTER GUI STUFF
@@ -44,9 +249,34 @@ class SimApp(tk.Tk):
         self._play_door     = None
         self._revealed_door = None
         self._winning_door  = None
-        self._graph_points  = []
+        self._play_trace    = TraceStore()  # every Play round, one byte each
+        self._graph_series  = GraphSeries()
+        self._graph_stay    = None  # second series (stay) in Compare mode
+        self._graph_extra   = []    # further series, one per extra estimator
+        self._estimators    = None  # estimator names of the current run, if not plain
+        self._strategies    = None  # strategy names of the current tournament
+        self._curves        = None  # its newest (agents_done, rounds_done, wins, switches)
+        self._replicates    = None  # replicates of the current ensemble run
+        self._bands         = None  # its newest (checkpoints, median, low, high, envelope low, high)
         self._graph_n       = 1     # POSSIBLY NOT NEEDED
+        self._graph_ref     = None  # analytic win rate of the current run
+        self._graph_stay_ref = None # and of staying, in Compare mode
+        self._sim_doors     = None  # (doors, reveals) of the current run
+        self._sim_seed      = None  # its seed when the user gave one
+        self._last_run      = None  # summary row of the newest frame, for Export
+        self._progress      = None  # RunProgress shared with the worker thread
+        self._shown         = None  # last snapshot rendered by the pump
+        self._control       = None  # RunControl of the running simulation
+        self._worker        = None  # its background thread
+        self._checkpointed  = False # whether it writes CHECKPOINT_PATH
+        self._diag          = None  # Instruments of the current run (Diagnostics on)
+        self._diag_shown    = 0.0   # perf_counter of the last panel refresh
+        self._console_log   = ConsoleLog()  # Play console rows, capped at CONSOLE_ROWS
+        self._console_top   = 0     # first row shown in the console widget
+        self._console_follow = True # keep showing the newest rows
+        self._console_queued = False # a console redraw is waiting for idle
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
 
     # UI Construction ******************* RED ZONE CODE 
@@ -104,10 +334,12 @@ class SimApp(tk.Tk):
         self.switch_var = tk.StringVar(value="-- Select --")
         self.switch_dropdown = ttk.Combobox(
             self.sim_frame, textvariable=self.switch_var,
-            values=["Yes", "No"], state="readonly", width=12, font=("Helvetica", 10)
+            values=["Yes", "No", "Compare", "Tournament"], state="readonly", width=12,
+            font=("Helvetica", 10)
         )
         self.switch_dropdown.grid(row=0, column=1, sticky="w", padx=(10, 0), pady=6)
 
+        # In a tournament this is the number of rounds each agent plays
         tk.Label(self.sim_frame, text="Number of simulations:",
                  font=("Helvetica", 11, "bold")).grid(row=1, column=0, sticky="w", pady=6)
         self.n_var = tk.StringVar(value="10000")
@@ -115,11 +347,104 @@ class SimApp(tk.Tk):
                                 font=("Helvetica", 10))
         self.n_entry.grid(row=1, column=1, sticky="w", padx=(10, 0), pady=6)
 
+        tk.Label(self.sim_frame, text="Number of doors:",
+                 font=("Helvetica", 11, "bold")).grid(row=2, column=0, sticky="w", pady=6)
+        self.doors_var = tk.StringVar(value="3")
+        self.doors_entry = tk.Entry(self.sim_frame, textvariable=self.doors_var,
+                                    width=10, font=("Helvetica", 10))
+        self.doors_entry.grid(row=2, column=1, sticky="w", padx=(10, 0), pady=6)
+
+        tk.Label(self.sim_frame, text="Goat doors Monty opens:",
+                 font=("Helvetica", 11, "bold")).grid(row=3, column=0, sticky="w", pady=6)
+        self.reveals_var = tk.StringVar(value="1")
+        self.reveals_entry = tk.Entry(self.sim_frame, textvariable=self.reveals_var,
+                                      width=10, font=("Helvetica", 10))
+        self.reveals_entry.grid(row=3, column=1, sticky="w", padx=(10, 0), pady=6)
+
+        tk.Label(self.sim_frame, text="Worker processes:",
+                 font=("Helvetica", 11, "bold")).grid(row=4, column=0, sticky="w", pady=6)
+        self.workers_var = tk.StringVar(value=str(os.cpu_count() or 1))
+        self.workers_entry = tk.Entry(self.sim_frame, textvariable=self.workers_var,
+                                      width=10, font=("Helvetica", 10))
+        self.workers_entry.grid(row=4, column=1, sticky="w", padx=(10, 0), pady=6)
+
+        # Blank runs all N trials; a value stops early once the 95% interval
+        # is that tight, with N as the cap
+        tk.Label(self.sim_frame, text="Stop when within ± (%):",
+                 font=("Helvetica", 11, "bold")).grid(row=5, column=0, sticky="w", pady=6)
+        self.precision_var = tk.StringVar(value="")
+        self.precision_entry = tk.Entry(self.sim_frame, textvariable=self.precision_var,
+                                        width=10, font=("Helvetica", 10))
+        self.precision_entry.grid(row=5, column=1, sticky="w", padx=(10, 0), pady=6)
+
+        # Blank draws a fresh seed every run; a fixed seed makes the run
+        # repeatable, so its result is kept in the cache and comes back at once
+        tk.Label(self.sim_frame, text="Seed (blank = random):",
+                 font=("Helvetica", 11, "bold")).grid(row=6, column=0, sticky="w", pady=6)
+        self.seed_var = tk.StringVar(value="")
+        self.seed_entry = tk.Entry(self.sim_frame, textvariable=self.seed_var,
+                                   width=10, font=("Helvetica", 10))
+        self.seed_entry.grid(row=6, column=1, sticky="w", padx=(10, 0), pady=6)
+
+        # Plain is the usual run; the others reach the same precision with fewer
+        # trials, "All three" plays each on the full N to show the difference
+        tk.Label(self.sim_frame, text="Estimator:",
+                 font=("Helvetica", 11, "bold")).grid(row=7, column=0, sticky="w", pady=6)
+        self.estimator_var = tk.StringVar(value="Plain")
+        ttk.Combobox(
+            self.sim_frame, textvariable=self.estimator_var,
+            values=["Plain", "Stratified", "Antithetic", "All three"], state="readonly",
+            width=12, font=("Helvetica", 10)
+        ).grid(row=7, column=1, sticky="w", padx=(10, 0), pady=6)
+
+        # Tournament only: learning agents per strategy, all playing N rounds
+        tk.Label(self.sim_frame, text="Tournament agents:",
+                 font=("Helvetica", 11, "bold")).grid(row=8, column=0, sticky="w", pady=6)
+        self.agents_var = tk.StringVar(value="10000")
+        self.agents_entry = tk.Entry(self.sim_frame, textvariable=self.agents_var,
+                                     width=10, font=("Helvetica", 10))
+        self.agents_entry.grid(row=8, column=1, sticky="w", padx=(10, 0), pady=6)
+
+        # Yes / No only: a number runs that many independent replicates of N
+        # trials each and graphs their spread instead of one path
+        tk.Label(self.sim_frame, text="Replicates (blank = 1):",
+                 font=("Helvetica", 11, "bold")).grid(row=9, column=0, sticky="w", pady=6)
+        self.replicates_var = tk.StringVar(value="")
+        self.replicates_entry = tk.Entry(self.sim_frame, textvariable=self.replicates_var,
+                                         width=10, font=("Helvetica", 10))
+        self.replicates_entry.grid(row=9, column=1, sticky="w", padx=(10, 0), pady=6)
+
         self.run_btn = tk.Button(
             self.sim_frame, text="Run Simulation", font=("Helvetica", 11, "bold"),
             command=self._on_run, bg="#4CAF50", fg="white", padx=10
         )
-        self.run_btn.grid(row=2, column=0, columnspan=2, pady=(10, 4))
+        self.run_btn.grid(row=10, column=0, columnspan=2, pady=(10, 4))
+
+        run_ctl_frame = tk.Frame(self.sim_frame)
+        run_ctl_frame.grid(row=11, column=0, columnspan=2, pady=(0, 4))
+        self.pause_btn = tk.Button(
+            run_ctl_frame, text="⏸  Pause", font=("Helvetica", 10),
+            command=self._on_pause, state="disabled", width=10
+        )
+        self.pause_btn.pack(side="left", padx=(0, 6))
+        self.cancel_btn = tk.Button(
+            run_ctl_frame, text="✖  Cancel", font=("Helvetica", 10),
+            command=self._on_cancel, state="disabled", width=10
+        )
+        self.cancel_btn.pack(side="left")
+
+        self.resume_saved_btn = tk.Button(
+            self.sim_frame, text="↻  Resume saved run", font=("Helvetica", 10, "bold"),
+            command=self._on_resume_saved, bg="#1565c0", fg="white", padx=10
+        )
+        self.resume_saved_btn.grid(row=12, column=0, columnspan=2, pady=(0, 4))
+        self._refresh_resume_btn()
+
+        self.export_btn = tk.Button(
+            self.sim_frame, text="💾  Export results…", font=("Helvetica", 10),
+            command=self._on_export, state="disabled", padx=10
+        )
+        self.export_btn.grid(row=13, column=0, columnspan=2, pady=(0, 4))
 
         # ************PLAY MODE FRAME************ instructions
         self.play_frame = tk.Frame(left_frame)
@@ -185,6 +510,14 @@ class SimApp(tk.Tk):
                                     font=("Courier", 10), justify="left")
         self.stats_label.pack(anchor="w", pady=(6, 4))
 
+        # Diagnostics: opt-in timings of the run, taken from the next run on
+        self.diag_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(right_frame, text="Diagnostics", variable=self.diag_var,
+                       command=self._on_diag_toggle,
+                       font=("Helvetica", 9)).pack(anchor="w")
+        self.diag_label = tk.Label(right_frame, text="", fg="#555555",
+                                   font=("Courier", 8), justify="left")
+
         # ************LINE GRAPH FRAME************ Line graph frame formatting stuff
 
         self.graph_outer = tk.Frame(self)
@@ -222,21 +555,25 @@ class SimApp(tk.Tk):
         console_inner = tk.Frame(self.console_outer)
         console_inner.pack(fill="both", expand=True, padx=12, pady=(2, 12))
 
+        # The Text only ever holds the rows on screen; the whole log lives in
+        # _console_log and the scrollbar moves a window over it. wrap="none"
+        # so one log row is one line of the widget.
         self.console = tk.Text(
             console_inner, height=30,
             width=120,
             font=("Courier", 9), state="disabled",
             bg="#1e1e1e", fg="#d4d4d4",
-            relief="flat", padx=6, pady=4, wrap="word"
+            relief="flat", padx=6, pady=4, wrap="none"
         )
         self.console.pack(side="left", fill="both", expand=True)
 
-        console_scroll = ttk.Scrollbar(console_inner, orient="vertical",
-                                       command=self.console.yview)
-        console_scroll.pack(side="right", fill="y")
-        self.console.config(yscrollcommand=console_scroll.set)
+        self.console_scroll = ttk.Scrollbar(console_inner, orient="vertical",
+                                            command=self._on_console_scroll)
+        self.console_scroll.pack(side="right", fill="y")
         self.console.tag_config("win",  foreground="#69ff47")
         self.console.tag_config("loss", foreground="#ff6b6b")
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.console.bind(seq, self._on_console_wheel)
 
         self._on_mode_change()
 
@@ -244,18 +581,24 @@ class SimApp(tk.Tk):
     # Line Graph Reusabe Helpers
     def _on_canvas_resize(self, event=None):
         self.graph_canvas.delete("all")
+        for series in self._graph_traces():
+            series.line = series.dot = None
         self._draw_graph_axes()
         self._redraw_graph()
 
 
-    def _draw_graph_axes(self):
+    def _graph_box(self):
         c  = self.graph_canvas
         w  = c.winfo_width()  or 400
         h  = c.winfo_height() or 160
         pl, pb, pt, pr = self.PAD_L, self.PAD_B, self.PAD_T, self.PAD_R
+        return pl, pt, w - pr, h - pb
 
-        x0, y0 = pl,     pt
-        x1, y1 = w - pr, h - pb
+
+    def _draw_graph_axes(self):
+        c  = self.graph_canvas
+        h  = c.winfo_height() or 160
+        x0, y0, x1, y1 = self._graph_box()
 
         # Horizontal y-axis labels
         for pct in [0.0, 0.33, 0.50, 0.67, 1.0]:
@@ -266,8 +609,14 @@ class SimApp(tk.Tk):
 
         # X-axis tick labels for quarter intervals -- currently doesn't show
         n = self._graph_n
-        for frac, label in [(0, "0"), (0.25, f"{n//4}"), (0.5, f"{n//2}"),
-                            (0.75, f"{3*n//4}"), (1.0, f"{n}")]:
+        ticks = [(0, "0"), (0.25, f"{n//4}"), (0.5, f"{n//2}"),
+                 (0.75, f"{3*n//4}"), (1.0, f"{n}")]
+        if self._replicates:
+            # Ensembles are drawn against log N, ticks at the powers of ten
+            span = math.log10(max(n, 2))
+            ticks = [(k / span, f"{10**k:,}" if k < 4 else f"1e{k}")
+                     for k in range(int(span) + 1)]
+        for frac, label in ticks:
             x = x0 + frac * (x1 - x0)
             c.create_line(x, y1, x, y1 + 3, fill="#666666", tags="axes")
             c.create_text(x, h - 5, text=label, anchor="n",
@@ -277,45 +626,112 @@ class SimApp(tk.Tk):
         c.create_line(x0, y0, x0, y1, fill="#666666", width=1, tags="axes")
         c.create_line(x0, y1, x1, y1, fill="#666666", width=1, tags="axes")
 
-
+        # Analytic win rate for the current doors/reveals, as a reference line
+        for ref in (self._graph_ref, self._graph_stay_ref):
+            if ref is None:
+                continue
+            y = y1 - ref * (y1 - y0)
+            c.create_line(x0, y, x1, y, fill="#ffb74d", dash=(6, 3), tags="axes")
+            c.create_text(x1, y - 2, text=f"theory {ref*100:.1f}%",
+                          anchor="se", fill="#ffb74d", font=("Courier", 7), tags="axes")
+
+        # Which line is which estimator or strategy
+        names = self._estimators or self._strategies
+        if self._replicates:
+            for i, (key, label) in enumerate([
+                    ("median", "median"), ("band", f"{BAND[0]:g}-{BAND[1]:g}%"),
+                    ("envelope", "p ± 1.96·√(p(1-p)/N)")]):
+                colour = "#81c784" if key == "band" else ENSEMBLE_COLOURS[key]
+                c.create_text(x0 + 6, y0 + 4 + 10 * i, text=label, anchor="nw",
+                              fill=colour, font=("Courier", 7), tags="axes")
+        elif names and len(names) > 1:
+            colours = STRATEGY_COLOURS if self._strategies else ESTIMATOR_COLOURS
+            for i, name in enumerate(names):
+                c.create_text(x0 + 6, y0 + 4 + 10 * i, text=name, anchor="nw",
+                              fill=colours[name], font=("Courier", 7), tags="axes")
+
+
+    # Updates the persistent line and end-point items in place instead of
+    # recreating them; the series only rebuilds its coords when the canvas
+    # size or N changed.
     def _redraw_graph(self):
+        with phase(self._diag, "graph"):
+            if self._replicates:
+                self._draw_ensemble()
+            else:
+                self._draw_series()
+
+    # Ensemble graph: a few hundred log-spaced checkpoints at most, so the
+    # band, envelope and median are simply recreated on each frame
+    def _draw_ensemble(self):
         c = self.graph_canvas
         c.delete("plot")
-
-        pts = self._graph_points
-        if len(pts) < 2:
+        if self._bands is None:
             return
+        checkpoints, median, low, high, env_low, env_high = self._bands
+        x0, y0, x1, y1 = self._graph_box()
+        span = math.log10(max(self._graph_n, 2))
+        xs = x0 + np.log10(checkpoints) / span * (x1 - x0)
+
+        def points(rates, at=slice(None)):
+            ys = y1 - rates * (y1 - y0)
+            return np.column_stack((xs[at], ys[at])).ravel().tolist()
+
+        if len(checkpoints) > 1:
+            # Along the top of the band and back along the bottom
+            band = c.create_polygon(points(high) + points(low, slice(None, None, -1)),
+                                    fill=ENSEMBLE_COLOURS["band"], outline="", tag="plot")
+            c.tag_lower(band)
+            for edge in (env_low, env_high):
+                c.create_line(*points(edge), fill=ENSEMBLE_COLOURS["envelope"],
+                              dash=(4, 2), tag="plot")
+            c.create_line(*points(median), fill=ENSEMBLE_COLOURS["median"], width=1.5,
+                          tag="plot")
+        lx, ly = points(median, slice(-1, None))
+        c.create_oval(lx - 3, ly - 3, lx + 3, ly + 3, fill=ENSEMBLE_COLOURS["median"],
+                      outline="", tag="plot")
+
+    def _draw_series(self):
+        c = self.graph_canvas
+        # Scale the x-axis per the number of trials
+        box = (*self._graph_box(), self._graph_n)
 
-        w  = c.winfo_width()  or 400
-        h  = c.winfo_height() or 160
-        pl, pb, pt, pr = self.PAD_L, self.PAD_B, self.PAD_T, self.PAD_R
-
-        x0, y0 = pl,     pt
-        x1, y1 = w - pr, h - pb
+        for series in self._graph_traces():
+            if series.box != box:
+                series.rescale(box)
 
-        # Scale the x-axis per the number of trials
-        n = self._graph_n
+            if len(series.coords) < 4:
+                continue
 
-        def to_canvas(trial, rate):
-            cx = x0 + (trial / n) * (x1 - x0)
-            cy = y1 - rate * (y1 - y0)
-            return cx, cy
+            if series.line is None:
+                series.line = c.create_line(*series.coords, fill=series.colour,
+                                            width=1.5, tag="plot")
+            else:
+                c.coords(series.line, *series.coords)
 
-        coords = []
-        for trial, rate in pts:
-            coords.extend(to_canvas(trial, rate))
+            lx, ly = series.to_canvas(*series.last())
+            r = 3
+            if series.dot is None:
+                series.dot = c.create_oval(lx - r, ly - r, lx + r, ly + r,
+                                           fill=series.colour, outline="", tag="plot")
+            else:
+                c.coords(series.dot, lx - r, ly - r, lx + r, ly + r)
 
-        c.create_line(*coords, fill="#69ff47", width=1.5,
-                      smooth=True, tag="plot")
 
-        lx, ly = to_canvas(*pts[-1])
-        r = 3
-        c.create_oval(lx - r, ly - r, lx + r, ly + r,
-                      fill="#69ff47", outline="", tag="plot")
+    def _graph_traces(self):
+        if self._graph_stay is None:
+            return [self._graph_series] + self._graph_extra
+        return [self._graph_series, self._graph_stay]
 
 
-    def _reset_graph(self):
-        self._graph_points = []
+    def _reset_graph(self, compare=False, estimators=None, strategies=None):
+        if strategies:
+            colours = [STRATEGY_COLOURS[name] for name in strategies]
+        else:
+            colours = [ESTIMATOR_COLOURS[name] for name in estimators or ["plain"]]
+        self._graph_series = GraphSeries(colours[0])
+        self._graph_stay   = GraphSeries("#ff6b6b") if compare else None
+        self._graph_extra  = [GraphSeries(colour) for colour in colours[1:]]
         self.graph_canvas.delete("plot")
 
 
@@ -344,17 +760,86 @@ class SimApp(tk.Tk):
         self.win_label.config(text="Wins")
         self.loss_label.config(text="Losses")
         self.stats_label.config(text="")
+        self._graph_ref = None
+        self._graph_stay_ref = None
+        self._estimators = None
+        self._strategies = None
+        self._curves = None
+        self._replicates = None
+        self._bands = None
+        self._sim_doors = None
+        self._last_run = None
+        self.export_btn.config(state="disabled")
+        self._play_trace = TraceStore()
         self._reset_graph()
 
 
     # Console for reprinting messages
 
-    def _log(self, message, tag):
+    def _log(self, message, tag, art=None):
+        # Adds the message (and the rows of ART_ROWS[art] under it) to the
+        # log; the widget is redrawn once when Tk is idle, however many
+        # messages came in meanwhile
+        log = self._console_log
+        dropped = log.dropped
+        log.append((line, tag) for line in message.split("\n"))
+        if art is not None:
+            log.append(ART_ROWS[art])
+        if not self._console_follow:
+            # Keep the same rows on screen while old ones fall off the top
+            self._console_top = max(self._console_top - (log.dropped - dropped), 0)
+        if not self._console_queued:
+            self._console_queued = True
+            self.after_idle(self._render_console)
+
+    def _console_height(self):
+        return int(self.console.cget("height"))
+
+    def _render_console(self):
+        self._console_queued = False
+        log, height = self._console_log, self._console_height()
+        last_top = max(len(log) - height, 0)
+        if self._console_follow or self._console_top > last_top:
+            self._console_top = last_top
+        rows = log.window(self._console_top, height)
+
+        # One insert call for the whole window: text, tags, text, tags, ...
+        chunks = []
+        for i, (line, tag) in enumerate(rows):
+            chunks += [line if i == len(rows) - 1 else line + "\n", tag]
         self.console.config(state="normal")
-        self.console.insert("end", message + "\n", tag)
-        self.console.see("end")
+        self.console.delete("1.0", "end")
+        if chunks:
+            self.console.insert("end", *chunks)
         self.console.config(state="disabled")
 
+        if len(log):
+            self.console_scroll.set(self._console_top / len(log),
+                                    (self._console_top + len(rows)) / len(log))
+        else:
+            self.console_scroll.set(0.0, 1.0)
+
+    def _scroll_console_to(self, top):
+        last_top = max(len(self._console_log) - self._console_height(), 0)
+        self._console_top    = min(max(int(top), 0), last_top)
+        self._console_follow = self._console_top == last_top
+        self._render_console()
+
+    def _on_console_scroll(self, action, amount, unit=None):
+        # Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"/"pages")
+        if action == "moveto":
+            self._scroll_console_to(round(float(amount) * len(self._console_log)))
+        else:
+            step = self._console_height() if unit == "pages" else 1
+            self._scroll_console_to(self._console_top + int(amount) * step)
+
+    def _on_console_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll_console_to(self._console_top - 3)
+        else:
+            self._scroll_console_to(self._console_top + 3)
+        return "break"
+
 
     # Play Mode — staging management of how to manage the doors
 
@@ -412,64 +897,17 @@ class SimApp(tk.Tk):
             switch_text = "switched" if switched else "stayed"
             self.instruction_var.set(f"{result}  You {switch_text}.")
 
-            GOAT_ART = """
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢠⣤⣀⠀⠀⠀⢰⡶⣦⠀⠀⠀⣰⣾⣿⡄⠀⠀⣠⣴⣄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⠀⠀⠀⠀⢀⣿⠉⢻⣷⡄⢀⣿⠷⠻⣿⠁⠸⠋⠉⢹⡇⠀⡾⠛⢻⡿⠀⣤⡾⣻⠇⠀⠀⢠⡶⠀⠀⡀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣠⣤⣤⣤⣤⡀⠀⠀⠀⣿⡿⣦⣄⡀⣴⡿⠟⠋⠙⠿⠙⠉⠀⠀⠀⡀⠀⠀⠀⠀⠀⠀⠀⠀⠈⠁⠛⠉⢻⡟⠀⠠⣴⣿⡀⣠⡞⠁⢀⣴⠆⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣴⣿⠋⠁⠀⣠⡟⠁⠀⠀⠀⣽⣿⠟⠻⡶⠈⠗⠀⠀⠀⠀⠀⣀⣠⣴⣪⣡⣾⣷⡿⣷⣾⣿⣿⣟⣃⠀⠀⠀⠈⠀⠀⣾⠏⣨⣿⠋⢀⣴⠟⠁⣀⣴⠞
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠉⠻⣷⣴⠿⠛⠛⠛⠛⣷⡄⠸⣷⠀⠀⠀⠀⠀⠀⠀⠀⠘⢧⣿⣿⠛⣟⣿⣏⣤⠾⠿⠾⠷⣶⣌⠁⠀⠀⠀⠀⠀⠀⠀⢴⠟⠁⠀⠛⠁⣠⡾⠋⠁⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢻⣿⡄⠀⠀⠀⠀⣼⡟⠀⠁⠀⠀⠀⠀⢀⣤⡴⠶⠛⠛⠋⠉⠉⠀⠀⠀⠀⠑⠄⢀⠀⠀⠉⢳⣄⡀⠀⠀⠀⠀⠀⠀⠀⠐⠟⣀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢿⣿⣀⣀⣠⣼⠟⠀⠀⠀⠀⠀⠀⢀⣿⠃⢀⡀⣀⣤⠤⠤⢤⣀⠀⠀⠀⣀⡿⢧⠤⣄⠛⠛⠛⠛⠻⣄⠀⠀⠀⠀⠀⠀⠘⠛⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠰⠾⠿⠛⠛⠋⠁⠀⠀⠀⠀⠀⠀⢰⣿⣃⣴⠛⠋⠁⠀⠀⠀⠀⠈⠘⢦⡈⠁⠀⠀⠐⠒⠀⠠⣴⠓⠛⠛⣄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢶⣿⡇⠁⠁⡤⢐⣴⣦⣤⡀⠀⠀⠀⠈⠻⣄⠀⠀⠀⠀⠁⠀⠈⢻⡟⢻⡿⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣠⣤
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⣠⡴⠞⢻⡇⠀⠀⣴⣡⣤⣤⣮⢻⡄⠀⠀⠀⠀⠀⢹⡄⠀⠀⠀⠀⠀⠀⠙⢾⡷⡦⣤⣄⣀⣀⣀⣀⣀⣀⡤⠞⠉⣻
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣀⣠⣤⠤⠶⠚⠛⠉⠀⠀⠀⢸⡇⠀⠠⣿⠛⠛⠛⢉⣸⠇⠀⠀⠀⠀⠀⠀⠸⠄⠀⠀⠀⠀⠀⠀⠈⠛⢮⠊⠀⠉⠉⠉⠉⠉⠁⠀⠀⣰⡇
-⣀⣀⣀⣀⣀⣀⣤⣤⡤⠴⠶⠚⠛⠋⠉⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠈⢷⠀⠀⠈⢻⣒⣒⣫⠏⡀⠀⠀⠀⠀⠀⠀⠀⠀⢀⡶⠛⠛⠛⠛⢿⠛⠉⣷⡀⠀⠀⠀⠀⠀⠀⠀⣸⠋⠀
-⣭⣿⠍⠉⠉⠉⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⡀⠄⠐⠫⠀⢸⡇⠀⠻⠽⠁⠈⠁⠀⠀⠀⠀⢀⡶⠦⠀⠸⣤⠞⣻⠆⠀⠈⡀⣴⠟⢳⣀⣀⠀⠀⢀⣠⠜⠃⠀⠀
-⡼⠻⣦⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣤⢾⡥⠤⣤⣀⠀⠀⠘⣧⡀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣞⠁⠀⠀⠀⠀⠈⠙⢦⣀⣀⣡⠏⠀⢨⠇⠉⠉⠉⠉⠁⠀⠀⠀⠀
-⠀⠀⠈⠛⢦⣀⣀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⣠⠴⠋⠁⠀⠀⠀⣿⠈⠀⠀⠀⠀⠉⠛⣦⣀⠀⠀⠀⠀⠀⠀⠀⠀⣀⣀⣀⠀⠀⠀⠀⠉⢽⠁⠀⣠⠞⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠈⠉⠛⠛⠛⠛⠛⠛⠛⠋⠉⠉⠁⠀⠀⠀⠀⠀⢸⣿⠀⠀⠀⢰⡀⠀⠀⠏⠫⠀⠀⠀⠀⢀⠀⣴⣋⣽⣿⣉⣹⡟⠒⠶⠤⢤⠶⣺⠟⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠠⢾⡿⠀⠀⠀⠀⣷⠀⠀⠀⠀⠀⠀⠀⠀⡞⣸⣿⣿⣿⣿⣿⣿⣿⣷⣶⣶⠛⠋⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢴⣿⠇⠀⠀⠀⠀⠹⣷⡀⠀⠀⠀⠀⢠⣎⠀⣿⣿⣿⣿⣿⣿⣿⣿⣿⣿⡃⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣻⡟⠀⠀⠀⠀⠀⠀⠹⣿⡀⠀⠀⠀⠀⠙⡆⢿⡿⢿⣻⢍⠉⠉⠙⠲⣄⠉⠻⣄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠠⢾⡟⠀⠀⠀⠀⠀⠀⠀⠀⠹⣿⣄⠀⠀⠀⠀⠀⢸⣧⡟⢹⣦⡠⠀⠀⠀⠈⢣⠀⠙⢦⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣽⠃⠀⠀⠀⠀⠀⠀⠀⠀⠀⠘⣿⣄⠀⠀⠀⠀⠀⢣⣳⣞⢀⡟⢧⡄⠀⠀⠀⠛⡂⠀⠻⣄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢹⡆⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠈⢿⣦⡀⠀⠀⠀⠀⠙⢿⣿⡧⣯⣙⡾⣗⡤⠤⣀⣀⣀⡿⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠘⣧⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣿⣿⣦⠀⠀⠀⠀⠀⠈⠛⢳⣮⣥⣥⣭⣿⣿⣿⠋⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢹⡆⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠘⣿⣿⣷⣦⡀⢀⣀⢀⢀⣴⢾⣷⡶⠞⠛⠋⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢻⡄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠘⣿⣿⣿⣿⣿⣿⣻⢆⠞⠰⣽⢿⣍⢢⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠻⣆⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣿⡿⢿⣿⣿⠙⣿⡾⡆⠃⠈⢧⡟⡇⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠙⢧⡄⠀⠀⠀⠀⠀⠀⠀⣠⠞⠁⠀⢸⡿⠃⠀⡏⢇⡟⡄⢠⡟⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠙⠳⢤⣀⠀⠀⠰⠊⠀⠀⠀⢠⡿⠃⠀⠘⠀⡿⣸⡃⠻⢷⣶⣒⠲⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠈⠑⠢⣄⠀⠀⠀⢠⡟⠁⠀⠀⠀⠀⠷⣿⣷⣶⣖⡒⣿⠄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠉⠐⣰⠋⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠈⠋⠃⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-"""
-            CAR_ART = """
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⣀⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣠⠴⠖⠛⠛⠛⠛⠛⠛⠛⠛⠛⠛⠛⠛⠛⠻⠿⢿⣿⠽⠽⠿⢷⣒⠦⢄⣀⣀⣀⣀⣀⣀⡀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣠⠞⠉⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢠⠏⡟⠀⠀⠀⠀⠈⢹⡛⢮⡻⣏⠙⢿⡿⠿⠇⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⡴⠋⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢠⠏⣸⠀⠀⠀⠀⠀⠀⠈⢧⣀⡙⡎⠳⣿⣀⣀⣀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⣀⣀⣀⣤⣴⠾⠯⠤⠤⠤⠤⠤⠤⢤⣤⣤⠤⠀⠀⠀⠀⠀⠀⣀⣀⣀⣀⣀⣞⣀⣏⣧⣄⣀⡈⠹⠖⠒⠛⠳⣍⣀⣀⡤⠤⠝⠛⢷⡀⠀
-⠀⠀⠀⠀⠀⠀⠀⢀⣀⣤⠤⠶⠛⠋⠉⠘⠋⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠉⠉⠁⠀⠀⣀⡠⢤⠤⠖⠚⠛⢉⣉⠀⠀⠈⡇⠙⠋⠀⣀⣀⠤⠴⠒⠋⠉⡇⠀⠀⠀⣀⢀⡈⢧⠀
-⠀⠀⠀⠀⣠⣶⣾⡿⠋⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⢀⣀⡤⠴⠒⠉⣉⠤⣶⣾⣠⠴⠚⠉⠉⠈⠳⣄⣠⡷⠖⠉⠉⠁⠀⠀⠀⠀⠀⢀⠇⠀⠀⣤⡿⢿⣿⣾⣿
-⠀⠀⣴⢿⡽⠋⠙⠒⠒⠒⠒⠒⠲⠤⠤⠤⠤⠀⠀⠤⠤⠤⠔⠒⠋⠉⣠⡤⠖⠋⣣⣤⡾⠛⠉⣀⣴⣶⣯⣖⣦⡀⠹⡀⢰⠀⠀⠀⠀⠀⠀⠀⠀⠀⣸⠀⠀⢰⣿⣿⡿⣿⣿⠸
-⢠⡾⣩⡿⣡⣴⣶⣖⣒⣂⣤⣤⣤⣄⣄⣀⡠⢤⣀⠀⠀⠀⠀⣤⠖⡫⠑⠓⣦⣴⠟⣁⣀⣀⣴⣿⢿⣛⡉⠻⣷⣵⡀⢹⣸⠀⠀⠀⠀⠀⠀⠀⠀⢀⡇⠀⠀⢸⣿⣿⣧⣿⡽⠀
-⢸⣷⣿⣼⡟⠙⠻⠿⠿⡁⠀⢠⠾⠿⠿⠿⠿⠟⢛⡆⠀⠀⡼⠷⠶⠖⠛⠛⣿⠟⠉⠁⠀⣸⣿⣧⣾⣞⣯⠱⣾⣿⣇⠀⢿⠀⠀⠀⠀⠀⠀⠀⠀⣼⣀⡀⠀⣿⣿⣿⣯⣿⡇⢰
-⣸⣦⣿⣿⠉⠉⠓⠒⠒⠚⠛⠓⠲⠶⠦⠤⠤⠤⢼⣷⠀⠀⡇⠀⠀⠀⠀⢸⡟⠀⠀⠀⢀⣿⡇⣦⢹⣷⢿⣀⢚⣻⡇⠀⠸⡄⠀⣀⣠⠤⠴⣞⣫⣯⠤⠖⠒⡿⣿⣻⣿⡏⠀⠘
-⣸⣻⣿⣿⣿⣽⠳⣶⣶⣦⣦⣤⣤⣤⣤⣤⠤⠄⣸⣿⠀⠀⢹⣤⣄⣤⣤⣾⡇⠀⠀⠀⢸⡟⣷⣿⣿⣿⠚⠛⢭⣿⡇⠀⢀⣏⠭⠽⠚⣛⣉⡥⠶⠒⠚⠛⠉⠁⠸⠿⠿⠀⠀⠀
-⢻⠠⢽⣿⡻⠿⣼⡿⣿⡿⣿⣿⣿⣿⣿⣿⡿⡀⣸⣿⠀⠀⠸⠿⡿⠿⠿⠋⡇⠀⠀⣠⣾⡇⡿⣋⣀⣏⢻⡦⢼⣾⠓⠋⣁⣴⠴⠛⠛⠉⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠸⠿⣿⣿⣾⣮⣯⣭⣿⣛⣻⣻⣿⠿⠿⠥⠼⢿⠛⣿⣧⣶⣶⣿⣥⣭⣉⡹⠽⠟⠋⠁⣸⡇⢧⢿⡏⢸⡆⢁⣼⠛⠚⠉⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠉⠉⠙⠛⠓⠛⠿⠿⠿⠿⢿⣿⣾⣿⣿⣟⣿⣷⣖⣀⣀⣐⣀⣐⣒⣊⣉⣉⣁⣳⠘⢦⡣⠬⣵⣾⠏⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠁⠁⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠉⠛⠓⠒⠛⠒⠛⠁⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
-"""
             if won:
-                self._log(f"🚗 Congrats, you won the car! {CAR_ART}", "win")
+                self._log("🚗 Congrats, you won the car!", "win", art="car")
             else:
-                self._log(f"🐐 Congrats, you won a goat! \n {GOAT_ART}", "loss")
+                self._log("🐐 Congrats, you won a goat!", "loss", art="goat")
 
             self.play_again_btn.pack(anchor="w", pady=(6, 2))
 
+            # The round goes into the session trace (its totals are kept as
+            # it grows); the results panel shows just this round
+            self._play_trace.append(self._play_door, self._revealed_door,
+                                    self._winning_door, switched, won)
             self.after(0, self._update_ui, 1, 1,
                        1 if won else 0, 0 if won else 1,
                        self._play_door, switched)
@@ -478,11 +916,64 @@ class SimApp(tk.Tk):
     # Input Validation (Simulate mode only)
     def _validate(self):
         if self.switch_var.get() == "-- Select --":
-            self.error_var.set("Please select a switch preference (Yes or No).")
+            self.error_var.set("Please select a switch preference (Yes, No, Compare or Tournament).")
             return False
         if not self.n_var.get().isdigit() or int(self.n_var.get()) < 1:
             self.error_var.set("Please enter a positive number.")
             return False
+        if not self.doors_var.get().isdigit() or not self.reveals_var.get().isdigit():
+            self.error_var.set("Please enter whole numbers of doors.")
+            return False
+        try:
+            check_doors(int(self.doors_var.get()), int(self.reveals_var.get()))
+        except ValueError as exc:
+            self.error_var.set(f"{str(exc).capitalize()}.")
+            return False
+        if not self.workers_var.get().isdigit() or int(self.workers_var.get()) < 1:
+            self.error_var.set("Please enter a positive number of workers.")
+            return False
+        if self.precision_var.get().strip():
+            try:
+                precision = float(self.precision_var.get())
+            except ValueError:
+                precision = 0
+            if not 0 < precision < 50:
+                self.error_var.set("Please enter a precision between 0 and 50%, or leave it blank.")
+                return False
+            if self.switch_var.get() in ("Compare", "Tournament"):
+                self.error_var.set(f"{self.switch_var.get()} runs all N; leave the precision blank.")
+                return False
+        if self.switch_var.get() == "Tournament":
+            if not self.agents_var.get().isdigit() or int(self.agents_var.get()) < 1:
+                self.error_var.set("Please enter a positive number of tournament agents.")
+                return False
+            if self.estimator_var.get() != "Plain":
+                self.error_var.set("Tournaments use the plain estimator.")
+                return False
+        if self.replicates_var.get().strip():
+            if not self.replicates_var.get().strip().isdigit() or \
+                    int(self.replicates_var.get()) < 1:
+                self.error_var.set("Please enter a positive number of replicates, or leave it blank.")
+                return False
+            if self.switch_var.get() not in ("Yes", "No"):
+                self.error_var.set("Ensembles replicate one strategy; pick Yes or No.")
+                return False
+            if self.precision_var.get().strip():
+                self.error_var.set("Ensembles run all N trials; leave the precision blank.")
+                return False
+            if self.estimator_var.get() != "Plain":
+                self.error_var.set("Ensembles use the plain estimator.")
+                return False
+        if self.estimator_var.get() != "Plain":
+            if self.switch_var.get() == "Compare":
+                self.error_var.set("Estimators work on one strategy; pick Yes or No.")
+                return False
+            if self.precision_var.get().strip():
+                self.error_var.set("Estimators run all N trials; leave the precision blank.")
+                return False
+        if self.seed_var.get().strip() and not self.seed_var.get().strip().isdigit():
+            self.error_var.set("Please enter a whole-number seed, or leave it blank.")
+            return False
         self.error_var.set("")
         return True
 
@@ -492,11 +983,114 @@ class SimApp(tk.Tk):
         if not self._validate():
             return
 
-        will_switch = self.switch_var.get() == "Yes"
+        # None stands for Compare: every strategy on the same trials
+        will_switch = {"Yes": True, "No": False}.get(self.switch_var.get())
         n = int(self.n_var.get())
+        doors = int(self.doors_var.get())
+        reveals = int(self.reveals_var.get())
+        precision = self.precision_var.get().strip()
+        seed = int(self.seed_var.get()) if self.seed_var.get().strip() else None
+        estimators = {"Plain": None, "All three": ESTIMATORS}.get(
+            self.estimator_var.get(), (self.estimator_var.get().lower(),))
+
+        if self.switch_var.get() == "Tournament":
+            # N is rounds here; the curves stream live unless the population
+            # needs more than one agent chunk, then it goes to the pool
+            agents = int(self.agents_var.get())
+            self._prepare_run(n, None, doors, reveals, strategies=STRATEGIES)
+            self._sim_seed = seed
+            workers = int(self.workers_var.get()) if agents > AGENT_CHUNK else 1
+            args = (self._progress, self._control, agents, n, doors, reveals,
+                    new_seed() if seed is None else seed, workers)
+            self._start_thread(self.TournamentSimMonteHall, args, None, checkpointed=False)
+            return
 
+        if self.replicates_var.get().strip():
+            # R independent paths of N trials, streamed live unless there is
+            # more than one group of replicates, then the groups go to the pool
+            replicates = int(self.replicates_var.get())
+            self._prepare_run(n, will_switch, doors, reveals, replicates=replicates)
+            self._sim_seed = seed
+            workers = int(self.workers_var.get()) if replicates > REPLICATE_CHUNK else 1
+            args = (self._progress, self._control, replicates, n, will_switch, doors,
+                    reveals, new_seed() if seed is None else seed, workers)
+            self._start_thread(self.EnsembleSimMonteHall, args, will_switch,
+                               checkpointed=False)
+            return
+
+        self._prepare_run(n, will_switch, doors, reveals, estimators)
+        self._sim_seed = seed
+
+        if estimators:
+            args = (self._progress, self._control, will_switch, n, doors, reveals,
+                    new_seed() if seed is None else seed, estimators, self._pool_size(n))
+            self._start_thread(self.EstimateSimMonteHall, args, will_switch,
+                               checkpointed=False)
+        elif will_switch is None:
+            args = (self._progress, self._control, n, doors, reveals,
+                    new_seed() if seed is None else seed, self._pool_size(n))
+            self._start_thread(self.CompareSimMonteHall, args, None, checkpointed=False)
+        elif precision:
+            target = self.PrecisionSimMonteHall
+            args = (self._progress, self._control, will_switch, n, doors, reveals,
+                    float(precision) / 100, seed)
+            self._start_thread(target, args, will_switch, checkpointed=False)
+        elif seed is not None:
+            args = (self._progress, self._control, will_switch, n, doors, reveals, seed)
+            self._start_thread(self.CachedSimMonteHall, args, will_switch,
+                               checkpointed=False)
+        else:
+            # Progress is published once per chunk, so keep ~200 of them
+            run = SimulationRun(n, will_switch, doors=doors, reveals=reveals,
+                                chunk=min(CHUNK, max(1, n // 200)))
+            self._start_thread(self.SimMonteHall,
+                               (run, self._control, self._progress, self._pool_size(n),
+                                self._diag),
+                               will_switch)
+
+    def _on_resume_saved(self):
+        if not self.workers_var.get().isdigit() or int(self.workers_var.get()) < 1:
+            self.error_var.set("Please enter a positive number of workers.")
+            return
+        try:
+            run = SimulationRun.load(CHECKPOINT_PATH)
+        except (OSError, ValueError, KeyError) as exc:
+            self.error_var.set(f"Could not load the saved run: {exc}")
+            self._refresh_resume_btn()
+            return
+        self.error_var.set("")
+
+        # Show the saved run's settings in the inputs
+        self.switch_var.set("Yes" if run.switch else "No")
+        self.n_var.set(str(run.n))
+        self.doors_var.set(str(run.doors))
+        self.reveals_var.set(str(run.reveals))
+        self.precision_var.set("")
+        self.seed_var.set("")
+
+        self._prepare_run(run.n, run.switch, run.doors, run.reveals)
+        self._start_thread(self.SimMonteHall,
+                           (run, self._control, self._progress, self._pool_size(run.n),
+                            self._diag),
+                           run.switch)
+
+    def _pool_size(self, n):
+        # Runs that fit in one full chunk would only pay the pool's start-up cost
+        return int(self.workers_var.get()) if n > CHUNK else 1
+
+    def _prepare_run(self, n, will_switch, doors, reveals, estimators=None, strategies=None,
+                     replicates=None):
         # Store N so the graph x-axis always spans exactly 0..N
         self._graph_n = n
+        # Compare and tournaments both show always-switch and always-stay
+        # as reference lines
+        both = will_switch is None
+        compare = both and not strategies
+        self._graph_ref = float(exact_win_probability(doors, reveals, both or will_switch))
+        self._graph_stay_ref = (float(exact_win_probability(doors, reveals, False))
+                                if both else None)
+        self._sim_doors = (doors, reveals)
+        self._sim_seed  = None
 
         self.progress_bar["maximum"] = n
         self.win_bar["maximum"] = n
@@ -505,36 +1099,323 @@ class SimApp(tk.Tk):
         self.win_bar["value"] = 0
         self.loss_bar["value"] = 0
         self.stats_label.config(text="")
-        self._reset_graph()
-
-        # Redraw axes immediately with the new N tick labels
+        self._estimators = estimators
+        self._strategies = strategies
+        self._curves     = None
+        self._replicates = replicates
+        self._bands      = None
+        self._reset_graph(compare, estimators, strategies)
+
+        # Redraw axes immediately with the new N tick labels (log N for an ensemble)
         self.graph_canvas.delete("all")
         self._draw_graph_axes()
 
         self.run_btn.config(state="disabled")
-
-        thread = threading.Thread(
-            target=self.SimMonteHall, args=(will_switch, n), daemon=True
+        self.export_btn.config(state="disabled")
+        self._last_run = None
+        self.resume_saved_btn.grid_remove()
+        self.pause_btn.config(state="normal", text="⏸  Pause")
+        self.cancel_btn.config(state="normal")
+
+        self._progress = RunProgress(n)
+        self._control  = RunControl()
+        self._shown    = self._progress.snapshot
+        self._diag     = Instruments() if self.diag_var.get() else None
+        self._diag_shown = 0.0
+        self.diag_label.config(text="")
+
+    def _start_thread(self, target, args, will_switch, checkpointed=True):
+        self._checkpointed = checkpointed
+        self._worker = threading.Thread(target=target, args=args, daemon=True)
+        self._worker.start()
+        self.after(FRAME_MS, self._pump, self._progress, will_switch)
+
+    # Pause / Cancel (Simulate mode only)
+
+    def _on_pause(self):
+        control = self._control
+        if control is None:
+            return
+        if control.paused:
+            control.resume()
+            self.pause_btn.config(text="⏸  Pause")
+        else:
+            control.pause()
+            self.pause_btn.config(text="▶  Resume")
+
+    def _on_cancel(self):
+        if self._control is not None:
+            self._control.cancel()
+            self.cancel_btn.config(state="disabled")
+            self.pause_btn.config(state="disabled")
+
+    def _on_close(self):
+        # Stop a running simulation so it can write its checkpoint first
+        if self._control is not None and self._worker is not None:
+            self._control.cancel()
+            self._worker.join(timeout=5)
+        self.destroy()
+
+    # Export (Simulate mode only): the graph series to the chosen file, the
+    # newest summary row next to it as <name>_summary.<ext>
+
+    def _on_export(self):
+        if self._last_run is None:
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Export results", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("NumPy", "*.npy"),
+                       ("Arrow", "*.arrow"), ("Parquet", "*.parquet")],
         )
-        thread.start()
-
-    # Simulation loop (background thread)
+        if not path:
+            return
+        columns = [("trials", "i8"), ("win_rate", "f8")]
+        arrays  = [self._graph_series.trials, self._graph_series.rates]
+        rows    = len(self._graph_series)
+        if self._replicates:
+            checkpoints, *bands = self._bands
+            columns = [("trials", "i8"), ("median", "f8"), ("low", "f8"), ("high", "f8"),
+                       ("envelope_low", "f8"), ("envelope_high", "f8")]
+            arrays, rows = [checkpoints, *bands], len(checkpoints)
+        elif self._strategies:
+            # Straight from the tournament totals; a pool run stopped early may
+            # have strategies with no agents finished yet, which come out as nan
+            agents, rows, wins, switches = self._curves
+            with np.errstate(invalid="ignore"):
+                rates, shares = wins / agents[:, None], switches / agents[:, None]
+            columns, arrays = [("round", "i8")], [np.arange(1, rows + 1)]
+            for i, name in enumerate(self._strategies):
+                columns += [(f"{name}_win_rate", "f8"), (f"{name}_switching", "f8")]
+                arrays  += [rates[i], shares[i]]
+        elif self._graph_stay is not None:
+            columns[1] = ("switch_win_rate", "f8")
+            columns.append(("stay_win_rate", "f8"))
+            arrays.append(self._graph_stay.rates)
+        elif self._estimators:
+            columns = [("trials", "i8")] + [(f"{name}_win_rate", "f8")
+                                            for name in self._estimators]
+            arrays += [series.rates for series in self._graph_extra]
+        stem, ext = os.path.splitext(path)
+        try:
+            with TableWriter(path, columns, rows) as writer:
+                writer.extend(*arrays)
+            write_table(f"{stem}_summary{ext}", [self._last_run])
+        except (OSError, ValueError, ImportError) as exc:
+            self.error_var.set(f"Export failed: {exc}")
+            return
+        self.error_var.set("")
 
-    def SimMonteHall(self, will_switch, n):
-        wins  = 0
-        batch = max(1, n // 200)
+    def _refresh_resume_btn(self):
+        if os.path.exists(CHECKPOINT_PATH):
+            self.resume_saved_btn.grid()
+        else:
+            self.resume_saved_btn.grid_remove()
+
+    # UI pump (main thread): renders the newest progress snapshot FRAME_MS apart,
+    # so a fast engine never floods the Tk event queue
+
+    def _pump(self, progress, will_switch):
+        if progress is not self._progress:
+            return      # a newer run took over
+        snapshot = progress.snapshot
+        if snapshot is not self._shown:
+            diag = self._diag
+            if diag is not None:
+                # Publish-to-draw delay of this update, the worker -> Tk hop
+                diag.observe("latency", time.perf_counter() - progress.published_at)
+                diag.count("frames")
+            self._shown = snapshot
+            done, wins, interval, final = snapshot
+            cancelled = final and self._control.cancelled
+            with phase(diag, "ui"):
+                if done and self._strategies:
+                    self._update_tournament_ui(done, progress.n, wins,
+                                               final and not cancelled)
+                elif done and self._replicates:
+                    self._update_ensemble_ui(done, progress.n, wins, will_switch,
+                                             final and not cancelled)
+                elif done and self._estimators:
+                    self._update_estimate_ui(done, progress.n, wins, will_switch,
+                                             final and not cancelled)
+                elif done and will_switch is None:
+                    self._update_compare_ui(done, progress.n, wins, final and not cancelled)
+                elif done:
+                    self._update_ui(done, progress.n, wins, done - wins, None,
+                                    will_switch, interval, final and not cancelled)
+            if diag is not None and (final or time.perf_counter() - self._diag_shown
+                                     >= DIAG_EVERY):
+                self._refresh_diag(done)
+            if final:
+                self._on_run_stopped(done, progress.n, cancelled)
+                return
+        self.after(FRAME_MS, self._pump, progress, will_switch)
 
-        for i in range(1, n + 1):
-            won, _, _ = PlayMonteHall(random.randint(0, 2), will_switch)
-            wins += won
+    # Diagnostics panel (main thread). Trials/s is over the whole run so far;
+    # frames are redraws that had a new snapshot to show, latency is how long
+    # a snapshot waited between the worker publishing it and the pump drawing it
 
-            if i % batch == 0 or i == n:
-                losses = i - wins
-                self.after(0, self._update_ui, i, n, wins, losses, None, will_switch)
+    def _on_diag_toggle(self):
+        if self.diag_var.get():
+            self.diag_label.pack(anchor="w", pady=(2, 4))
+        else:
+            self.diag_label.pack_forget()
+
+    def _refresh_diag(self, done):
+        diag = self._diag
+        self._diag_shown = time.perf_counter()
+        elapsed = diag.elapsed or 1.0
+        lines = [
+            f"  Trials/s : {done / elapsed:,.0f}",
+            f"  Frames/s : {diag.counters.get('frames', 0) / elapsed:.1f}",
+            f"  Latency  : {diag.mean('latency')*1e3:.1f} ms mean, "
+            f"{diag.peaks.get('latency', 0.0)*1e3:.1f} ms max",
+            f"  UI       : {diag.mean('ui')*1e3:.2f} ms/frame "
+            f"(graph {diag.mean('graph')*1e3:.2f} ms)",
+        ]
+        for name in ("play", "pool_wait", "checkpoint"):
+            if diag.calls.get(name):
+                lines.append(f"  {name.capitalize().replace('_', ' '):<9}: "
+                             f"{diag.mean(name)*1e3:.2f} ms x {diag.calls[name]}")
+        self.diag_label.config(text="\n".join(lines))
+
+    def _on_run_stopped(self, done, n, cancelled):
+        self._progress = None
+        self._control  = None
+        self.pause_btn.config(state="disabled", text="⏸  Pause")
+        self.cancel_btn.config(state="disabled")
+        self.run_btn.config(state="normal")
+        if self._last_run is not None:
+            self.export_btn.config(state="normal")
+        if cancelled:
+            note = "Checkpoint saved." if self._checkpointed else ""
+            self.stats_label.config(text=f"  ✗ Cancelled at {done}/{n}.\n  {note}")
+        elif self._checkpointed and os.path.exists(CHECKPOINT_PATH):
+            os.remove(CHECKPOINT_PATH)
+        self._refresh_resume_btn()
+
+    # Simulation loop (background thread). It only publishes to the shared
+    # RunProgress, which the UI picks up in _pump(). The run checkpoints itself
+    # every CHECKPOINT_EVERY seconds, on pause and when it stops; a process pool
+    # is used when there is more than one chunk to play.
+
+    def SimMonteHall(self, run, control, progress, workers=1, instruments=None):
+        run.run(control, progress, CHECKPOINT_PATH, CHECKPOINT_EVERY, workers,
+                instruments)
+
+    # Run-until-precision simulation (background thread), n is the cap
+
+    def PrecisionSimMonteHall(self, progress, control, will_switch, n, doors, reveals,
+                              epsilon, seed=None):
+        seed = new_seed() if seed is None else seed
+        steps = simulate_until(epsilon, will_switch, seed, n, doors, reveals)
+        done, wins, interval = next(steps)
+        for following in steps:
+            progress.publish(done, wins, interval)
+            if not control.wait():
+                break
+            done, wins, interval = following
+        progress.publish(done, wins, interval, final=True)
+
+    # Compare run (background thread): stay, switch and random switching are
+    # tallied on the same trials, so it costs about one run. Publishes the
+    # tallies tuple (see COMPARE_FIELDS) in place of the wins count.
+
+    def CompareSimMonteHall(self, progress, control, n, doors, reveals, seed, workers=1):
+        chunk = CHUNK if workers > 1 else min(CHUNK, max(1, n // 200))
+        steps = compare(n, seed, workers, doors, reveals, chunk)
+        done, tallies = 0, (0,) * len(COMPARE_FIELDS)
+        try:
+            for done, tallies in steps:
+                tallies = tuple(int(t) for t in tallies)
+                progress.publish(done, tallies)
+                if not control.wait():
+                    break
+        finally:
+            steps.close()
+            progress.publish(done, tallies, final=True)
+
+    # Estimator run (background thread): each estimator in `names` plays the
+    # full N side by side. Publishes a tuple of (win_rate, standard_error,
+    # exact), one per estimator, in place of the wins count.
+
+    def EstimateSimMonteHall(self, progress, control, will_switch, n, doors, reveals,
+                             seed, names, workers=1):
+        # Even chunks, so antithetic pairs never leave a trial out
+        chunk = CHUNK if workers > 1 else min(CHUNK, max(2, n // 200 & ~1))
+        runs = [estimate_run(n, will_switch, seed, name, workers, doors, reveals, chunk)
+                for name in names]
+        done, estimates = 0, ()
+        try:
+            for steps in zip(*runs):
+                done = min(d for d, _ in steps)
+                estimates = tuple(
+                    (*estimate(stats, name, doors),
+                     exact_estimate(stats, name, will_switch, doors, reveals))
+                    for name, (_, stats) in zip(names, steps))
+                progress.publish(done, estimates)
+                if not control.wait():
+                    break
+        finally:
+            for run in runs:
+                run.close()
+            progress.publish(done, estimates, final=True)
+
+    # Tournament (background thread): every strategy's agents learn over N
+    # rounds. Publishes (agents_done, rounds_done, wins, switches) in place of
+    # the wins count; "done" is rounds, scaled by the share of agents finished
+    # when a pool plays them chunk by chunk.
+
+    def TournamentSimMonteHall(self, progress, control, agents, rounds, doors, reveals,
+                               seed, workers=1):
+        updates = tournament(agents, rounds, seed, STRATEGIES, workers, doors, reveals)
+        done, curves = 0, None
+        try:
+            for curves in updates:
+                agents_done, rounds_done = curves[:2]
+                done = rounds_done * int(agents_done.sum()) // (agents * len(STRATEGIES))
+                progress.publish(done, curves)
+                if not control.wait():
+                    break
+        finally:
+            updates.close()
+            progress.publish(done, curves, final=True)
+
+    # Ensemble (background thread): R replicates of N trials each. Publishes
+    # (replicates_done, trials_done, checkpoints, wins) in place of the wins
+    # count; "done" is trials per replicate, scaled by the share of replicates
+    # finished when a pool plays them group by group.
+
+    def EnsembleSimMonteHall(self, progress, control, replicates, n, will_switch, doors,
+                             reveals, seed, workers=1):
+        updates = ensemble(replicates, n, will_switch, seed, workers, doors, reveals)
+        done, paths = 0, None
+        try:
+            for paths in updates:
+                replicates_done, trials_done = paths[:2]
+                done = trials_done * replicates_done // replicates
+                progress.publish(done, paths)
+                if not control.wait():
+                    break
+        finally:
+            updates.close()
+            progress.publish(done, paths, final=True)
+
+    # Seeded fixed-N run (background thread): chunks already in the cache are
+    # summed, only the missing trials are played and then stored. Cancelling
+    # keeps what was played, so the next run with this seed picks it up.
+
+    def CachedSimMonteHall(self, progress, control, will_switch, n, doors, reveals,
+                           seed):
+        # sqlite connections stay on the thread that opened them. Played
+        # trials publish ~200 updates, as the unseeded path does
+        with ResultCache(DEFAULT_CACHE_PATH) as cache:
+            cached_simulate(n, will_switch, seed, cache, doors, reveals,
+                            control=control, progress=progress, every=max(1, n // 200))
 
 
     # Updates UI (called on main thread via after())
-    def _update_ui(self, runs_done, n, wins, losses, option_y, will_switch):
+    def _update_ui(self, runs_done, n, wins, losses, option_y, will_switch,
+                   interval=None, final=False):
         win_rate  = wins   / runs_done * 100
         loss_rate = losses / runs_done * 100
         option_label = "Random" if option_y is None else DOOR[option_y]
@@ -551,14 +1432,38 @@ class SimApp(tk.Tk):
         self.win_label.config(      text=f"Wins      : {wins}  ({win_rate:.1f}%)")
         self.loss_label.config(     text=f"Losses    : {losses}  ({loss_rate:.1f}%)")
 
-        self._graph_points.append((runs_done, wins / runs_done))
+        self._graph_series.append(runs_done, wins / runs_done)
         self._redraw_graph()
 
-        if runs_done == n:
+        if self._sim_doors is not None:
+            self._last_run = {
+                "mode": "Yes" if will_switch else "No",
+                "doors": self._sim_doors[0], "reveals": self._sim_doors[1],
+                "seed": self._sim_seed, "n": n, "trials": runs_done, "wins": wins,
+                "win_rate": wins / runs_done, "exact_rate": self._graph_ref,
+            }
+
+        if runs_done == n or final:
+            details = ""
+            if self._sim_doors is not None:
+                doors, reveals = self._sim_doors
+                details = (
+                    f"  Doors    : {doors} (Monty opens {reveals})\n"
+                    f"  Theory   : {self._graph_ref*100:.1f}%\n"
+                )
+            if self._sim_seed is not None:
+                details += f"  Seed     : {self._sim_seed}\n"
+            if interval is not None:
+                low, high = interval
+                details += (
+                    f"  Trials   : {runs_done} (cap {n})\n"
+                    f"  95% CI   : {low*100:.2f}% – {high*100:.2f}%\n"
+                )
             self.stats_label.config(
                 text=(
                     f"  Option   : {option_label}\n"
                     f"  Switch   : {'Yes' if will_switch else 'No'}\n"
+                    f"{details}"
                     f"  Win rate : {win_rate:.1f}%\n"
                     f"  Loss rate: {loss_rate:.1f}%\n"
                     f"  ✓ Simulation complete!"
@@ -567,6 +1472,242 @@ class SimApp(tk.Tk):
             self.run_btn.config(state="normal")
 
 
+    # Compare-mode counterpart of _update_ui (main thread): the Wins bar shows
+    # switching, the Losses bar staying
+    def _update_compare_ui(self, runs_done, n, tallies, final=False):
+        if self._graph_stay is None:
+            return      # stats were reset (mode change) while the run went on
+        stay, switch, random_, switch_only, stay_only = tallies
+
+        self.progress_bar["maximum"] = n
+        self.win_bar["maximum"]      = n
+        self.loss_bar["maximum"]     = n
+
+        self.progress_bar["value"] = runs_done
+        self.win_bar["value"]      = switch
+        self.loss_bar["value"]     = stay
+
+        self.progress_label.config(text=f"Progress  : {runs_done}/{n} ({runs_done/n*100:.1f}%)")
+        self.win_label.config(      text=f"Switch wins: {switch}  ({switch/runs_done*100:.1f}%)")
+        self.loss_label.config(     text=f"Stay wins  : {stay}  ({stay/runs_done*100:.1f}%)")
+
+        self._graph_series.append(runs_done, switch / runs_done)
+        self._graph_stay.append(runs_done, stay / runs_done)
+        self._redraw_graph()
+
+        self._last_run = {
+            "mode": "Compare",
+            "doors": self._sim_doors[0], "reveals": self._sim_doors[1],
+            "seed": self._sim_seed, "n": n, "trials": runs_done,
+            **dict(zip(COMPARE_FIELDS, tallies)),
+        }
+
+        if runs_done == n or final:
+            doors, reveals = self._sim_doors
+            diff, low, high = paired_difference_interval(switch_only, stay_only, runs_done)
+            r_low, r_high = wilson_interval(random_, runs_done)
+            self.stats_label.config(
+                text=(
+                    f"  Doors    : {doors} (Monty opens {reveals})\n"
+                    f"  Switch   : {switch/runs_done*100:.2f}% "
+                    f"(theory {self._graph_ref*100:.1f}%)\n"
+                    f"  Stay     : {stay/runs_done*100:.2f}% "
+                    f"(theory {self._graph_stay_ref*100:.1f}%)\n"
+                    f"  Random   : {random_/runs_done*100:.2f}% "
+                    f"({r_low*100:.2f}% – {r_high*100:.2f}%)\n"
+                    f"  Switch − stay: {diff*100:+.2f} pts\n"
+                    f"  paired 95% CI: {low*100:+.2f} – {high*100:+.2f}\n"
+                    f"  ✓ Comparison complete!"
+                )
+            )
+            self.run_btn.config(state="normal")
+
+
+    # Estimator counterpart of _update_ui (main thread): one line per
+    # estimator, bars from the first one. Efficiency is how many plain trials
+    # one trial of that estimator is worth at this N, (plain SE / its SE)^2.
+    def _update_estimate_ui(self, runs_done, n, estimates, will_switch, final=False):
+        if not self._estimators:
+            return      # stats were reset while the run went on
+        rate = estimates[0][0]
+
+        self.progress_bar["maximum"] = n
+        self.win_bar["maximum"]      = n
+        self.loss_bar["maximum"]     = n
+
+        self.progress_bar["value"] = runs_done
+        self.win_bar["value"]      = rate * runs_done
+        self.loss_bar["value"]     = (1 - rate) * runs_done
+
+        self.progress_label.config(text=f"Progress  : {runs_done}/{n} ({runs_done/n*100:.1f}%)")
+        self.win_label.config(      text=f"Wins      : ≈{rate*100:.2f}%")
+        self.loss_label.config(     text=f"Losses    : ≈{(1-rate)*100:.2f}%")
+
+        for series, (est, *_) in zip(self._graph_traces(), estimates):
+            series.append(runs_done, est)
+        self._redraw_graph()
+
+        self._last_run = {
+            "mode": "Yes" if will_switch else "No",
+            "doors": self._sim_doors[0], "reveals": self._sim_doors[1],
+            "seed": self._sim_seed, "n": n, "trials": runs_done,
+            "exact_rate": self._graph_ref,
+        }
+        for name, (est, se, _) in zip(self._estimators, estimates):
+            self._last_run[f"{name}_win_rate"] = est
+            self._last_run[f"{name}_std_error"] = se
+
+        if runs_done >= n or final:
+            doors, reveals = self._sim_doors
+            plain_se = plain_standard_error(self._graph_ref, runs_done)
+            lines = []
+            for name, (est, se, exact) in zip(self._estimators, estimates):
+                gain = "exact" if exact else f"x{(plain_se / se) ** 2:.1f}" if se > 0 else "n/a"
+                lines.append(f"  {name.capitalize():<11}: {est*100:.3f}% ± {se*100:.3f}%  {gain}\n")
+            self.stats_label.config(
+                text=(
+                    f"  Switch   : {'Yes' if will_switch else 'No'}\n"
+                    f"  Doors    : {doors} (Monty opens {reveals})\n"
+                    f"  Theory   : {self._graph_ref*100:.3f}%\n"
+                    f"  Estimate ± standard error, efficiency:\n"
+                    f"{''.join(lines)}"
+                    f"  ✓ Simulation complete!"
+                )
+            )
+            self.run_btn.config(state="normal")
+
+
+    # Tournament counterpart of _update_ui (main thread): a learning curve
+    # (win rate per round) for each strategy, bars from all of them together.
+    # New rounds are appended; when a pool adds agents to rounds already drawn
+    # the curve is rebuilt.
+    def _update_tournament_ui(self, runs_done, n, curves, final=False):
+        if not self._strategies:
+            return      # stats were reset while the run went on
+        agents, rounds_done, wins, switches = curves
+        previous = self._curves[0] if self._curves is not None else None
+        self._curves = curves
+        played = agents > 0
+        overall = wins[played].sum() / (agents[played].sum() * rounds_done)
+
+        self.progress_bar["maximum"] = n
+        self.win_bar["maximum"]      = n
+        self.loss_bar["maximum"]     = n
+
+        self.progress_bar["value"] = runs_done
+        self.win_bar["value"]      = overall * runs_done
+        self.loss_bar["value"]     = (1 - overall) * runs_done
+
+        self.progress_label.config(text=f"Progress  : {runs_done}/{n} rounds "
+                                        f"({runs_done/n*100:.1f}%)")
+        self.win_label.config(      text=f"Wins      : ≈{overall*100:.2f}%")
+        self.loss_label.config(     text=f"Losses    : ≈{(1-overall)*100:.2f}%")
+
+        for i, series in enumerate(self._graph_traces()):
+            if not agents[i]:
+                continue
+            if previous is not None and previous[i] != agents[i]:
+                series.clear()
+            rates = wins[i] / agents[i]
+            for r in range(len(series), rounds_done):
+                series.append(r + 1, rates[r])
+        self._redraw_graph()
+
+        # "final" is the last tenth of the rounds, once the players have learned
+        tail = max(rounds_done // 10, 1)
+        self._last_run = {
+            "mode": "Tournament",
+            "doors": self._sim_doors[0], "reveals": self._sim_doors[1],
+            "seed": self._sim_seed, "rounds": n, "rounds_done": rounds_done,
+            "always_switch": self._graph_ref, "always_stay": self._graph_stay_ref,
+        }
+        lines = []
+        for i, name in enumerate(self._strategies):
+            if not agents[i]:
+                lines.append(f"  {name:<19}: waiting\n")
+                continue
+            total = wins[i].sum() / (agents[i] * rounds_done)
+            final_rate = wins[i, -tail:].mean() / agents[i]
+            switching = switches[i, -tail:].mean() / agents[i]
+            self._last_run.update({f"{name}_agents": int(agents[i]),
+                                   f"{name}_win_rate": total,
+                                   f"{name}_final_win_rate": final_rate,
+                                   f"{name}_final_switching": switching})
+            lines.append(f"  {name:<19}: {total*100:.2f}%, last {tail} "
+                         f"{final_rate*100:.2f}% ({switching*100:.0f}% switch)\n")
+
+        if runs_done >= n or final:
+            doors, reveals = self._sim_doors
+            self.stats_label.config(
+                text=(
+                    f"  Agents   : {int(agents.max()):,} per strategy\n"
+                    f"  Doors    : {doors} (Monty opens {reveals})\n"
+                    f"  Theory   : switch {self._graph_ref*100:.1f}%, "
+                    f"stay {self._graph_stay_ref*100:.1f}%\n"
+                    f"  Win rate, overall and once learned:\n"
+                    f"{''.join(lines)}"
+                    f"  ✓ Tournament complete!"
+                )
+            )
+            self.run_btn.config(state="normal")
+
+
+
+    # Ensemble counterpart of _update_ui (main thread): the median path, the
+    # percentile band and the 1/sqrt(N) envelope over the checkpoints reached,
+    # bars from the median. Only the frames actually drawn compute the bands.
+    def _update_ensemble_ui(self, runs_done, n, paths, will_switch, final=False):
+        if not self._replicates:
+            return      # stats were reset while the run went on
+        replicates_done, trials_done, checkpoints, wins = paths
+        median, low, high = ensemble_bands(checkpoints, wins)
+        doors, reveals = self._sim_doors
+        env_low, env_high = envelope(checkpoints, doors, reveals, will_switch)
+        self._bands = (checkpoints, median, low, high, env_low, env_high)
+        rate = median[-1]
+
+        self.progress_bar["maximum"] = n
+        self.win_bar["maximum"]      = n
+        self.loss_bar["maximum"]     = n
+
+        self.progress_bar["value"] = runs_done
+        self.win_bar["value"]      = rate * runs_done
+        self.loss_bar["value"]     = (1 - rate) * runs_done
+
+        self.progress_label.config(text=f"Progress  : {runs_done}/{n} per replicate "
+                                        f"({runs_done/n*100:.1f}%)")
+        self.win_label.config(      text=f"Wins      : median {rate*100:.2f}%")
+        self.loss_label.config(     text=f"Losses    : median {(1-rate)*100:.2f}%")
+        self._redraw_graph()
+
+        inside = coverage(checkpoints, wins, doors, reveals, will_switch)
+        self._last_run = {
+            "mode": "Ensemble", "switch": will_switch, "doors": doors, "reveals": reveals,
+            "seed": self._sim_seed, "replicates": self._replicates,
+            "replicates_done": int(replicates_done), "trials": n,
+            "trials_done": int(checkpoints[-1]), "theory": self._graph_ref,
+            "median_win_rate": float(rate), "band_low": float(low[-1]),
+            "band_high": float(high[-1]), "envelope_low": float(env_low[-1]),
+            "envelope_high": float(env_high[-1]),
+            "inside_envelope": inside,
+        }
+
+        if runs_done >= n or final:
+            self.stats_label.config(
+                text=(
+                    f"  Replicates : {self._replicates:,} x {n:,} trials\n"
+                    f"  Doors      : {doors} (Monty opens {reveals})\n"
+                    f"  Theory     : {self._graph_ref*100:.3f}%\n"
+                    f"  Median     : {rate*100:.3f}%\n"
+                    f"  {BAND[0]:g}-{BAND[1]:g}%  : [{low[-1]*100:.3f}%, {high[-1]*100:.3f}%]\n"
+                    f"  Envelope   : [{env_low[-1]*100:.3f}%, {env_high[-1]*100:.3f}%]\n"
+                    f"  Inside     : {inside*100:.1f}% of replicates (≈95% expected)\n"
+                    f"  ✓ Ensemble complete!"
+                )
+            )
+            self.run_btn.config(state="normal")
+
+
 if __name__ == "__main__":
     app = SimApp()
     app.mainloop()
@@ -0,0 +1,50 @@
+# Headless Monty Hall simulation core (no Tk dependency). The top level is
+# the engine, RNG and stats; the other subsystems, the pool engines in
+# parallel.py included (they pull in ensemble, estimate and tournament), are
+# imported from their own modules when needed.
+from .engine import (
+    CHUNK,
+    COMPARE_FIELDS,
+    PlayMonteHall,
+    check_doors,
+    chunk_sizes,
+    compare_batch,
+    compare_chunk,
+    deal_batch,
+    door_dtype,
+    exact_win_probability,
+    play_chunk,
+    sequential_compare,
+    sequential_simulate,
+    simulate_batch,
+    simulate_until,
+)
+from .rng import RNG_ALGORITHM, chunk_rng, locate, new_seed, seed_key
+from .stats import Z_95, paired_difference_interval, trials_for_precision, wilson_interval
+
+__all__ = [
+    "CHUNK",
+    "COMPARE_FIELDS",
+    "PlayMonteHall",
+    "RNG_ALGORITHM",
+    "Z_95",
+    "check_doors",
+    "chunk_rng",
+    "chunk_sizes",
+    "compare_batch",
+    "compare_chunk",
+    "deal_batch",
+    "door_dtype",
+    "exact_win_probability",
+    "locate",
+    "new_seed",
+    "paired_difference_interval",
+    "play_chunk",
+    "seed_key",
+    "sequential_compare",
+    "sequential_simulate",
+    "simulate_batch",
+    "simulate_until",
+    "trials_for_precision",
+    "wilson_interval",
+]
@@ -0,0 +1,5 @@
+from montyhall.cli import main
+
+# Guarded so "spawn" pool workers can re-import this module safely
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+# Throughput benchmarks:  python -m montyhall bench
+#
+# Every case runs in a fresh "spawn" process so its peak RSS is its own and
+# not the high-water mark of whatever ran before it. Peak RSS comes from the
+# resource module, which only Unix has; elsewhere it is reported as missing.
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:             # Windows
+    resource = None
+
+from .engine import PlayMonteHall, sequential_simulate
+from .parallel import parallel_simulate
+
+
+ENGINES = ("python", "numpy", "parallel")
+DEFAULT_SIZES = [10**k for k in range(3, 9)]
+# The pure-Python reference loop needs several microseconds per trial
+PYTHON_MAX_N = 10**6
+BENCH_SEED = 20240101
+
+
+def _play_python(n, switch):
+    # The original per-trial loop the GUI used to run
+    random.seed(BENCH_SEED)
+    wins = 0
+    for _ in range(n):
+        wins += PlayMonteHall(random.randint(0, 2), switch)[0]
+    return wins
+
+
+def _play(engine, n, switch, workers):
+    if engine == "python":
+        return _play_python(n, switch)
+    if engine == "numpy":
+        runs = sequential_simulate(n, switch, BENCH_SEED)
+    else:
+        runs = parallel_simulate(n, switch, BENCH_SEED, workers)
+    wins = 0
+    for _, wins in runs:
+        pass
+    return wins
+
+
+def _peak_rss_kib():
+    # None where there is no resource module.
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    if resource is None:
+        return None
+    scale = 1024 if sys.platform == "darwin" else 1
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale
+    return max(own, children)
+
+
+def _measure(engine, n, switch, workers, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        wins = _play(engine, n, switch, workers)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, wins, _peak_rss_kib()
+
+
+def cases(engines=ENGINES, sizes=DEFAULT_SIZES, workers=None,
+          python_max_n=PYTHON_MAX_N):
+    workers = workers or sorted({1, os.cpu_count() or 1})
+    for engine in engines:
+        for n in sizes:
+            if engine == "python" and n > python_max_n:
+                continue
+            for switch in (True, False):
+                for w in (workers if engine == "parallel" else [1]):
+                    yield engine, n, switch, w
+
+
+def run_case(engine, n, switch, workers, repeat=3):
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        elapsed, wins, peak = pool.submit(
+            _measure, engine, n, switch, workers, repeat
+        ).result()
+    return {
+        "engine": engine,
+        "workers": workers,
+        "n": n,
+        "switch": switch,
+        "wins": wins,
+        "elapsed_s": elapsed,
+        "trials_per_s": n / elapsed if elapsed > 0 else None,
+        "ns_per_trial": elapsed / n * 1e9,
+        "peak_rss_kib": peak,
+    }
+
+
+def run_bench(case_list, repeat=3, on_result=None):
+    results = []
+    for case in case_list:
+        result = run_case(*case, repeat=repeat)
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def case_key(result):
+    return result["engine"], result["workers"], result["n"], result["switch"]
+
+
+def baseline_cases(baseline):
+    # {case_key: result} of a loaded report; ValueError if it is not one
+    try:
+        base = {case_key(r): r for r in baseline["results"]}
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"not a bench report ({type(exc).__name__}: {exc})") from None
+    for r in base.values():
+        rate = r.get("trials_per_s")
+        if rate is not None and (isinstance(rate, bool) or not isinstance(rate, (int, float))):
+            raise ValueError(f"trials_per_s must be a number, not {rate!r}")
+    return base
+
+
+def compare(report, base, threshold):
+    # Returns (rows, regressions) against baseline_cases(). A case regresses
+    # when its throughput is more than `threshold` (a fraction) below the
+    # baseline's.
+    rows, regressions = [], []
+    for result in report["results"]:
+        old = base.get(case_key(result))
+        if old is None or not old.get("trials_per_s") or not result.get("trials_per_s"):
+            continue
+        change = result["trials_per_s"] / old["trials_per_s"] - 1
+        row = (result, old, change)
+        rows.append(row)
+        if change < -threshold:
+            regressions.append(row)
+    return rows, regressions
@@ -0,0 +1,184 @@
+# On-disk cache of finished simulation results (SQLite).
+#
+# A seeded run is a sum over chunks, and chunk i always draws from
+# chunk_rng(seed, i), so the cache stores the wins of every *full* chunk
+# played so far for a configuration, plus (trials, wins) of the partial chunk
+# after them from the last run that ended there. Any N up to what is stored
+# is answered by summing a prefix; a larger N only plays the chunks that are
+# missing and then extends the entry. A partial chunk does not draw the same
+# games as the full one, so the stored tail only answers that exact N.
+#
+# The cache plays the same CHUNK streams as simulate(), so a seed gives the
+# same totals cached or not. Entries are evicted least-recently-used once the
+# cache grows past max_bytes.
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from .engine import CHUNK, check_doors, play_chunk, win_marks
+from .rng import RNG_ALGORITHM, chunk_rng
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".montyhall_cache.sqlite")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_WINS_DTYPE = np.dtype("<u4")
+
+
+def config_key(seed, switch, doors=3, reveals=1, chunk=CHUNK):
+    return json.dumps(
+        {"rng": RNG_ALGORITHM, "seed": seed, "switch": bool(switch),
+         "doors": doors, "reveals": reveals, "chunk": chunk},
+        sort_keys=True,
+    )
+
+
+class ResultCache:
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        # Sweep workers each open their own connection; WAL lets them read
+        # while another one writes
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " chunk_wins BLOB NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " tail_trials INTEGER NOT NULL DEFAULT 0,"
+            " tail_wins INTEGER NOT NULL DEFAULT 0)"
+        )
+        # Files written before the tail was kept lack its columns
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(results)")}
+        for column in ("tail_trials", "tail_wins"):
+            if column not in columns:
+                self._db.execute(
+                    f"ALTER TABLE results ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, key):
+        # (wins of every stored full chunk oldest first, (tail_trials, tail_wins))
+        # where the tail is the partial chunk right after them; empty if none
+        row = self._db.execute(
+            "SELECT chunk_wins, tail_trials, tail_wins FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return np.empty(0, dtype=_WINS_DTYPE), (0, 0)
+        with self._db:
+            self._db.execute(
+                "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+        return np.frombuffer(row[0], dtype=_WINS_DTYPE), (row[1], row[2])
+
+    def put(self, key, chunk_wins, tail=(0, 0)):
+        blob = np.asarray(chunk_wins, dtype=_WINS_DTYPE).tobytes()
+        with self._db:
+            # Another process may have stored a longer prefix meanwhile; keep
+            # it. With as many full chunks the newer tail wins.
+            row = self._db.execute(
+                "SELECT length(chunk_wins) FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (row[0] > len(blob)
+                                    or row[0] == len(blob) and not tail[0]):
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO results "
+                "(key, chunk_wins, last_used, tail_trials, tail_wins) "
+                "VALUES (?, ?, ?, ?, ?)", (key, blob, time.time(), *map(int, tail)),
+            )
+        self.evict()
+
+    def size(self):
+        return self._db.execute(
+            "SELECT COALESCE(SUM(length(chunk_wins)), 0) FROM results"
+        ).fetchone()[0]
+
+    def evict(self):
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT key, length(chunk_wins) FROM results ORDER BY last_used"
+        ).fetchall()
+        with self._db:
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                total -= size
+
+
+def _play(seed, index, size, switch, doors, reveals, done, wins, every, progress):
+    # Wins of one chunk; with `every` smaller than the chunk, also publishes
+    # the running totals at each multiple of it inside the chunk
+    if progress is None or not every or every >= size:
+        return play_chunk(seed, index, size, switch, doors, reveals)[1]
+    won = np.cumsum(win_marks(size, switch, chunk_rng(seed, index), doors, reveals),
+                    dtype=np.int64)
+    for end in range(every - done % every, size, every):
+        progress.publish(done + end, wins + int(won[end - 1]))
+    return int(won[-1])
+
+
+def cached_simulate(n, switch, seed, cache, doors=3, reveals=1, chunk=CHUNK,
+                    control=None, progress=None, every=None):
+    # Same totals as sequential_simulate(n, ..., chunk), reusing and
+    # extending the cache. Returns (trials_done, wins, trials_reused). Progress
+    # is published after every chunk, and every `every` trials inside the ones
+    # played. When `control` is cancelled the chunks played so far are still
+    # stored.
+    check_doors(doors, reveals)
+    key = config_key(seed, switch, doors, reveals, chunk)
+    full, tail = divmod(n, chunk)
+
+    stored, (tail_trials, tail_wins) = cache.get(key)
+    first = min(len(stored), full)
+    wins = int(stored[:first].sum())
+    done = reused = first * chunk
+    if progress is not None:
+        progress.publish(done, wins)
+
+    new_wins = []
+    played_tail = None
+    try:
+        for index in range(first, full):
+            if control is not None and not control.wait():
+                break
+            chunk_wins = _play(seed, index, chunk, switch, doors, reveals, done, wins,
+                               every, progress)
+            new_wins.append(chunk_wins)
+            done += chunk
+            wins += chunk_wins
+            if progress is not None:
+                progress.publish(done, wins)
+        else:
+            if tail and len(stored) == full and tail_trials == tail:
+                done += tail
+                wins += tail_wins
+                reused += tail
+            elif tail and (control is None or control.wait()):
+                played_tail = _play(seed, full, tail, switch, doors, reveals, done,
+                                    wins, every, progress)
+                done += tail
+                wins += played_tail
+    finally:
+        # A tail is only kept right after the stored chunks
+        if new_wins or played_tail is not None and len(stored) == full:
+            cache.put(key, np.concatenate([stored, np.asarray(new_wins, _WINS_DTYPE)]),
+                      (0, 0) if played_tail is None else (tail, played_tail))
+        if progress is not None:
+            progress.publish(done, wins, final=True)
+    return done, wins, reused
@@ -0,0 +1,1098 @@
+# Command line front end:  python -m montyhall simulate --n 1e8 --switch both
+#
+# Subsystems that are slow to import or only some commands need (bench,
+# cache/sweep, export, trace, server, cluster, asyncio) are imported inside
+# those commands, and their defaults are filled in there.
+import argparse
+import json
+import os
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from .instrument import Instruments, phase, profile_call, timed
+from .exact import HOSTS, exact_given, exact_outcomes
+from .estimate import ESTIMATORS, estimate, exact_estimate, plain_standard_error
+from .engine import (
+    CHUNK, COMPARE_FIELDS, check_doors, chunk_sizes, exact_win_probability, simulate_until,
+)
+from .ensemble import BAND, ENSEMBLE_POINTS, coverage, ensemble_bands, envelope
+from .parallel import compare, ensemble, estimate_run, simulate, tournament
+from .rng import new_seed
+from .runner import SimulationRun
+from .stats import Z_95, paired_difference_interval, wilson_interval
+from .tournament import DEFAULT_EPSILON, STRATEGIES, check_strategies
+
+
+SWITCH_CHOICES = {"yes": [True], "no": [False], "both": [True, False]}
+DEFAULT_N = 10_000
+DEFAULT_MAX_N = 10**9
+DOOR_NAMES = ["Door 1", "Door 2", "Door 3"]
+
+
+def _epsilon(text):
+    value = float(text)
+    if not 0 < value < 0.5:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 0.5: {text!r}")
+    return value
+
+
+def _count(text):
+    # Accepts plain integers as well as float notation such as 1e8
+    try:
+        value = int(text)
+    except ValueError:
+        try:
+            value = float(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"not a number: {text!r}")
+        if not value.is_integer():
+            raise argparse.ArgumentTypeError(f"not a whole number: {text!r}")
+        value = int(value)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {text!r}")
+    return value
+
+
+def _bias(text):
+    # A probability as a fraction ("3/4") or a decimal ("0.75")
+    try:
+        value = Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        raise argparse.ArgumentTypeError(f"not a probability: {text!r}")
+    if not 0 <= value <= 1:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 1: {text!r}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="montyhall", description="Headless Monty Hall simulator."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sim = commands.add_parser("simulate", help="run N trials and print the results")
+    sim.add_argument("--n", type=_count, default=None,
+                     help="number of trials, e.g. 10000 or 1e8 (default: 10000); "
+                          "with --precision, the most trials to play (default: 1e9)")
+    sim.add_argument("--switch", choices=sorted(SWITCH_CHOICES) + ["compare"],
+                     default="both",
+                     help="strategy to simulate (default: both); compare plays stay, "
+                          "switch and random switching on the same trials")
+    sim.add_argument("--seed", type=int, default=None,
+                     help="master seed; a random one is drawn and reported if omitted")
+    sim.add_argument("--workers", type=_count, default=os.cpu_count() or 1,
+                     help="worker processes (default: os.cpu_count())")
+    sim.add_argument("--doors", type=_count, default=3,
+                     help="number of doors (default: 3)")
+    sim.add_argument("--reveals", type=int, default=1,
+                     help="goat doors Monty opens (default: 1)")
+    sim.add_argument("--precision", type=_epsilon, default=None, metavar="EPS",
+                     help="stop once the 95%% Wilson interval is within +/-EPS "
+                          "(e.g. 0.001)")
+    sim.add_argument("--checkpoint", metavar="PATH", default=None,
+                     help="save progress to PATH every --checkpoint-every seconds and "
+                          "on Ctrl-C (needs --switch yes or no)")
+    sim.add_argument("--checkpoint-every", type=float, default=10.0, metavar="SECONDS",
+                     help="seconds between checkpoints (default: 10)")
+    sim.add_argument("--resume", metavar="PATH", default=None,
+                     help="continue the run saved in checkpoint PATH; its own "
+                          "settings are used and PATH keeps being updated")
+    sim.add_argument("--trace", metavar="PATH", default=None,
+                     help="also write every trial to PATH: .npy (one byte each), "
+                          ".arrow or .parquet (3 doors, 1 reveal, --switch yes or no)")
+    sim.add_argument("--export", metavar="PATH", default=None,
+                     help="write the run summary to PATH (.csv, .npy, .arrow or .parquet)")
+    sim.add_argument("--series", metavar="PATH", default=None,
+                     help="stream the cumulative win rate after every chunk to PATH "
+                          "(.csv, .npy, .arrow or .parquet)")
+    sim.add_argument("--estimator", choices=list(ESTIMATORS) + ["all"], default="plain",
+                     help="plain trials (default), stratified or antithetic sampling, "
+                          "or all three on the same budget; reports each win rate with "
+                          "its standard error")
+    sim.add_argument("--exact", action="store_true",
+                     help="only print the closed-form win probability, no trials")
+    sim.add_argument("--profile", metavar="PATH", default=None,
+                     help="run under cProfile, save the pstats to PATH and print the "
+                          "hottest calls and a per-phase breakdown to stderr")
+    sim.add_argument("--format", choices=["text", "json"], default="text",
+                     help="output format (default: text)")
+    sim.set_defaults(func=cmd_simulate)
+
+    b = commands.add_parser("bench", help="measure trial throughput of each engine")
+    b.add_argument("--engines", nargs="+", default=None,
+                   help="engines to measure: python, numpy, parallel (default: all)")
+    b.add_argument("--sizes", nargs="+", type=_count, default=None,
+                   help="trial counts (default: 1e3 1e4 ... 1e8)")
+    b.add_argument("--workers", nargs="+", type=_count, default=None,
+                   help="worker counts for the parallel engine (default: 1 and os.cpu_count())")
+    b.add_argument("--python-max-n", type=_count, default=None,
+                   help="largest N for the slow pure-Python engine (default: 1e6)")
+    b.add_argument("--repeat", type=_count, default=3,
+                   help="runs per case, the fastest is reported (default: 3)")
+    b.add_argument("--output", metavar="PATH", default=None,
+                   help="write the JSON report to PATH")
+    b.add_argument("--baseline", metavar="PATH", default=None,
+                   help="compare against a saved JSON report")
+    b.add_argument("--threshold", type=float, default=0.10,
+                   help="fail if throughput drops by more than this fraction "
+                        "of the baseline (default: 0.10)")
+    b.set_defaults(func=cmd_bench)
+
+    sw = commands.add_parser("sweep", help="run a grid of configurations through the cache")
+    sw.add_argument("--n", nargs="+", type=_count, default=[DEFAULT_N],
+                    help="trial counts (default: 10000)")
+    sw.add_argument("--switch", choices=sorted(SWITCH_CHOICES), default="both",
+                    help="strategies (default: both)")
+    sw.add_argument("--doors", nargs="+", type=_count, default=[3],
+                    help="door counts (default: 3)")
+    sw.add_argument("--reveals", nargs="+", type=int, default=[1],
+                    help="goat doors Monty opens; impossible pairs are skipped (default: 1)")
+    sw.add_argument("--seeds", nargs="+", type=int, default=[0],
+                    help="master seeds, one run per seed (default: 0)")
+    sw.add_argument("--workers", type=_count, default=os.cpu_count() or 1,
+                    help="worker processes (default: os.cpu_count())")
+    sw.add_argument("--cache", metavar="PATH", default=None,
+                    help="SQLite result cache (default: ~/.montyhall_cache.sqlite)")
+    sw.add_argument("--cache-size", type=_count, default=None,
+                    metavar="MIB", help="evict least recently used results beyond "
+                                        "this size (default: 64)")
+    sw.add_argument("--format", choices=["text", "json"], default="text",
+                    help="output format (default: text)")
+    sw.set_defaults(func=cmd_sweep)
+
+    tr = commands.add_parser("trace", help="summarize a trace file written with --trace")
+    tr.add_argument("path", help=".npy trace file")
+    tr.add_argument("--start", type=int, default=0, help="first trial (default: 0)")
+    tr.add_argument("--stop", type=int, default=None, help="end trial (default: all)")
+    tr.add_argument("--format", choices=["text", "json"], default="text",
+                    help="output format (default: text)")
+    tr.set_defaults(func=cmd_trace)
+
+    ex = commands.add_parser("exact", help="exact win probabilities for other hosts")
+    ex.add_argument("--doors", type=_count, default=3, help="number of doors (default: 3)")
+    ex.add_argument("--reveals", type=int, default=1,
+                    help="doors Monty opens (default: 1)")
+    ex.add_argument("--host", nargs="+", choices=HOSTS, default=list(HOSTS),
+                    help="host behaviours to list (default: all)")
+    ex.add_argument("--bias", type=_bias, default=Fraction(1),
+                    help="biased host: chance he opens the lowest numbered goat door "
+                         "when he has a choice, e.g. 3/4 (default: 1)")
+    ex.add_argument("--given", nargs="+", type=int, default=None, metavar="DOOR",
+                    help="odds after picking door 1 and seeing these doors opened "
+                         "(numbered from 1)")
+    ex.add_argument("--format", choices=["text", "json"], default="text",
+                    help="output format (default: text)")
+    ex.set_defaults(func=cmd_exact)
+
+    sv = commands.add_parser("serve", help="run the local HTTP/JSON simulation service")
+    sv.add_argument("--host", default=None,
+                    help="address to listen on (default: 127.0.0.1)")
+    sv.add_argument("--port", type=int, default=None,
+                    help="port, 0 for any free one (default: 8335)")
+    sv.add_argument("--workers", type=_count, default=os.cpu_count() or 1,
+                    help="processes in the shared pool (default: all cores)")
+    sv.add_argument("--queue", type=_count, default=None,
+                    help="jobs that may wait before POST /simulate answers 503 "
+                         "(default: 64)")
+    sv.add_argument("--concurrency", type=_count, default=None,
+                    help="jobs running at once (default: 4)")
+    sv.set_defaults(func=cmd_serve)
+
+    tn = commands.add_parser("tournament",
+                             help="pit learning players against each other over many rounds")
+    tn.add_argument("--agents", type=_count, default=10_000,
+                    help="agents per strategy (default: 10000)")
+    tn.add_argument("--rounds", type=_count, default=1_000,
+                    help="games each agent plays (default: 1000)")
+    tn.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES),
+                    help="strategies to enter (default: all)")
+    tn.add_argument("--epsilon", type=float, default=DEFAULT_EPSILON,
+                    help="epsilon_greedy: share of random choices "
+                         f"(default: {DEFAULT_EPSILON})")
+    tn.add_argument("--seed", type=int, default=None,
+                    help="master seed (default: fresh entropy, printed)")
+    tn.add_argument("--workers", type=_count, default=os.cpu_count() or 1,
+                    help="processes; one task per strategy and agent chunk "
+                         "(default: all cores)")
+    tn.add_argument("--doors", type=_count, default=3, help="number of doors (default: 3)")
+    tn.add_argument("--reveals", type=int, default=1,
+                    help="goat doors Monty opens (default: 1)")
+    tn.add_argument("--curves", metavar="PATH", default=None,
+                    help="write each strategy's win rate and share switching per round "
+                         "(.csv, .npy, .arrow or .parquet)")
+    tn.add_argument("--format", choices=["text", "json"], default="text",
+                    help="output format (default: text)")
+    tn.set_defaults(func=cmd_tournament)
+
+    en = commands.add_parser("ensemble",
+                             help="run R independent replicates and summarize their spread")
+    en.add_argument("--replicates", type=_count, default=1_000,
+                    help="independent replicates (default: 1000)")
+    en.add_argument("--n", type=_count, default=1_000_000,
+                    help="trials per replicate (default: 1e6)")
+    en.add_argument("--switch", choices=["yes", "no"], default="yes",
+                    help="strategy every replicate plays (default: yes)")
+    en.add_argument("--points", type=_count, default=ENSEMBLE_POINTS,
+                    help=f"log-spaced checkpoints (default: {ENSEMBLE_POINTS})")
+    en.add_argument("--seed", type=int, default=None,
+                    help="master seed (default: fresh entropy, printed)")
+    en.add_argument("--workers", type=_count, default=os.cpu_count() or 1,
+                    help="processes; one task per group of replicates (default: all cores)")
+    en.add_argument("--doors", type=_count, default=3, help="number of doors (default: 3)")
+    en.add_argument("--reveals", type=int, default=1,
+                    help="goat doors Monty opens (default: 1)")
+    en.add_argument("--bands", metavar="PATH", default=None,
+                    help="write the median, percentile band and 1/sqrt(N) envelope at every "
+                         "checkpoint (.csv, .npy, .arrow or .parquet)")
+    en.add_argument("--format", choices=["text", "json"], default="text",
+                    help="output format (default: text)")
+    en.set_defaults(func=cmd_ensemble)
+
+    co = commands.add_parser("coordinator",
+                             help="hand out one run to workers on other machines")
+    co.add_argument("--n", type=_count, default=DEFAULT_N,
+                    help="number of trials, e.g. 1e11 (default: 10000)")
+    co.add_argument("--switch", choices=["yes", "no", "compare"], default="yes",
+                    help="strategy to simulate, or compare (default: yes)")
+    co.add_argument("--seed", type=int, default=None,
+                    help="master seed; a random one is drawn and reported if omitted")
+    co.add_argument("--doors", type=_count, default=3, help="number of doors (default: 3)")
+    co.add_argument("--reveals", type=int, default=1,
+                    help="goat doors Monty opens (default: 1)")
+    co.add_argument("--host", default=None,
+                    help="address to listen on, 0.0.0.0 for other machines "
+                         "(default: 127.0.0.1)")
+    co.add_argument("--port", type=int, default=None,
+                    help="port, 0 for any free one (default: 8336)")
+    co.add_argument("--task-chunks", type=_count, default=None,
+                    help="chunks of 2^20 trials per task (default: 64)")
+    co.add_argument("--token", default=None,
+                    help="shared secret workers must present (default: none)")
+    co.add_argument("--local", type=int, default=0, metavar="K",
+                    help="also start K workers on this machine (default: 0)")
+    co.add_argument("--processes", type=_count, default=1,
+                    help="processes per --local worker (default: 1)")
+    co.add_argument("--series", metavar="PATH", default=None,
+                    help="write the cumulative totals after every task, in trial "
+                         "order, to PATH (.csv, .npy, .arrow or .parquet)")
+    co.add_argument("--format", choices=["text", "json"], default="text",
+                    help="output format (default: text)")
+    co.set_defaults(func=cmd_coordinator)
+
+    wk = commands.add_parser("worker", help="play tasks for a coordinator")
+    wk.add_argument("--connect", default=None, metavar="HOST:PORT",
+                    help="coordinator address (default: 127.0.0.1:8336)")
+    wk.add_argument("--processes", type=_count, default=os.cpu_count() or 1,
+                    help="processes playing chunks (default: os.cpu_count())")
+    wk.add_argument("--name", default=None,
+                    help="name the coordinator knows this worker by (default: host:pid)")
+    wk.add_argument("--token", default=None, help="the coordinator's --token")
+    wk.add_argument("--wait", type=float, default=10.0, metavar="SECONDS",
+                    help="keep trying to connect this long (default: 10)")
+    wk.set_defaults(func=cmd_worker)
+    return parser
+
+
+def cmd_simulate(args):
+    args.instruments = Instruments() if args.profile else None
+    if not args.profile:
+        return _simulate(args)
+    try:
+        status, hottest = profile_call(lambda: _simulate(args), args.profile)
+    except OSError as exc:
+        print(f"montyhall simulate: error: cannot write --profile {args.profile}: {exc}",
+              file=sys.stderr)
+        return 2
+    # stderr so --format json on stdout stays parseable
+    print(f"\nprofile saved to {args.profile}\n{hottest.rstrip()}\n\n"
+          f"{args.instruments.format()}", file=sys.stderr)
+    return status
+
+
+def _simulate(args):
+    reveals = args.reveals
+    try:
+        check_doors(args.doors, reveals)
+    except ValueError as exc:
+        print(f"montyhall simulate: error: {exc}", file=sys.stderr)
+        return 2
+
+    if args.estimator != "plain" and (args.trace or args.checkpoint or args.resume
+                                      or args.series or args.precision is not None
+                                      or args.switch == "compare"):
+        print("montyhall simulate: error: --estimator needs --switch yes, no or both and "
+              "a fixed --n, without --trace, --checkpoint, --resume or --series",
+              file=sys.stderr)
+        return 2
+    if args.trace:
+        return _simulate_traced(args)
+    if args.resume or args.checkpoint:
+        return _simulate_resumable(args)
+    if args.switch == "compare" and not args.exact:
+        return _simulate_compare(args)
+    if args.estimator != "plain" and not args.exact:
+        return _simulate_estimators(args)
+
+    seed = new_seed() if args.seed is None else args.seed
+    switches = SWITCH_CHOICES.get(args.switch, [True, False])
+    series = None
+    if args.series and not args.exact:
+        rows = None
+        if args.precision is None:
+            rows = len(switches) * len(chunk_sizes(args.n or DEFAULT_N))
+        from .export import SERIES_COLUMNS
+        series = _open_series(args, [("switch", bool)] + SERIES_COLUMNS, rows)
+        if series is None:
+            return 2
+
+    runs = []
+    for switch in switches:
+        exact = exact_win_probability(args.doors, reveals, switch)
+        run = {"switch": switch, "exact": str(exact), "exact_rate": float(exact)}
+        if args.exact:
+            pass
+        elif args.precision is not None:
+            start = time.perf_counter()
+            max_n = args.n or DEFAULT_MAX_N
+            for done, wins, (low, high) in _played(simulate_until(
+                args.precision, switch, seed, max_n, args.doors, reveals
+            ), args.instruments):
+                if series is not None:
+                    with phase(args.instruments, "series"):
+                        series.append(switch, done, wins, wins / done)
+            elapsed = time.perf_counter() - start
+            run.update({
+                "trials": done,
+                "wins": wins,
+                "win_rate": wins / done,
+                "ci_low": low,
+                "ci_high": high,
+                "stopped": "precision" if (high - low) / 2 <= args.precision else "max_n",
+                "elapsed_s": elapsed,
+                "trials_per_s": done / elapsed if elapsed > 0 else None,
+            })
+        else:
+            start = time.perf_counter()
+            done = wins = 0
+            for done, wins in _played(simulate(args.n or DEFAULT_N, switch, seed,
+                                               args.workers, args.doors, reveals),
+                                      args.instruments):
+                if series is not None:
+                    with phase(args.instruments, "series"):
+                        series.append(switch, done, wins, wins / done)
+            elapsed = time.perf_counter() - start
+            run.update({
+                "trials": done,
+                "wins": wins,
+                "win_rate": wins / done,
+                "elapsed_s": elapsed,
+                "trials_per_s": done / elapsed if elapsed > 0 else None,
+            })
+        runs.append(run)
+    if series is not None:
+        series.close()
+    if not args.exact and not _export_summary(
+        args, [dict(doors=args.doors, reveals=reveals, seed=seed, **r) for r in runs]
+    ):
+        return 2
+
+    if args.format == "json":
+        report = {"doors": args.doors, "reveals": reveals, "runs": runs}
+        if not args.exact:
+            report.update({"seed": seed, "workers": args.workers})
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        header = f"doors {args.doors}  reveals {reveals}"
+        if not args.exact:
+            header += f"  seed {seed}  workers {args.workers}"
+        print(header)
+        for run in runs:
+            line = (f"  Switch: {'Yes' if run['switch'] else 'No ':<3}  "
+                    f"exact {run['exact']} ({run['exact_rate']:.5%})")
+            if not args.exact:
+                rate = run["trials_per_s"] or float("inf")
+                line += (
+                    f"  trials {run['trials']:>12,}  wins {run['wins']:>12,}  "
+                    f"win rate {run['win_rate']:.5%}  "
+                    f"{run['elapsed_s']:.3f}s  {rate:,.0f} trials/s"
+                )
+                if "ci_low" in run:
+                    line += (f"  95% CI [{run['ci_low']:.5%}, {run['ci_high']:.5%}]"
+                             f"  stopped at {run['stopped']}")
+            print(line)
+    return 0
+
+
+def _played(updates, instruments):
+    # Times each chunk of a simulate()-style generator as "play" and counts
+    # the trials; updates pass through unchanged
+    if instruments is None:
+        yield from updates
+        return
+    before = 0
+    for update in timed(updates, instruments, "play"):
+        instruments.count("trials", update[0] - before)
+        before = update[0]
+        yield update
+
+
+def _open_series(args, columns, rows):
+    from .export import TableWriter
+    try:
+        return TableWriter(args.series, columns, rows)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"montyhall simulate: error: cannot write --series {args.series}: {exc}",
+              file=sys.stderr)
+        return None
+
+
+def _export_summary(args, rows):
+    if not args.export:
+        return True
+    from .export import write_table
+    try:
+        write_table(args.export, rows)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"montyhall simulate: error: cannot write --export {args.export}: {exc}",
+              file=sys.stderr)
+        return False
+    return True
+
+
+def cmd_bench(args):
+    from . import bench
+    engines = args.engines or list(bench.ENGINES)
+    unknown = [e for e in engines if e not in bench.ENGINES]
+    if unknown:
+        print(f"montyhall bench: error: unknown engine {unknown[0]!r}; use one of "
+              f"{', '.join(bench.ENGINES)}", file=sys.stderr)
+        return 2
+    sizes = args.sizes or bench.DEFAULT_SIZES
+    python_max_n = bench.PYTHON_MAX_N if args.python_max_n is None else args.python_max_n
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline) as f:
+                baseline = bench.baseline_cases(json.load(f))
+        except (OSError, ValueError) as exc:
+            print(f"montyhall bench: error: cannot read baseline {args.baseline}: {exc}",
+                  file=sys.stderr)
+            return 2
+
+    print(f"{'engine':<9}{'workers':>8}{'N':>13}  {'switch':<7}"
+          f"{'trials/s':>15}{'ns/trial':>11}{'peak RSS':>12}")
+
+    def show(r):
+        rss = r["peak_rss_kib"]
+        rss = "n/a" if rss is None else f"{rss / 1024:.1f} MiB"
+        rate = r["trials_per_s"]
+        rate = "n/a" if rate is None else f"{rate:,.0f}"
+        print(f"{r['engine']:<9}{r['workers']:>8}{r['n']:>13,}  "
+              f"{'Yes' if r['switch'] else 'No':<7}{rate:>15}"
+              f"{r['ns_per_trial']:>11.2f}{rss:>13}")
+
+    case_list = bench.cases(engines, sizes, args.workers, python_max_n)
+    report = bench.run_bench(case_list, args.repeat, on_result=show)
+
+    if args.output:
+        try:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        except OSError as exc:
+            print(f"montyhall bench: error: cannot write --output {args.output}: {exc}",
+                  file=sys.stderr)
+            return 2
+
+    if baseline is None:
+        return 0
+    rows, regressions = bench.compare(report, baseline, args.threshold)
+    print(f"\ncompared {len(rows)} cases with {args.baseline} "
+          f"(threshold {args.threshold:.0%})")
+    for result, old, change in regressions:
+        print(f"  REGRESSION {result['engine']} workers={result['workers']} "
+              f"N={result['n']:,} switch={result['switch']}: "
+              f"{old['trials_per_s']:,.0f} -> {result['trials_per_s']:,.0f} trials/s "
+              f"({change:+.1%})")
+    if regressions:
+        return 1
+    print("  no regressions")
+    return 0
+
+
+def cmd_sweep(args):
+    from . import sweep
+    from .cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES
+    args.cache = DEFAULT_CACHE_PATH if args.cache is None else args.cache
+    if args.cache_size is None:
+        args.cache_size = DEFAULT_MAX_BYTES // 2**20
+    cells = sweep.grid(args.n, SWITCH_CHOICES[args.switch], args.doors,
+                       args.reveals, args.seeds)
+    if not cells:
+        print("montyhall sweep: error: no valid doors/reveals combination",
+              file=sys.stderr)
+        return 2
+
+    if args.format == "text":
+        print(f"{'N':>13}  {'switch':<7}{'doors':>6}{'reveals':>8}{'seed':>8}"
+              f"{'win rate':>11}{'exact':>11}{'reused':>13}")
+    start = time.perf_counter()
+    results = []
+    for r in sweep.run_sweep(cells, args.cache, args.workers, args.cache_size * 2**20):
+        results.append(r)
+        if args.format == "text":
+            print(f"{r['n']:>13,}  {'Yes' if r['switch'] else 'No':<7}{r['doors']:>6}"
+                  f"{r['reveals']:>8}{r['seed']:>8}{r['win_rate']:>11.5%}"
+                  f"{r['exact_rate']:>11.5%}{r['reused']:>13,}")
+    elapsed = time.perf_counter() - start
+
+    if args.format == "json":
+        json.dump({"cache": args.cache, "workers": args.workers, "elapsed_s": elapsed,
+                   "results": results}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        reused = sum(r["reused"] for r in results)
+        total = sum(r["trials"] for r in results)
+        print(f"{len(results)} cells in {elapsed:.3f}s, "
+              f"{reused:,} of {total:,} trials from the cache")
+    return 0
+
+
+def _simulate_compare(args):
+    # Every strategy on the same trials, with a paired interval for switch - stay
+    if args.precision is not None:
+        print("montyhall simulate: error: --switch compare needs a fixed --n",
+              file=sys.stderr)
+        return 2
+    seed = new_seed() if args.seed is None else args.seed
+    n = args.n or DEFAULT_N
+    series = None
+    if args.series:
+        columns = [("trials", np.int64)] + [(name, np.int64) for name in COMPARE_FIELDS]
+        series = _open_series(args, columns, len(chunk_sizes(n)))
+        if series is None:
+            return 2
+    start = time.perf_counter()
+    done, tallies = 0, None
+    for done, tallies in _played(compare(n, seed, args.workers, args.doors, args.reveals),
+                                 args.instruments):
+        if series is not None:
+            with phase(args.instruments, "series"):
+                series.append(done, *tallies)
+    elapsed = time.perf_counter() - start
+    if series is not None:
+        series.close()
+    stay, switch, random_, switch_only, stay_only = (int(t) for t in tallies)
+
+    strategies = []
+    for name, wins, exact in (
+        ("stay", stay, exact_win_probability(args.doors, args.reveals, False)),
+        ("switch", switch, exact_win_probability(args.doors, args.reveals, True)),
+        ("random", random_, (exact_win_probability(args.doors, args.reveals, False)
+                             + exact_win_probability(args.doors, args.reveals, True)) / 2),
+    ):
+        low, high = wilson_interval(wins, done)
+        strategies.append({"strategy": name, "wins": wins, "win_rate": wins / done,
+                           "ci_low": low, "ci_high": high, "exact": str(exact),
+                           "exact_rate": float(exact)})
+    diff, low, high = paired_difference_interval(switch_only, stay_only, done)
+    report = {
+        "doors": args.doors, "reveals": args.reveals, "seed": seed,
+        "workers": args.workers, "trials": done, "strategies": strategies,
+        "switch_minus_stay": {"diff": diff, "ci_low": low, "ci_high": high,
+                              "switch_only": switch_only, "stay_only": stay_only},
+        "elapsed_s": elapsed,
+        "trials_per_s": done / elapsed if elapsed > 0 else None,
+    }
+    if not _export_summary(args, [
+        dict(doors=args.doors, reveals=args.reveals, seed=seed, trials=done, **r)
+        for r in strategies
+    ]):
+        return 2
+
+    if args.format == "json":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(f"doors {args.doors}  reveals {args.reveals}  seed {seed}  "
+              f"workers {args.workers}  trials {done:,}  {elapsed:.3f}s")
+        for r in strategies:
+            print(f"  {r['strategy'].capitalize():<7} exact {r['exact']} "
+                  f"({r['exact_rate']:.5%})  wins {r['wins']:>12,}  "
+                  f"win rate {r['win_rate']:.5%}  "
+                  f"95% CI [{r['ci_low']:.5%}, {r['ci_high']:.5%}]")
+        print(f"  Switch - stay  {diff:+.5%}  paired 95% CI [{low:+.5%}, {high:+.5%}]")
+    return 0
+
+
+def _simulate_estimators(args):
+    # Each estimator gets the full --n budget; efficiency is how many plain
+    # trials one of its trials is worth, (plain SE / its SE)^2, and None when
+    # the SE is zero or unknown
+    seed = new_seed() if args.seed is None else args.seed
+    n = args.n or DEFAULT_N
+    names = ESTIMATORS if args.estimator == "all" else (args.estimator,)
+    runs = []
+    for switch in SWITCH_CHOICES[args.switch]:
+        exact = exact_win_probability(args.doors, args.reveals, switch)
+        for name in names:
+            start = time.perf_counter()
+            done, stats = 0, None
+            for done, stats in _played(estimate_run(n, switch, seed, name, args.workers,
+                                                    args.doors, args.reveals),
+                                       args.instruments):
+                pass
+            elapsed = time.perf_counter() - start
+            rate, se = estimate(stats, name, args.doors)
+            plain_se = plain_standard_error(float(exact), done)
+            exact_run = exact_estimate(stats, name, switch, args.doors, args.reveals)
+            runs.append({
+                "switch": switch, "estimator": name, "trials": done, "win_rate": rate,
+                "std_error": se, "ci_low": rate - Z_95 * se, "ci_high": rate + Z_95 * se,
+                "exact": str(exact), "exact_rate": float(exact),
+                "efficiency": (plain_se / se) ** 2 if se > 0 else None,
+                "exact_estimate": exact_run,
+                "elapsed_s": elapsed,
+                "trials_per_s": done / elapsed if elapsed > 0 else None,
+            })
+    if not _export_summary(args, [dict(doors=args.doors, reveals=args.reveals, seed=seed,
+                                       **r) for r in runs]):
+        return 2
+
+    if args.format == "json":
+        json.dump({"doors": args.doors, "reveals": args.reveals, "seed": seed,
+                   "workers": args.workers, "runs": runs}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    print(f"doors {args.doors}  reveals {args.reveals}  seed {seed}  workers {args.workers}")
+    for r in runs:
+        if r["exact_estimate"]:
+            efficiency = "exact (no variance)"
+        elif r["efficiency"] is None:
+            efficiency = "efficiency n/a"
+        else:
+            efficiency = f"efficiency x{r['efficiency']:.2f}"
+        print(f"  Switch: {'Yes' if r['switch'] else 'No ':<3}  {r['estimator']:<10}  "
+              f"trials {r['trials']:>12,}  win rate {r['win_rate']:.5%} "
+              f"± {r['std_error']:.5%} (SE)  exact {r['exact_rate']:.5%}  {efficiency}")
+    return 0
+
+
+def _simulate_traced(args):
+    # One strategy of the classic game, every trial written to the trace file
+    if (args.switch not in ("yes", "no") or args.doors != 3 or args.reveals != 1
+            or args.precision is not None or args.checkpoint or args.resume):
+        print("montyhall simulate: error: --trace needs --switch yes or no, 3 doors, "
+              "1 reveal and a fixed --n", file=sys.stderr)
+        return 2
+    n = args.n or DEFAULT_N
+    seed = new_seed() if args.seed is None else args.seed
+    switch = args.switch == "yes"
+    from .export import open_trace_writer
+    from .trace import record
+    try:
+        store = open_trace_writer(args.trace, n)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"montyhall simulate: error: cannot write --trace {args.trace}: {exc}",
+              file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    try:
+        with phase(args.instruments, "record"):
+            done, wins = record(n, switch, seed, store)
+        if args.instruments is not None:
+            args.instruments.count("trials", done)
+    finally:
+        store.close()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "seed": seed, "doors": 3, "reveals": 1, "trace": args.trace,
+        "trace_bytes": os.path.getsize(args.trace),
+        "runs": [{"switch": switch, "trials": done, "wins": wins,
+                  "win_rate": wins / done, "elapsed_s": elapsed,
+                  "trials_per_s": done / elapsed if elapsed > 0 else None}],
+    }
+    if not _export_summary(args, [dict(seed=seed, doors=3, reveals=1, **r)
+                                  for r in result["runs"]]):
+        return 2
+    if args.format == "json":
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(f"doors 3  reveals 1  seed {seed}  trace {args.trace} "
+              f"({result['trace_bytes'] / 2**20:.1f} MiB)")
+        print(f"  Switch: {'Yes' if switch else 'No ':<3}  trials {done:>12,}  "
+              f"wins {wins:>12,}  win rate {wins / done:.5%}  {elapsed:.3f}s")
+    return 0
+
+
+def cmd_trace(args):
+    from .trace import TraceStore
+    try:
+        store = TraceStore.open(args.path)
+    except (OSError, ValueError) as exc:
+        print(f"montyhall trace: error: cannot open {args.path}: {exc}", file=sys.stderr)
+        return 2
+    totals = store.tally(args.start, args.stop)
+    doors = {name: store.door_counts(name, args.start, args.stop).tolist()
+             for name in ("first_pick", "shown", "winner")}
+    if args.format == "json":
+        json.dump({"path": args.path, "length": len(store), **totals, "doors": doors},
+                  sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    trials = totals["trials"]
+    print(f"{args.path}: {len(store):,} trials, showing {trials:,}")
+    if trials:
+        print(f"  wins {totals['wins']:,} ({totals['wins'] / trials:.5%})  "
+              f"switched {totals['switched']:,}  switch wins {totals['switch_wins']:,}")
+        for name, counts in doors.items():
+            print(f"  {name:<11}" + "  ".join(f"{DOOR_NAMES[i]} {c:>12,}"
+                                              for i, c in enumerate(counts)))
+    return 0
+
+
+def cmd_serve(args):
+    import asyncio
+    from . import server
+    for name in ("host", "port", "queue", "concurrency"):
+        if getattr(args, name) is None:
+            setattr(args, name, getattr(server, f"DEFAULT_{name.upper()}"))
+
+    def ready(port):
+        print(f"serving on http://{args.host}:{port}  workers {args.workers}  "
+              f"queue {args.queue}  concurrency {args.concurrency}", file=sys.stderr)
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.workers, args.queue,
+                                 args.concurrency, ready))
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        print(f"montyhall serve: error: {exc}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def cmd_exact(args):
+    rows = []
+    try:
+        for host in args.host:
+            bias = args.bias if host == "biased" else None
+            if args.given is None:
+                odds = exact_outcomes(args.doors, args.reveals, host, bias)
+            else:
+                odds = exact_given([d - 1 for d in args.given], args.doors,
+                                   args.reveals, host, bias)
+            rows.append({"host": host, "bias": bias, "odds": odds})
+    except ValueError as exc:
+        print(f"montyhall exact: error: {exc}", file=sys.stderr)
+        return 2
+
+    if args.format == "json":
+        json.dump({
+            "doors": args.doors, "reveals": args.reveals, "given": args.given,
+            "hosts": [{"host": r["host"],
+                       "bias": None if r["bias"] is None else str(r["bias"]),
+                       **({} if r["odds"] is None else
+                          {k: {"exact": str(v), "rate": float(v)}
+                           for k, v in r["odds"].items()})}
+                      for r in rows],
+        }, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    header = f"doors {args.doors}  reveals {args.reveals}"
+    if args.given is not None:
+        header += "  pick Door 1, opened " + ", ".join(f"Door {d}" for d in args.given)
+    print(header)
+    for r in rows:
+        name = r["host"] if r["bias"] is None else f"{r['host']} {r['bias']}"
+        if r["odds"] is None:
+            print(f"  {name:<14}cannot happen")
+            continue
+        print(f"  {name:<14}" + "  ".join(
+            f"{k} {str(v):>9} ({float(v):8.4%})" for k, v in r["odds"].items()
+        ))
+    return 0
+
+
+def cmd_tournament(args):
+    try:
+        check_doors(args.doors, args.reveals)
+        strategies = check_strategies(args.strategies, args.epsilon)
+    except ValueError as exc:
+        print(f"montyhall tournament: error: {exc}", file=sys.stderr)
+        return 2
+    seed = new_seed() if args.seed is None else args.seed
+    start = time.perf_counter()
+    for agents, rounds, wins, switches in tournament(
+            args.agents, args.rounds, seed, strategies, args.workers, args.doors,
+            args.reveals, args.epsilon):
+        pass
+    elapsed = time.perf_counter() - start
+    win_rate = wins / agents[:, None]
+    switching = switches / agents[:, None]
+
+    if args.curves:
+        columns = [("round", np.int64)]
+        values = [np.arange(1, rounds + 1)]
+        for i, name in enumerate(strategies):
+            columns += [(f"{name}_win_rate", np.float64), (f"{name}_switching", np.float64)]
+            values += [win_rate[i], switching[i]]
+        from .export import TableWriter
+        try:
+            with TableWriter(args.curves, columns, rounds) as writer:
+                writer.extend(*values)
+        except (OSError, ValueError, ImportError) as exc:
+            print(f"montyhall tournament: error: cannot write --curves {args.curves}: {exc}",
+                  file=sys.stderr)
+            return 2
+
+    # "final" is the last tenth of the rounds, where the players have learned
+    tail = max(rounds // 10, 1)
+    results = [{
+        "strategy": name,
+        "win_rate": float(wins[i].sum() / (agents[i] * rounds)),
+        "final_win_rate": float(win_rate[i, -tail:].mean()),
+        "final_switching": float(switching[i, -tail:].mean()),
+    } for i, name in enumerate(strategies)]
+    switch = exact_win_probability(args.doors, args.reveals, True)
+    stay = exact_win_probability(args.doors, args.reveals, False)
+
+    if args.format == "json":
+        json.dump({"agents": args.agents, "rounds": rounds, "doors": args.doors,
+                   "reveals": args.reveals, "seed": seed, "epsilon": args.epsilon,
+                   "workers": args.workers, "elapsed_s": elapsed,
+                   "always_switch": float(switch), "always_stay": float(stay),
+                   "strategies": results}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    print(f"{args.agents:,} agents x {rounds:,} rounds per strategy  doors {args.doors}  "
+          f"reveals {args.reveals}  seed {seed}  ({elapsed:.2f}s)")
+    for r in results:
+        print(f"  {r['strategy']:<20}win rate {r['win_rate']:8.4%}  last {tail:,} rounds "
+              f"{r['final_win_rate']:8.4%}, switching {r['final_switching']:7.2%}")
+    print(f"  {'always switch':<20}win rate {float(switch):8.4%}")
+    print(f"  {'always stay':<20}win rate {float(stay):8.4%}")
+    return 0
+
+
+def cmd_ensemble(args):
+    try:
+        check_doors(args.doors, args.reveals)
+    except ValueError as exc:
+        print(f"montyhall ensemble: error: {exc}", file=sys.stderr)
+        return 2
+    seed = new_seed() if args.seed is None else args.seed
+    switch = args.switch == "yes"
+    start = time.perf_counter()
+    for replicates, done, checkpoints, wins in ensemble(
+            args.replicates, args.n, switch, seed, args.workers, args.doors, args.reveals,
+            args.points):
+        pass
+    elapsed = time.perf_counter() - start
+    median, low, high = ensemble_bands(checkpoints, wins)
+    env_low, env_high = envelope(checkpoints, args.doors, args.reveals, switch)
+    inside = coverage(checkpoints, wins, args.doors, args.reveals, switch)
+    exact = exact_win_probability(args.doors, args.reveals, switch)
+
+    if args.bands:
+        columns = [("trials", np.int64), ("median", np.float64), ("low", np.float64),
+                   ("high", np.float64), ("envelope_low", np.float64),
+                   ("envelope_high", np.float64)]
+        from .export import TableWriter
+        try:
+            with TableWriter(args.bands, columns, len(checkpoints)) as writer:
+                writer.extend(checkpoints, median, low, high, env_low, env_high)
+        except (OSError, ValueError, ImportError) as exc:
+            print(f"montyhall ensemble: error: cannot write --bands {args.bands}: {exc}",
+                  file=sys.stderr)
+            return 2
+
+    # Rows at the checkpoints nearest each power of ten, and the last one
+    rows = sorted({int(np.abs(np.log10(checkpoints) - k).argmin())
+                   for k in range(int(np.log10(args.n)) + 1)} | {len(checkpoints) - 1})
+    if args.format == "json":
+        json.dump({
+            "replicates": replicates, "n": done, "switch": args.switch, "doors": args.doors,
+            "reveals": args.reveals, "seed": seed, "workers": args.workers,
+            "exact": str(exact), "exact_rate": float(exact), "band": list(BAND),
+            "coverage": inside, "elapsed_s": elapsed,
+            "checkpoints": [{"trials": int(checkpoints[j]), "median": median[j],
+                             "low": low[j], "high": high[j],
+                             "envelope_low": env_low[j], "envelope_high": env_high[j]}
+                            for j in rows],
+        }, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    print(f"{replicates:,} replicates x {done:,} trials  {'Switch' if switch else 'Stay'}  "
+          f"doors {args.doors}  reveals {args.reveals}  seed {seed}  ({elapsed:.2f}s)")
+    print(f"  {'trials':>12}  {'median':>9}  {BAND[0]:g}-{BAND[1]:g}% band"
+          f"{'':>9}1/sqrt(N) envelope")
+    for j in rows:
+        print(f"  {checkpoints[j]:>12,}  {median[j]:9.5%}  [{low[j]:9.5%}, {high[j]:9.5%}]  "
+              f"[{env_low[j]:9.5%}, {env_high[j]:9.5%}]")
+    print(f"  exact {exact} ({float(exact):.5%}); {inside:.1%} of replicates end inside "
+          f"the 95% envelope")
+    return 0
+
+
+def cmd_coordinator(args):
+    import asyncio
+    from . import cluster, server
+    try:
+        check_doors(args.doors, args.reveals)
+    except ValueError as exc:
+        print(f"montyhall coordinator: error: {exc}", file=sys.stderr)
+        return 2
+    args.host = server.DEFAULT_HOST if args.host is None else args.host
+    args.port = cluster.DEFAULT_PORT if args.port is None else args.port
+    args.task_chunks = cluster.TASK_CHUNKS if args.task_chunks is None else args.task_chunks
+    seed = new_seed() if args.seed is None else args.seed
+    series, on_series = None, None
+    if args.series:
+        fields = COMPARE_FIELDS if args.switch == "compare" else ("wins",)
+        columns = [("trials", np.int64)] + [(name, np.int64) for name in fields]
+        tasks = -(-args.n // (CHUNK * args.task_chunks))
+        from .export import TableWriter
+        try:
+            series = TableWriter(args.series, columns, tasks)
+        except (OSError, ValueError, ImportError) as exc:
+            print(f"montyhall coordinator: error: cannot write --series {args.series}: "
+                  f"{exc}", file=sys.stderr)
+            return 2
+        on_series = lambda trials, tallies: series.append(trials, *tallies)
+
+    def ready(coordinator, port):
+        print(f"coordinating {args.n:,} trials in {len(coordinator.ranges):,} tasks "
+              f"on {args.host}:{port}  seed {seed}", file=sys.stderr)
+
+    try:
+        result = asyncio.run(cluster.coordinate(
+            args.n, args.switch, seed, args.doors, args.reveals, args.host, args.port,
+            task_chunks=args.task_chunks, token=args.token, local=args.local,
+            processes=args.processes, on_series=on_series, ready=ready))
+    except KeyboardInterrupt:
+        return 130
+    except OSError as exc:
+        print(f"montyhall coordinator: error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        if series is not None:
+            series.close()
+
+    if args.format == "json":
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    done = result["trials"]
+    elapsed = result["finished"] - result["started"]
+    print(f"doors {args.doors}  reveals {args.reveals}  seed {seed}  trials {done:,}  "
+          f"workers {result['workers']}  reissued {result['reissued']}  {elapsed:.3f}s")
+    if args.switch == "compare":
+        for name, wins in result["tallies"].items():
+            print(f"  {name:<12}{wins:>16,}  ({wins / done:.5%})")
+        return 0
+    wins = result["wins"]
+    low, high = wilson_interval(wins, done)
+    exact = exact_win_probability(args.doors, args.reveals, args.switch == "yes")
+    print(f"  {'Switch' if args.switch == 'yes' else 'Stay'}  exact {exact} "
+          f"({float(exact):.5%})  wins {wins:,}  win rate {wins / done:.5%}  "
+          f"95% CI [{low:.5%}, {high:.5%}]")
+    return 0
+
+
+def cmd_worker(args):
+    import asyncio
+    from . import cluster, server
+    if args.connect is None:
+        args.connect = f"{server.DEFAULT_HOST}:{cluster.DEFAULT_PORT}"
+    host, _, port = args.connect.rpartition(":")
+    if not host or not port.isdigit():
+        print(f"montyhall worker: error: --connect needs HOST:PORT, not {args.connect!r}",
+              file=sys.stderr)
+        return 2
+    try:
+        played = asyncio.run(cluster.work(host, int(port), args.processes, args.name,
+                                          args.token, args.wait))
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, ValueError, cluster.ProtocolError) as exc:
+        print(f"montyhall worker: error: {exc}", file=sys.stderr)
+        return 1
+    print(f"worker done: played {played:,} tasks", file=sys.stderr)
+    return 0
+
+
+def _simulate_resumable(args):
+    # One fixed-N strategy, played chunk by chunk with checkpoints
+    if args.resume:
+        path = args.resume
+        try:
+            run = SimulationRun.load(path)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"montyhall simulate: error: cannot resume from {path}: {exc}",
+                  file=sys.stderr)
+            return 2
+    else:
+        path = args.checkpoint
+        if args.switch in ("both", "compare") or args.precision is not None:
+            print("montyhall simulate: error: --checkpoint needs --switch yes or no "
+                  "and a fixed --n", file=sys.stderr)
+            return 2
+        run = SimulationRun(args.n or DEFAULT_N, args.switch == "yes", args.seed,
+                            args.doors, args.reveals)
+
+    start_done = run.done
+    start = time.perf_counter()
+    try:
+        run.run(checkpoint=path, every=args.checkpoint_every, workers=args.workers,
+                instruments=args.instruments)
+    except KeyboardInterrupt:
+        print(f"interrupted at {run.done:,}/{run.n:,} trials; "
+              f"resume with --resume {path}", file=sys.stderr)
+        return 130
+    elapsed = time.perf_counter() - start
+    played = run.done - start_done
+
+    result = {
+        "seed": run.seed,
+        "workers": args.workers,
+        "doors": run.doors,
+        "reveals": run.reveals,
+        "runs": [{
+            "switch": run.switch,
+            "exact": str(exact_win_probability(run.doors, run.reveals, run.switch)),
+            "trials": run.done,
+            "wins": run.wins,
+            "win_rate": run.wins / run.done,
+            "resumed_at": start_done,
+            "elapsed_s": elapsed,
+            "trials_per_s": played / elapsed if elapsed > 0 else None,
+        }],
+    }
+    if not _export_summary(args, [dict(seed=run.seed, doors=run.doors, reveals=run.reveals,
+                                       **r) for r in result["runs"]]):
+        return 2
+
+    if args.format == "json":
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        r = result["runs"][0]
+        print(f"doors {run.doors}  reveals {run.reveals}  seed {run.seed}  "
+              f"workers {args.workers}  checkpoint {path}")
+        print(f"  Switch: {'Yes' if run.switch else 'No ':<3}  exact {r['exact']}  "
+              f"trials {run.done:>12,}  wins {run.wins:>12,}  "
+              f"win rate {r['win_rate']:.5%}  resumed at {start_done:,}  "
+              f"{elapsed:.3f}s")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
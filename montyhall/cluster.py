@@ -0,0 +1,434 @@
+# Multi-node runs over plain TCP: one coordinator hands out trial ranges and
+# any number of workers, on any machines, play them and send back totals.
+#
+# A run is cut into the same chunks as simulate() (chunk i is trials
+# i*chunk ... and is played from chunk_rng(seed, i)), and a task is a range of
+# TASK_CHUNKS consecutive chunks. The seed plus the first chunk index is all a
+# worker needs to reproduce its trials, so a range can be played anywhere and
+# played again after a worker dies. Totals are integer sums merged once per
+# range, in whatever order they arrive, so the result is exactly that of a
+# single-node run with the same seed and chunk size.
+#
+# Messages are JSON objects, one per line:
+#
+#   worker -> coordinator   {"type": "hello", "protocol", "name", "slots", "token"}
+#                           {"type": "result", "task", "trials", "tallies"}
+#                           {"type": "alive"}     every HEARTBEAT_EVERY seconds
+#                           {"type": "error", "error"}   a task failed; it quits
+#   coordinator -> worker   {"type": "task", "task", "run": {...}, "first", "start",
+#                            "stop"}
+#                           {"type": "done"}      nothing left, disconnect
+#                           {"type": "error", "error"}
+#
+# A worker that reports an error, closes its connection, or says nothing for
+# DEAD_AFTER seconds is dropped, and its unfinished ranges go back to the
+# front of the queue. There is no encryption and only an optional shared
+# token, so run it on a network you trust.
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import CHUNK, COMPARE_FIELDS, check_doors, compare_chunk, play_chunk
+from .server import _ignore_sigint
+
+
+PROTOCOL = 1
+DEFAULT_PORT = 8336
+TASK_CHUNKS = 64            # chunks per task, ~6.7e7 trials at the default chunk
+SLOTS = 2                   # tasks a worker holds at once, so it never waits on the wire
+HEARTBEAT_EVERY = 2.0       # seconds
+DEAD_AFTER = 10.0           # seconds of silence before a worker is dropped
+MAX_LINE = 1 << 20
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def _chunk_player(mode, doors, reveals):
+    # (fn, extra args) playing one chunk of a run, as the server does
+    if mode == "compare":
+        return compare_chunk, (doors, reveals)
+    return play_chunk, (mode == "yes", doors, reveals)
+
+
+async def _send(writer, message):
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+
+
+async def _receive(reader):
+    # The next message, or None once the other side has gone
+    try:
+        line = await reader.readline()
+    except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+        return None
+    if not line:
+        return None
+    try:
+        message = json.loads(line)
+    except ValueError:
+        raise ProtocolError("message is not JSON")
+    if not isinstance(message, dict) or "type" not in message:
+        raise ProtocolError("message has no type")
+    return message
+
+
+# ----------------------------------------------------------------------
+# Coordinator
+# ----------------------------------------------------------------------
+class _Worker:
+    def __init__(self, name, slots, writer):
+        self.name = name
+        self.slots = slots
+        self.writer = writer
+        self.tasks = set()
+        self.seen = time.monotonic()
+
+
+class Coordinator:
+    def __init__(self, n, mode="yes", seed=0, doors=3, reveals=1, chunk=CHUNK,
+                 task_chunks=TASK_CHUNKS, token=None, on_series=None):
+        check_doors(doors, reveals)
+        if mode not in ("yes", "no", "compare"):
+            raise ValueError('mode must be "yes", "no" or "compare"')
+        self.n = n
+        self.mode = mode
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.chunk = chunk
+        self.token = token
+        # on_series(trials, tallies) for every task, in trial order: the
+        # totals over all trials before the end of that task
+        self.on_series = on_series
+
+        step = chunk * task_chunks
+        self.ranges = [(start, min(start + step, n)) for start in range(0, n, step)]
+        self.todo = deque(range(len(self.ranges)))
+        self.results = {}           # task -> tallies, merged ones only
+        self.done = 0
+        self.tallies = np.zeros(len(COMPARE_FIELDS) if mode == "compare" else 1,
+                                dtype=np.int64)
+        self.workers = set()
+        self.seen_workers = 0
+        self.reissued = 0
+        self.started = self.finished = None
+        self._prefix = 0            # tasks merged from the start, for on_series
+        self._prefix_tallies = np.zeros_like(self.tallies)
+        self._server = None
+        self._reaper = None
+        self._handlers = set()
+        self._complete = asyncio.Event()
+
+    def run_params(self):
+        return {"n": self.n, "switch": self.mode, "seed": self.seed, "doors": self.doors,
+                "reveals": self.reveals, "chunk": self.chunk}
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        # Returns the port actually bound (pass port=0 for any free one)
+        self.started = time.time()
+        if not self.ranges:
+            self._complete.set()
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        self._reaper = asyncio.create_task(self._reap())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def wait(self):
+        # Blocks until every range is merged, then tells the workers and stops
+        await self._complete.wait()
+        self.finished = time.time()
+        for worker in list(self.workers):
+            try:
+                await _send(worker.writer, {"type": "done"})
+            except ConnectionError:
+                pass
+        await self.stop()
+        return self.result()
+
+    async def stop(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self._server is not None:
+            self._server.close()
+            for worker in list(self.workers):
+                worker.writer.close()
+            await self._server.wait_closed()
+        # Closed connections end their handlers' reads; let them finish
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    def result(self):
+        out = {**self.run_params(), "trials": self.done, "tasks": len(self.ranges),
+               "workers": self.seen_workers, "reissued": self.reissued,
+               "started": self.started, "finished": self.finished}
+        if self.mode == "compare":
+            out["tallies"] = {name: int(t) for name, t in zip(COMPARE_FIELDS, self.tallies)}
+        else:
+            out["wins"] = int(self.tallies[0])
+            out["win_rate"] = out["wins"] / self.done if self.done else None
+        if self.started and self.finished:
+            elapsed = self.finished - self.started
+            out["trials_per_s"] = self.done / elapsed if elapsed > 0 else None
+        return out
+
+    # Tasks ----------------------------------------------------------------
+    def _task_message(self, task):
+        start, stop = self.ranges[task]
+        return {"type": "task", "task": task, "run": self.run_params(),
+                "first": start // self.chunk, "start": start, "stop": stop}
+
+    async def _feed(self, worker):
+        while len(worker.tasks) < worker.slots and self.todo:
+            task = self.todo.popleft()
+            if task in self.results:
+                continue
+            worker.tasks.add(task)
+            await _send(worker.writer, self._task_message(task))
+
+    async def _feed_all(self):
+        for worker in list(self.workers):
+            try:
+                await self._feed(worker)
+            except ConnectionError:
+                self._drop(worker)
+
+    def _merge(self, worker, message):
+        task = message.get("task")
+        if not isinstance(task, int) or task not in worker.tasks:
+            raise ProtocolError(f"result for a task it was not given: {task!r}")
+        worker.tasks.discard(task)
+        if task in self.results:
+            return      # played twice after a reissue; the answer is the same
+        start, stop = self.ranges[task]
+        tallies = message.get("tallies")
+        if message.get("trials") != stop - start or not isinstance(tallies, list) \
+                or len(tallies) != len(self.tallies):
+            raise ProtocolError(f"bad result for task {task}")
+        tallies = np.array(tallies, dtype=np.int64)
+        self.results[task] = tallies
+        self.done += stop - start
+        self.tallies += tallies
+        while self._prefix in self.results:
+            self._prefix_tallies += self.results[self._prefix]
+            if self.on_series is not None:
+                self.on_series(self.ranges[self._prefix][1], self._prefix_tallies.copy())
+            self._prefix += 1
+        if len(self.results) == len(self.ranges):
+            self._complete.set()
+
+    def _drop(self, worker):
+        # Its unfinished ranges go back to the front of the queue
+        if worker not in self.workers:
+            return
+        self.workers.discard(worker)
+        lost = sorted(t for t in worker.tasks if t not in self.results)
+        self.reissued += len(lost)
+        self.todo.extendleft(reversed(lost))
+        worker.tasks.clear()
+        worker.writer.close()
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(1.0)
+            now = time.monotonic()
+            dead = [w for w in self.workers if now - w.seen > DEAD_AFTER]
+            for worker in dead:
+                self._drop(worker)
+            if dead:
+                await self._feed_all()
+
+    async def _handle(self, reader, writer):
+        worker = None
+        self._handlers.add(asyncio.current_task())
+        try:
+            hello = await _receive(reader)
+            if hello is None:
+                return
+            if hello.get("type") != "hello" or hello.get("protocol") != PROTOCOL:
+                raise ProtocolError(f"expected hello for protocol {PROTOCOL}")
+            if self.token is not None and hello.get("token") != self.token:
+                raise ProtocolError("wrong token")
+            slots = hello.get("slots", SLOTS)
+            if not isinstance(slots, int) or slots < 1:
+                raise ProtocolError("slots must be a whole number >= 1")
+            worker = _Worker(str(hello.get("name", "?")), slots, writer)
+            self.workers.add(worker)
+            self.seen_workers += 1
+            await self._feed(worker)
+            while not self._complete.is_set():
+                message = await _receive(reader)
+                if message is None:
+                    break
+                worker.seen = time.monotonic()
+                if message["type"] == "result":
+                    self._merge(worker, message)
+                    await self._feed(worker)
+                elif message["type"] == "error":
+                    break       # the worker is quitting; its ranges go to the others
+                elif message["type"] != "alive":
+                    raise ProtocolError(f"unexpected {message['type']!r} message")
+        except ProtocolError as exc:
+            try:
+                await _send(writer, {"type": "error", "error": str(exc)})
+            except ConnectionError:
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._handlers.discard(asyncio.current_task())
+            if worker is None:
+                writer.close()
+            elif not self._complete.is_set():
+                self._drop(worker)
+                await self._feed_all()
+            # else wait() still has to tell it we are done
+
+
+# ----------------------------------------------------------------------
+# Worker
+# ----------------------------------------------------------------------
+async def _play_range(loop, pool, task):
+    # Sums the chunks first, first + 1, ... covering [start, stop)
+    run = task["run"]
+    check_doors(run["doors"], run["reveals"])
+    fn, extra = _chunk_player(run["switch"], run["doors"], run["reveals"])
+    chunk, start, stop = run["chunk"], task["start"], task["stop"]
+    futures = [
+        loop.run_in_executor(pool, fn, run["seed"], task["first"] + k,
+                             min(chunk, stop - at), *extra)
+        for k, at in enumerate(range(start, stop, chunk))
+    ]
+    trials, tallies = 0, 0
+    for size, result in await asyncio.gather(*futures):
+        trials += size
+        tallies = tallies + np.atleast_1d(result)
+    return trials, [int(t) for t in tallies]
+
+
+async def _connect(host, port, wait):
+    # Keeps trying for `wait` seconds, so workers may start before the coordinator
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            return await asyncio.open_connection(host, port, limit=MAX_LINE)
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def work(host="127.0.0.1", port=DEFAULT_PORT, processes=None, name=None, token=None,
+               wait=10.0, slots=SLOTS):
+    # Plays tasks until the coordinator says done; returns how many it played
+    processes = processes or os.cpu_count() or 1
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    reader, writer = await _connect(host, port, wait)
+    loop = asyncio.get_running_loop()
+    # "spawn" as in parallel.py; the pool is shared by the tasks in flight
+    pool = ProcessPoolExecutor(max_workers=processes,
+                               mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_ignore_sigint)
+    lock = asyncio.Lock()       # one writer per line
+
+    async def send(message):
+        async with lock:
+            await _send(writer, message)
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(HEARTBEAT_EVERY)
+            await send({"type": "alive"})
+
+    async def play(task):
+        trials, tallies = await _play_range(loop, pool, task)
+        await send({"type": "result", "task": task["task"], "trials": trials,
+                    "tallies": tallies})
+
+    played = 0
+    running = set()
+    # Set by the first task that fails; the receive loop waits on it too, so
+    # a failure takes the worker down at once and the coordinator reissues
+    # whatever it had
+    failed = loop.create_future()
+
+    def finished(task):
+        running.discard(task)
+        if not task.cancelled() and task.exception() is not None and not failed.done():
+            failed.set_exception(task.exception())
+
+    receive = None
+    beats = asyncio.create_task(heartbeat())
+    try:
+        await send({"type": "hello", "protocol": PROTOCOL, "name": name, "slots": slots,
+                    "token": token})
+        while True:
+            receive = asyncio.ensure_future(_receive(reader))
+            await asyncio.wait({receive, failed}, return_when=asyncio.FIRST_COMPLETED)
+            if failed.done():
+                exc = failed.exception()
+                try:
+                    await send({"type": "error", "error": f"{type(exc).__name__}: {exc}"})
+                except ConnectionError:
+                    pass
+                raise exc
+            message = receive.result()
+            if message is None:
+                raise ConnectionError("coordinator went away")
+            if message["type"] == "done":
+                return played
+            if message["type"] == "error":
+                raise ProtocolError(message.get("error", "rejected by the coordinator"))
+            if message["type"] == "task":
+                task = asyncio.create_task(play(message))
+                running.add(task)
+                task.add_done_callback(finished)
+                played += 1
+    finally:
+        beats.cancel()
+        if receive is not None:
+            receive.cancel()
+        for task in running:
+            task.cancel()
+        writer.close()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def spawn_local_workers(port, count, processes=1, token=None):
+    # `count` worker processes on this machine, for trying a cluster out
+    command = [sys.executable, "-m", "montyhall", "worker", "--connect",
+               f"127.0.0.1:{port}", "--processes", str(processes)]
+    if token is not None:
+        command += ["--token", token]
+    return [subprocess.Popen(command) for _ in range(count)]
+
+
+async def coordinate(n, mode="yes", seed=0, doors=3, reveals=1, host="127.0.0.1",
+                     port=DEFAULT_PORT, chunk=CHUNK, task_chunks=TASK_CHUNKS, token=None,
+                     local=0, processes=1, on_series=None, ready=None):
+    # Runs one job to the end and returns Coordinator.result(). `local`
+    # worker processes are started on this machine; ready(coordinator, port)
+    # is called once listening.
+    coordinator = Coordinator(n, mode, seed, doors, reveals, chunk, task_chunks, token,
+                              on_series)
+    port = await coordinator.start(host, port)
+    if ready is not None:
+        ready(coordinator, port)
+    children = spawn_local_workers(port, local, processes, token) if local else []
+    try:
+        return await coordinator.wait()
+    finally:
+        await coordinator.stop()
+        for child in children:
+            try:
+                child.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                child.kill()
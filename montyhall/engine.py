@@ -0,0 +1,237 @@
+# Simulation core. Nothing in here imports tkinter, so it can be used from
+# the command line, scripts and batch nodes as well as from the GUI.
+import random
+from fractions import Fraction
+
+import numpy as np
+
+from .rng import chunk_rng
+from .stats import Z_95, trials_for_precision, wilson_interval
+
+
+# ----------------------------------------------------------------------
+# Single interactive play
+# ----------------------------------------------------------------------
+def PlayMonteHall(door, switch):
+    winning_door = random.randint(0, 2)
+    all_indices = {0, 1, 2}
+
+    remaining = list(all_indices - {door, winning_door})
+    shown_index = random.choice(remaining)
+
+    switch_candidates = list(all_indices - {shown_index})
+    final_door = next(i for i in switch_candidates if i != door)
+    if not switch:
+        final_door = door
+
+    won = final_door == winning_door
+    return won, shown_index, winning_door
+
+
+# ----------------------------------------------------------------------
+# Batch trials (vectorized)
+# ----------------------------------------------------------------------
+# Trials are dealt a chunk at a time as uint8 arrays so memory stays bounded
+# no matter how large N gets.
+CHUNK = 1 << 20
+
+
+def deal_batch(n, rng):
+    # Same game as PlayMonteHall, for n trials at once: a random first pick,
+    # the winning door, and the goat door Monty opens.
+    first_pick   = rng.integers(0, 3, size=n, dtype=np.uint8)
+    winning_door = rng.integers(0, 3, size=n, dtype=np.uint8)
+
+    # If the pick is the car Monty opens either of the two other doors,
+    # otherwise the one door that is neither the pick nor the car.
+    offset = rng.integers(1, 3, size=n, dtype=np.uint8)
+    shown_index = np.where(
+        first_pick == winning_door,
+        (first_pick + offset) % 3,
+        3 - first_pick - winning_door,
+    ).astype(np.uint8)
+    return first_pick, shown_index, winning_door
+
+
+def simulate_batch(n, switch, rng, doors=3, reveals=1, chunk=CHUNK):
+    # Number of wins in n trials of the D-door game where Monty opens `reveals`
+    # goat doors and a switcher moves to one of the other closed doors at random.
+    #
+    # Nothing per door is ever built: Monty only opens goats, so the car is
+    # behind the first pick or, failing that, behind one of the
+    # doors - 1 - reveals other closed doors with equal chance. Each trial is
+    # therefore two door draws plus, for a switcher with more than one door to
+    # move to, one draw for where they land. With 3 doors and 1 reveal that
+    # last draw disappears (switching wins exactly when the first pick is a goat).
+    check_doors(doors, reveals)
+    wins = 0
+    left = n
+    while left > 0:
+        size = min(left, chunk)
+        wins += int(np.count_nonzero(win_marks(size, switch, rng, doors, reveals)))
+        left -= size
+    return wins
+
+
+def win_marks(size, switch, rng, doors=3, reveals=1):
+    # Which of `size` trials win, as a bool array; simulate_batch counts these,
+    # so the draws are the same and a cumsum gives its running totals
+    dtype = door_dtype(doors)
+    closed = doors - 1 - reveals
+    first_pick   = rng.integers(0, doors, size=size, dtype=dtype)
+    winning_door = rng.integers(0, doors, size=size, dtype=dtype)
+    if not switch:
+        return first_pick == winning_door
+    if closed == 1:
+        return first_pick != winning_door
+    lands_on_car = rng.integers(0, closed, size=size, dtype=door_dtype(closed)) == 0
+    return (first_pick != winning_door) & lands_on_car
+
+
+# ----------------------------------------------------------------------
+# Strategies compared on shared deals
+# ----------------------------------------------------------------------
+# Every strategy is judged on the same (first pick, car, landing door) draws,
+# so one pass tallies all of them and their difference is paired: staying and
+# switching can never both win a trial. The draws are taken in the same order
+# as simulate_batch, so with the same rng the stay and switch tallies match
+# what two separate runs would give; the random switcher's coin is drawn last.
+COMPARE_FIELDS = ("stay", "switch", "random", "switch_only", "stay_only")
+
+
+def compare_batch(n, rng, doors=3, reveals=1, chunk=CHUNK):
+    # Returns wins per strategy as an int64 array ordered like COMPARE_FIELDS;
+    # switch_only / stay_only count the trials only that strategy won.
+    check_doors(doors, reveals)
+    dtype = door_dtype(doors)
+    closed = doors - 1 - reveals
+    tallies = np.zeros(len(COMPARE_FIELDS), dtype=np.int64)
+    left = n
+    while left > 0:
+        size = min(left, chunk)
+        first_pick   = rng.integers(0, doors, size=size, dtype=dtype)
+        winning_door = rng.integers(0, doors, size=size, dtype=dtype)
+        stay_win = first_pick == winning_door
+        switch_win = ~stay_win
+        if closed > 1:
+            switch_win &= rng.integers(0, closed, size=size, dtype=door_dtype(closed)) == 0
+        coin = rng.integers(0, 2, size=size, dtype=np.uint8).view(bool)
+        tallies += (
+            np.count_nonzero(stay_win),
+            np.count_nonzero(switch_win),
+            np.count_nonzero(np.where(coin, switch_win, stay_win)),
+            np.count_nonzero(switch_win & ~stay_win),
+            np.count_nonzero(stay_win & ~switch_win),
+        )
+        left -= size
+    return tallies
+
+
+# ----------------------------------------------------------------------
+# D doors, k reveals
+# ----------------------------------------------------------------------
+def check_doors(doors, reveals):
+    if doors < 3:
+        raise ValueError(f"need at least 3 doors, got {doors}")
+    if not 0 <= reveals <= doors - 2:
+        raise ValueError(
+            f"Monty can open between 0 and {doors - 2} of {doors} doors, got {reveals}"
+        )
+
+
+def door_dtype(doors):
+    # Smallest unsigned type that holds every door index
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if doors - 1 <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+def exact_win_probability(doors=3, reveals=1, switch=True):
+    # Closed form for the same game simulate_batch plays: staying wins 1/D of
+    # the time; switching wins when the first pick was a goat, (D-1)/D, and the
+    # switcher then lands on the car among the D-1-k remaining closed doors.
+    check_doors(doors, reveals)
+    if not switch:
+        return Fraction(1, doors)
+    return Fraction(doors - 1, doors) / (doors - 1 - reveals)
+
+
+# ----------------------------------------------------------------------
+# Seeded, chunked runs
+# ----------------------------------------------------------------------
+# A run is cut into fixed-size chunks and chunk i always draws from its own
+# counter-addressed stream, chunk_rng(seed, i) (see rng.py), so a seeded run
+# gives bit-identical results whichever process ends up playing which chunk.
+def chunk_sizes(n, chunk=CHUNK):
+    full, rest = divmod(n, chunk)
+    return [chunk] * full + ([rest] if rest else [])
+
+
+def play_chunk(seed, index, size, switch, doors=3, reveals=1):
+    return size, simulate_batch(size, switch, chunk_rng(seed, index), doors, reveals)
+
+
+def compare_chunk(seed, index, size, doors=3, reveals=1):
+    return size, compare_batch(size, chunk_rng(seed, index), doors, reveals)
+
+
+def sequential_compare(n, seed, doors=3, reveals=1, chunk=CHUNK):
+    # Yields (trials_done, tallies) after every chunk, tallies as in compare_batch
+    check_doors(doors, reveals)
+    done = 0
+    tallies = np.zeros(len(COMPARE_FIELDS), dtype=np.int64)
+    for i, size in enumerate(chunk_sizes(n, chunk)):
+        size, chunk_tallies = compare_chunk(seed, i, size, doors, reveals)
+        done += size
+        tallies += chunk_tallies
+        yield done, tallies.copy()
+
+
+def sequential_simulate(n, switch, seed, doors=3, reveals=1, chunk=CHUNK):
+    # Single-process counterpart of parallel_simulate(): same chunks, same
+    # streams, same (trials_done, wins) totals.
+    check_doors(doors, reveals)
+    done = wins = 0
+    for i, size in enumerate(chunk_sizes(n, chunk)):
+        size, chunk_wins = play_chunk(seed, i, size, switch, doors, reveals)
+        done += size
+        wins += chunk_wins
+        yield done, wins
+
+
+# ----------------------------------------------------------------------
+# Run until precision
+# ----------------------------------------------------------------------
+# Stop as soon as the Wilson interval half-width drops to epsilon, or max_n
+# trials have been played. Step i draws from chunk_rng(seed, i) like every
+# other seeded run, and the step sizes only depend on the results so far, so
+# a seeded run always stops at the same point.
+FIRST_STEP = 4096
+
+
+def simulate_until(epsilon, switch, seed, max_n, doors=3, reveals=1, z=Z_95,
+                   chunk=CHUNK):
+    # Yields (trials_done, wins, (low, high)) after every step; the last one
+    # is the answer.
+    check_doors(doors, reveals)
+    done = wins = 0
+    index = 0
+    while done < max_n:
+        if done == 0:
+            size = FIRST_STEP
+        else:
+            # Aim straight for the predicted number of trials
+            needed = trials_for_precision(wins / done, epsilon, z) - done
+            size = min(max(needed, FIRST_STEP), chunk)
+        size = min(size, max_n - done)
+
+        _, chunk_wins = play_chunk(seed, index, size, switch, doors, reveals)
+        index += 1
+        done += size
+        wins += chunk_wins
+
+        low, high = wilson_interval(wins, done, z)
+        yield done, wins, (low, high)
+        if (high - low) / 2 <= epsilon:
+            return
@@ -0,0 +1,130 @@
+# Ensembles: R independent replicates of the same run, to show how far a
+# cumulative win rate normally wanders from the exact one after N trials.
+#
+# Replicates are played in groups of REPLICATE_CHUNK, each group as a stack of
+# (group, TRIAL_BLOCK) arrays of game results, so one block is about a trial
+# chunk's worth of work. Only the cumulative wins at
+# log-spaced checkpoints are kept: within a block the results are summed
+# between checkpoints (np.add.reduceat) and a cumsum of those sums, on top of
+# the running totals, gives every replicate's wins at every checkpoint the
+# block reaches. Memory is O(R x checkpoints) plus one block, however large N.
+#
+# Group i plays from chunk_rng((seed, 2, 0), i), so groups can go to a pool
+# and the paths do not depend on how they were scheduled. (seed, 1, ...) is
+# the tournament's; 3-tuples never meet the estimators' keys.
+import math
+
+import numpy as np
+
+from .engine import CHUNK, check_doors, chunk_sizes, door_dtype, exact_win_probability
+from .rng import chunk_rng
+from .stats import Z_95
+
+
+REPLICATE_CHUNK = 256       # replicates per group
+TRIAL_BLOCK = CHUNK // REPLICATE_CHUNK  # trials each replicate plays per block
+ENSEMBLE_POINTS = 200       # log-spaced checkpoints asked for; fewer survive rounding
+BAND = (2.5, 97.5)          # percentiles shaded around the median, matching Z_95
+
+_ENSEMBLE = 2
+
+
+def log_checkpoints(n, points=ENSEMBLE_POINTS):
+    # Distinct trial counts from 1 to n, evenly spaced on a log scale
+    if n < 1:
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(np.geomspace(1, n, points).round().astype(np.int64))
+
+
+def _results(shape, switch, rng, doors, reveals):
+    # Wins of shape[0] x shape[1] games as a bool array. As in simulate_batch:
+    # staying wins when the pick hides the car, and a switcher wins when it
+    # doesn't and the door moved to is the car.
+    stay = rng.integers(0, doors, size=shape, dtype=door_dtype(doors)) == 0
+    if not switch:
+        return stay
+    closed = doors - 1 - reveals
+    if closed == 1:
+        return ~stay
+    return ~stay & (rng.integers(0, closed, size=shape, dtype=door_dtype(closed)) == 0)
+
+
+def _group_paths(seed, index, replicates, switch, doors, reveals, checkpoints):
+    # Yields (trials_done, reached, wins) after every block; wins[r, j] is
+    # replicate r's wins over its first checkpoints[j] trials, filled for
+    # j < reached
+    rng = chunk_rng((seed, _ENSEMBLE, 0), index)
+    n = int(checkpoints[-1])
+    wins = np.zeros((replicates, len(checkpoints)), dtype=np.int64)
+    running = np.zeros((replicates, 1), dtype=np.int64)
+    done = reached = 0
+    while done < n:
+        size = min(TRIAL_BLOCK, n - done)
+        won = _results((replicates, size), switch, rng, doors, reveals).view(np.uint8)
+        # Checkpoints this block reaches, as ends within the block
+        upto = np.searchsorted(checkpoints, done + size, side="right")
+        ends = checkpoints[reached:upto] - done
+        starts = np.concatenate(([0], ends[ends < size]))
+        # int32 is plenty within a block and several times faster to reduce into
+        sums = np.add.reduceat(won, starts, axis=1, dtype=np.int32)
+        totals = running + np.cumsum(sums, axis=1, dtype=np.int64)
+        wins[:, reached:upto] = totals[:, :len(ends)]
+        running = totals[:, -1:]
+        done += size
+        reached = upto
+        yield done, reached, wins
+
+
+def ensemble_chunk(seed, index, replicates, n, switch, doors=3, reveals=1,
+                   points=ENSEMBLE_POINTS):
+    # (replicates, wins) of one group over every checkpoint of log_checkpoints(n)
+    for _, _, wins in _group_paths(seed, index, replicates, switch, doors, reveals,
+                                   log_checkpoints(n, points)):
+        pass
+    return replicates, wins
+
+
+def sequential_ensemble(replicates, n, switch, seed, doors=3, reveals=1,
+                        points=ENSEMBLE_POINTS, chunk=REPLICATE_CHUNK):
+    # Yields (replicates_done, trials_done, checkpoints, wins) after every
+    # block, every group stepped in lockstep; wins[r, j] is replicate r's wins
+    # over its first checkpoints[j] trials, for the checkpoints reached so far
+    check_doors(doors, reveals)
+    checkpoints = log_checkpoints(n, points)
+    groups = [
+        _group_paths(seed, i, size, switch, doors, reveals, checkpoints)
+        for i, size in enumerate(chunk_sizes(replicates, chunk))
+    ]
+    done = 0
+    while done < n:
+        paths = []
+        for steps in groups:
+            done, reached, wins = next(steps)
+            paths.append(wins[:, :reached])
+        yield replicates, done, checkpoints[:reached], np.vstack(paths)
+
+
+def ensemble_bands(checkpoints, wins, band=BAND):
+    # (median, low, high) win rate at each checkpoint across the replicates
+    rates = wins / checkpoints
+    low, median, high = np.percentile(rates, [band[0], 50, band[1]], axis=0)
+    return median, low, high
+
+
+def envelope(checkpoints, doors=3, reveals=1, switch=True, z=Z_95):
+    # p +/- z * sqrt(p(1 - p) / N) around the exact win rate p: where a
+    # share erf(z / sqrt 2) of correct replicates should be after N trials,
+    # clipped to [0, 1]
+    p = float(exact_win_probability(doors, reveals, switch))
+    half = z * np.sqrt(p * (1 - p) / np.asarray(checkpoints, dtype=np.float64))
+    return np.maximum(p - half, 0.0), np.minimum(p + half, 1.0)
+
+
+def coverage(checkpoints, wins, doors=3, reveals=1, switch=True, z=Z_95):
+    # Share of replicates inside the envelope at the last checkpoint; about
+    # erf(z / sqrt 2) (0.95) when the engine is right
+    if not len(wins):
+        return math.nan
+    low, high = envelope(checkpoints[-1:], doors, reveals, switch, z)
+    rate = wins[:, -1] / checkpoints[-1]
+    return float(np.count_nonzero((rate >= low) & (rate <= high)) / len(rate))
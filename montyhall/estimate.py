@@ -0,0 +1,154 @@
+# Win-rate estimators that need fewer trials than plain sampling for the
+# same precision.
+#
+#   plain       i.i.d. trials, the same wins as simulate() with the same seed
+#   stratified  the share of trials whose first pick hides the car is fixed
+#               at 1/D instead of drawn. Every (pick, car) combination where
+#               the pick hides the car plays the same way, and so does every
+#               other one, so spreading trials evenly over the D*D
+#               combinations comes down to this. Only the switcher's landing
+#               door (with more than one door to move to) is left random; in
+#               the classic game nothing is, and the estimate is exact.
+#   antithetic  trials come in pairs with mirrored draws: the car sits
+#               `offset` doors from the pick in one and D-1-offset in the
+#               other, the switcher lands on door `l` and closed-1-l. The two
+#               can't both find the car behind the pick, so their errors
+#               partly cancel.
+#
+# Each chunk returns additive statistics (int64 arrays), so chunks can be
+# played on a pool and summed in any order; estimate() turns the totals into
+# (win_rate, standard_error). Both are unbiased. An antithetic chunk of odd
+# size leaves its last trial out, and the trials it reports are 2 * pairs. Plain uses chunk_rng(seed, i)
+# like every other run; the other two use their own streams of the same seed.
+import math
+
+import numpy as np
+
+from .engine import CHUNK, check_doors, chunk_sizes, door_dtype, simulate_batch
+from .rng import chunk_rng
+
+
+ESTIMATORS = ("plain", "stratified", "antithetic")
+
+# Length of each estimator's statistics array
+STAT_SIZES = {
+    "plain": 2,         # trials, wins
+    "stratified": 5,    # trials, hit trials, hit wins, miss trials, miss wins
+    "antithetic": 4,    # trials, pairs with 0, 1 and 2 wins
+}
+
+
+def _stratified_batch(n, switch, rng, doors, reveals):
+    # Trial j hides the car behind the pick when (j + offset) % doors == 0,
+    # with a random offset so every trial is equally likely to be that one
+    offset = int(rng.integers(0, doors))
+    first = -offset % doors
+    hits = 0 if first >= n else (n - 1 - first) // doors + 1
+    misses = n - hits
+    closed = doors - 1 - reveals
+    if not switch:
+        hit_wins, miss_wins = hits, 0
+    elif closed == 1:
+        hit_wins, miss_wins = 0, misses
+    else:
+        lands = rng.integers(0, closed, size=misses, dtype=door_dtype(closed))
+        hit_wins, miss_wins = 0, int(np.count_nonzero(lands == 0))
+    return np.array([n, hits, hit_wins, misses, miss_wins], dtype=np.int64)
+
+
+def _antithetic_batch(n, switch, rng, doors, reveals):
+    # n // 2 mirrored pairs; an odd trial out is not played
+    pairs = n // 2
+    offset = rng.integers(0, doors, size=pairs, dtype=door_dtype(doors))
+    closed = doors - 1 - reveals
+    if not switch:
+        win_a, win_b = offset == 0, offset == doors - 1
+    else:
+        win_a, win_b = offset != 0, offset != doors - 1
+        if closed > 1:
+            lands = rng.integers(0, closed, size=pairs, dtype=door_dtype(closed))
+            win_a &= lands == 0
+            win_b &= lands == closed - 1
+    counts = np.bincount(win_a.view(np.uint8) + win_b.view(np.uint8), minlength=3)
+    return np.concatenate(([2 * pairs], counts)).astype(np.int64)
+
+
+def estimate_batch(n, switch, rng, estimator="plain", doors=3, reveals=1):
+    check_doors(doors, reveals)
+    if estimator == "plain":
+        return np.array([n, simulate_batch(n, switch, rng, doors, reveals)], dtype=np.int64)
+    if estimator == "stratified":
+        return _stratified_batch(n, switch, rng, doors, reveals)
+    if estimator == "antithetic":
+        return _antithetic_batch(n, switch, rng, doors, reveals)
+    raise ValueError(f"unknown estimator {estimator!r}; use one of {', '.join(ESTIMATORS)}")
+
+
+def estimate_chunk(seed, index, size, switch, estimator="plain", doors=3, reveals=1):
+    # (trials played, stats); the trials are stats[0], which is one short of
+    # size for an odd antithetic chunk
+    key = seed if estimator == "plain" else (seed, ESTIMATORS.index(estimator))
+    stats = estimate_batch(size, switch, chunk_rng(key, index), estimator, doors, reveals)
+    return int(stats[0]), stats
+
+
+def estimate(stats, estimator="plain", doors=3):
+    # (win_rate, standard_error) from summed statistics; (nan, nan) before
+    # anything was played, and an antithetic SE is nan until two pairs were
+    stats = [int(s) for s in stats]
+    if estimator == "plain":
+        n, wins = stats
+        if not n:
+            return math.nan, math.nan
+        p = wins / n
+        return p, math.sqrt(p * (1 - p) / n)
+    if estimator == "stratified":
+        n, hits, hit_wins, misses, miss_wins = stats
+        if not hits or not misses:
+            # Fewer trials than doors: only one stratum was sampled
+            return estimate([n, hit_wins + miss_wins], "plain")
+        w = 1 / doors
+        p_hit, p_miss = hit_wins / hits, miss_wins / misses
+        var = (w * w * p_hit * (1 - p_hit) / hits
+               + (1 - w) ** 2 * p_miss * (1 - p_miss) / misses)
+        return w * p_hit + (1 - w) * p_miss, math.sqrt(var)
+    if estimator == "antithetic":
+        _, none, one, both = stats
+        pairs = none + one + both
+        if not pairs:
+            return math.nan, math.nan
+        mean = (one / 2 + both) / pairs
+        if pairs < 2:
+            return mean, math.nan
+        var = max((one / 4 + both) / pairs - mean * mean, 0.0)
+        return mean, math.sqrt(var / pairs)
+    raise ValueError(f"unknown estimator {estimator!r}; use one of {', '.join(ESTIMATORS)}")
+
+
+def exact_estimate(stats, estimator, switch, doors=3, reveals=1):
+    # True when the estimate has no sampling error at all: stratified, both
+    # strata sampled, and nothing random left in either (staying, or a
+    # switcher with only one door to move to). A zero SE alone is not enough;
+    # a plain run of one trial has one too.
+    if estimator != "stratified":
+        return False
+    _, hits, _, misses, _ = (int(s) for s in stats)
+    return bool(hits and misses) and (not switch or doors - 1 - reveals == 1)
+
+
+def sequential_estimate(n, switch, seed, estimator="plain", doors=3, reveals=1, chunk=CHUNK):
+    # Yields (trials_done, stats) after every chunk
+    check_doors(doors, reveals)
+    done = 0
+    stats = np.zeros(STAT_SIZES[estimator], dtype=np.int64)
+    for i, size in enumerate(chunk_sizes(n, chunk)):
+        size, chunk_stats = estimate_chunk(seed, i, size, switch, estimator, doors, reveals)
+        done += size
+        stats += chunk_stats
+        yield done, stats.copy()
+
+
+def plain_standard_error(p, n):
+    # Standard error plain sampling would have after n trials at true rate p;
+    # (this / an estimator's SE)^2 is how many times fewer trials it needs
+    return math.sqrt(p * (1 - p) / n) if n else math.nan
@@ -0,0 +1,156 @@
+# Exact win probabilities by walking the whole game tree, for hosts that do
+# not behave like the textbook Monty.
+#
+#   standard  Monty knows where the car is and opens goat doors at random
+#   biased    as standard, but when he has a choice he opens the lowest
+#             numbered goat door with probability `bias` (the rest share
+#             what is left evenly)
+#   fall      Monty opens doors at random and may show the car ("Monty
+#             Fall"); a game that shows the car is lost whatever you do
+#   ignorant  same host, but games that show the car are played again, so
+#             the odds are those given that only goats were shown
+#
+# Door 0 is taken as the first pick: the pick is uniform and every host above
+# treats the other doors the same way whichever door was picked, so this loses
+# nothing. Monty opens his doors one at a time and each branch is weighted
+# with a Fraction, so the answers are exact.
+#
+# Only the biased host cares which door is which. For the others all unpicked
+# doors look alike, so the tree collapses to "is the car still hidden" after
+# each reveal and costs O(reveals) for any number of doors. The biased tree is
+# walked over sets of open doors, one reveal at a time; the distribution after
+# each reveal is cached per (doors, bias, car, reveals) and whole tables per
+# (doors, reveals, host, bias), so a repeated query is a dict lookup.
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+
+from .engine import check_doors
+
+
+HOSTS = ("standard", "biased", "fall", "ignorant")
+
+# Leaves (car position x final set of open doors) one biased table may have
+MAX_OUTCOMES = 250_000
+
+
+def check_host(host, bias=None):
+    if host not in HOSTS:
+        raise ValueError(f"unknown host {host!r}; use one of {', '.join(HOSTS)}")
+    if host == "biased":
+        if bias is None or not 0 <= bias <= 1:
+            raise ValueError("a biased host needs a bias between 0 and 1")
+    return Fraction(bias) if host == "biased" else None
+
+
+def _still_hidden(doors, host, k):
+    # Chance the car is still closed after k reveals when it is not behind
+    # the pick: on reveal j a random host opens one of the doors - 1 - j
+    # unpicked closed doors, one of which is the car
+    hidden = Fraction(1)
+    if host != "standard":
+        for j in range(k):
+            closed = doors - 1 - j
+            hidden *= Fraction(closed - 1, closed)
+    return hidden
+
+
+def _choices(doors, bias, car, opened):
+    # (door, probability) for the biased host's next reveal, lowest goat first
+    goats = [d for d in range(1, doors) if d not in opened and d != car]
+    if len(goats) == 1:
+        return [(goats[0], Fraction(1))]
+    rest = (1 - bias) / (len(goats) - 1)
+    return [(goats[0], bias)] + [(d, rest) for d in goats[1:]]
+
+
+@lru_cache(maxsize=None)
+def _reveals(doors, bias, car, k):
+    # {set of open doors: probability} after the biased host's first k
+    # reveals, built from the k - 1 table
+    if not k:
+        return {frozenset(): Fraction(1)}
+    out = {}
+    for opened, p in _reveals(doors, bias, car, k - 1).items():
+        for door, q in _choices(doors, bias, car, opened):
+            after = opened | {door}
+            out[after] = out.get(after, 0) + p * q
+    return out
+
+
+@lru_cache(maxsize=None)
+def _leaves(doors, reveals, bias):
+    # Every (car, opened, probability) a biased game can end in before the choice
+    if comb(doors - 1, reveals) * doors > MAX_OUTCOMES:
+        raise ValueError(f"{doors} doors with {reveals} reveals has too many outcomes to "
+                         "enumerate; simulate it instead")
+    car_p = Fraction(1, doors)
+    return tuple(
+        (car, opened, car_p * p)
+        for car in range(doors)
+        for opened, p in _reveals(doors, bias, car, reveals).items()
+    )
+
+
+def _score(leaves, doors, reveals):
+    # (stay wins, switch wins, car shown) summed over the leaves. A switcher
+    # moves to one of the doors - 1 - reveals other closed doors at random.
+    stay = switch = shown = Fraction(0)
+    closed = doors - 1 - reveals
+    for car, opened, p in leaves:
+        if car in opened:
+            shown += p
+        elif car == 0:
+            stay += p
+        else:
+            switch += p / closed
+    return stay, switch, shown
+
+
+@lru_cache(maxsize=None)
+def _outcomes(doors, reveals, host, bias):
+    check_doors(doors, reveals)
+    if host == "biased":
+        return _score(_leaves(doors, reveals, bias), doors, reveals)
+    other = Fraction(doors - 1, doors)      # car not behind the pick
+    hidden = _still_hidden(doors, host, reveals)
+    return (Fraction(1, doors), other * hidden / (doors - 1 - reveals),
+            other * (1 - hidden))
+
+
+def exact_outcomes(doors=3, reveals=1, host="standard", bias=None):
+    # {"stay", "switch", "random", "car_shown"} as Fractions. For the
+    # ignorant host the first three are given that only goats were shown and
+    # car_shown is how often a game has to be replayed.
+    bias = check_host(host, bias)
+    stay, switch, shown = _outcomes(doors, reveals, host, bias)
+    if host == "ignorant":
+        stay, switch = stay / (1 - shown), switch / (1 - shown)
+    return {"stay": stay, "switch": switch, "random": (stay + switch) / 2,
+            "car_shown": shown}
+
+
+def exact_given(opened, doors=3, reveals=1, host="standard", bias=None):
+    # Odds after you picked door 0 and saw Monty open the goat doors in
+    # `opened`, e.g. exact_given({2}, host="biased", bias=1) for the host who
+    # would have opened door 1 if he could. Returns None when that can't happen.
+    bias = check_host(host, bias)
+    check_doors(doors, reveals)
+    opened = frozenset(opened)
+    if len(opened) != reveals or not opened <= set(range(1, doors)):
+        raise ValueError(f"Monty opens {reveals} door(s), none of them the first pick")
+    if host != "biased":
+        # Every set of goat doors is as likely as any other
+        stay, switch, shown = _outcomes(doors, reveals, host, bias)
+        total = (1 - shown) / comb(doors - 1, reveals)
+        stay, switch = stay / (1 - shown), switch / (1 - shown)
+    else:
+        seen = [leaf for leaf in _leaves(doors, reveals, bias)
+                if leaf[1] == opened and leaf[0] not in opened]
+        total = sum(p for _, _, p in seen)
+        if not total:
+            return None
+        stay, switch, _ = _score(seen, doors, reveals)
+        stay, switch = stay / total, switch / total
+    return {"stay": stay, "switch": switch, "random": (stay + switch) / 2,
+            "probability": total}
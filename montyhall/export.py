@@ -0,0 +1,191 @@
+# Writing results out and loading them back for analysis.
+#
+# The format follows the file extension:
+#   .csv              small tables, written a row at a time
+#   .npy              fixed-length arrays, written through a memory map
+#   .arrow / .parquet columnar files through pyarrow (optional dependency),
+#                     written a record batch at a time
+# Every writer streams, so a series or trace is exported while the run is
+# still going and never has to be held in memory as a whole.
+import csv
+import os
+
+import numpy as np
+
+from .trace import FIELDS, TraceStore, unpack
+
+
+CSV, NPY, ARROW, PARQUET = ".csv", ".npy", ".arrow", ".parquet"
+FORMATS = (CSV, NPY, ARROW, PARQUET)
+
+# Columns of a cumulative win-rate series
+SERIES_COLUMNS = [("trials", np.int64), ("wins", np.int64), ("win_rate", np.float64)]
+
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".feather":
+        ext = ARROW
+    if ext not in FORMATS:
+        raise ValueError(f"unknown export format {ext!r}; use one of {', '.join(FORMATS)}")
+    return ext
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Arrow and Parquet export need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+class _ArrowSink:
+    # Record batches into an Arrow IPC file or a Parquet file
+    def __init__(self, path, columns):
+        pa = self._pa = _pyarrow()
+        self._schema = pa.schema([(name, pa.from_numpy_dtype(np.dtype(dtype)))
+                                  for name, dtype in columns])
+        if file_format(path) == PARQUET:
+            self._writer = pa.parquet.ParquetWriter(path, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self._schema)
+
+    def write(self, arrays):
+        self._writer.write_table(self._pa.Table.from_arrays(
+            [self._pa.array(a) for a in arrays], schema=self._schema,
+        ))
+
+    def close(self):
+        self._writer.close()
+
+
+class TableWriter:
+    # Rows of fixed columns, streamed to any of the formats. A .npy file is a
+    # structured array and needs the number of rows up front.
+    def __init__(self, path, columns, length=None):
+        self.path = path
+        self.columns = columns
+        self.rows = 0
+        self._format = file_format(path)
+        if self._format == CSV:
+            self._file = open(path, "w", newline="")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow([name for name, _ in columns])
+        elif self._format == NPY:
+            if length is None:
+                raise ValueError(".npy export needs the number of rows in advance")
+            self._array = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.dtype(columns), shape=(length,)
+            )
+        else:
+            self._sink = _ArrowSink(path, columns)
+
+    def append(self, *values):
+        self.extend(*([v] for v in values))
+
+    def extend(self, *arrays):
+        # One array per column, all the same length
+        n = len(arrays[0])
+        if self._format == CSV:
+            self._csv.writerows(zip(*arrays))
+        elif self._format == NPY:
+            end = self.rows + n
+            for (name, _), a in zip(self.columns, arrays):
+                self._array[name][self.rows:end] = a
+        else:
+            self._sink.write(arrays)
+        self.rows += n
+
+    def close(self):
+        if self._format == CSV:
+            self._file.close()
+        elif self._format == NPY:
+            self._array.flush()
+        else:
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_table(path, rows):
+    # A list of dicts (run summaries) in one go; columns from the first row
+    names = list(rows[0])
+    if file_format(path) == CSV:
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, names)
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+    values = [np.asarray([row[name] for row in rows]) for name in names]
+    columns = [(name, v.dtype if v.dtype.kind in "biuf" else "U64")
+               for name, v in zip(names, values)]
+    with TableWriter(path, columns, len(rows)) as writer:
+        writer.extend(*values)
+
+
+class ArrowTraceWriter:
+    # Trace sink for record(): each chunk of packed traces becomes one
+    # record batch with a column per field
+    def __init__(self, path):
+        self.path = path
+        self._sink = _ArrowSink(path, [(name, np.uint8) for name in FIELDS])
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def extend(self, traces):
+        fields = unpack(traces)
+        self._sink.write([fields[name] for name in FIELDS])
+        self._len += len(traces)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._sink.close()
+
+
+def open_trace_writer(path, capacity):
+    # .npy keeps the packed bytes (TraceStore); Arrow/Parquet get one column per field
+    if file_format(path) == NPY:
+        return TraceStore(capacity, path)
+    if file_format(path) == CSV:
+        raise ValueError("traces are exported as .npy, .arrow or .parquet, not .csv")
+    return ArrowTraceWriter(path)
+
+
+def load(path):
+    # Maps a file back without reading it all: .npy as a read-only memmap,
+    # Arrow as a zero-copy table over a memory map, Parquet with
+    # memory_map=True. CSV is read into a dict of column arrays.
+    fmt = file_format(path)
+    if fmt == NPY:
+        return np.load(path, mmap_mode="r")
+    if fmt == CSV:
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            names = next(reader)
+            columns = list(zip(*reader)) or [()] * len(names)
+        return {name: _column(values) for name, values in zip(names, columns)}
+    pa = _pyarrow()
+    if fmt == PARQUET:
+        return pa.parquet.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+def _column(values):
+    if values and set(values) <= {"True", "False"}:
+        return np.asarray(values) == "True"
+    for dtype in (np.int64, np.float64):
+        try:
+            return np.asarray(values, dtype=dtype)
+        except ValueError:
+            pass
+    return np.asarray(values)
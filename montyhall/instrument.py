@@ -0,0 +1,109 @@
+# Opt-in timers and counters for finding where a run spends its time.
+#
+# Everything takes an `instruments` argument that defaults to None; with None
+# the timers are a shared nullcontext, so code that is not being measured pays
+# one function call per phase and nothing else. Phases are timed with
+# perf_counter and kept as totals, call counts and the longest single call.
+import cProfile
+import io
+import pstats
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+
+_NOT_TIMED = nullcontext()
+
+
+class Instruments:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.totals = defaultdict(float)    # seconds per phase
+        self.calls = defaultdict(int)
+        self.peaks = defaultdict(float)     # longest single call per phase
+        self.counters = defaultdict(int)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name, seconds):
+        self.totals[name] += seconds
+        self.calls[name] += 1
+        if seconds > self.peaks[name]:
+            self.peaks[name] = seconds
+
+    def count(self, name, k=1):
+        self.counters[name] += k
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def rate(self, counter):
+        # Per second of wall time since the instruments were created
+        elapsed = self.elapsed
+        return self.counters[counter] / elapsed if elapsed > 0 else 0.0
+
+    def mean(self, name):
+        # .get so asking about a phase that never ran doesn't add it
+        calls = self.calls.get(name, 0)
+        return self.totals[name] / calls if calls else 0.0
+
+    def breakdown(self):
+        # [(phase, calls, total_s, mean_s, peak_s, share_of_wall)], slowest first
+        elapsed = self.elapsed or 1.0
+        return [
+            (name, self.calls[name], total, total / self.calls[name], self.peaks[name],
+             total / elapsed)
+            for name, total in sorted(self.totals.items(), key=lambda kv: -kv[1])
+        ]
+
+    def format(self):
+        lines = [f"{'phase':<14}{'calls':>9}{'total s':>11}{'mean ms':>10}"
+                 f"{'peak ms':>10}{'wall':>8}"]
+        for name, calls, total, mean, peak, share in self.breakdown():
+            lines.append(f"{name:<14}{calls:>9,}{total:>11.3f}{mean * 1e3:>10.3f}"
+                         f"{peak * 1e3:>10.3f}{share:>8.1%}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<14}{value:>9,}  ({self.rate(name):,.0f}/s)")
+        return "\n".join(lines)
+
+
+def phase(instruments, name):
+    # `with phase(instruments, "play"):` times the block when instruments is set
+    return _NOT_TIMED if instruments is None else instruments.timer(name)
+
+
+def timed(steps, instruments, name):
+    # Re-yields an iterator, timing how long each step takes to arrive
+    if instruments is None:
+        yield from steps
+        return
+    steps = iter(steps)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(steps)
+        except StopIteration:
+            return
+        instruments.observe(name, time.perf_counter() - start)
+        yield item
+
+
+def profile_call(fn, path=None, top=20):
+    # Runs fn() under cProfile; dumps pstats to `path` if given and returns
+    # (fn's result, text of the `top` entries by cumulative time)
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(fn)
+    finally:
+        if path:
+            profiler.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+    return result, out.getvalue()
@@ -0,0 +1,160 @@
+# Multi-core runs on a process pool.
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .engine import (
+    CHUNK, COMPARE_FIELDS, check_doors, chunk_sizes, compare_chunk, play_chunk,
+    sequential_compare, sequential_simulate,
+)
+from .ensemble import (
+    ENSEMBLE_POINTS, REPLICATE_CHUNK, ensemble_chunk, log_checkpoints, sequential_ensemble,
+)
+from .estimate import STAT_SIZES, estimate_chunk, sequential_estimate
+from .tournament import (
+    AGENT_CHUNK, DEFAULT_EPSILON, STRATEGIES, check_strategies, sequential_tournament,
+    tournament_chunk,
+)
+
+
+def _pool_tasks(tasks, workers):
+    # Yields (key, fn(*args)) for every (key, fn, args) task, in completion
+    # order. Closing the generator early drops the tasks that have not started.
+    workers = workers or os.cpu_count() or 1
+    # "spawn" so workers never inherit a forked copy of the Tk main loop
+    ctx = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    try:
+        futures = {pool.submit(fn, *args): key for key, fn, args in tasks}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _pool_chunks(fn, n, seed, workers, chunk, *args):
+    # Yields fn(seed, i, size, *args) for every chunk, in completion order.
+    tasks = [(i, fn, (seed, i, size, *args)) for i, size in enumerate(chunk_sizes(n, chunk))]
+    for _, result in _pool_tasks(tasks, workers):
+        yield result
+
+
+def parallel_simulate(n, switch, seed, workers=None, doors=3, reveals=1, chunk=CHUNK):
+    # Yields (trials_done, wins) each time a chunk finishes, in completion order.
+    check_doors(doors, reveals)
+    done = wins = 0
+    for size, chunk_wins in _pool_chunks(play_chunk, n, seed, workers, chunk,
+                                         switch, doors, reveals):
+        done += size
+        wins += chunk_wins
+        yield done, wins
+
+
+def parallel_compare(n, seed, workers=None, doors=3, reveals=1, chunk=CHUNK):
+    # Yields (trials_done, tallies) like sequential_compare(), in completion order.
+    check_doors(doors, reveals)
+    done = 0
+    tallies = np.zeros(len(COMPARE_FIELDS), dtype=np.int64)
+    for size, chunk_tallies in _pool_chunks(compare_chunk, n, seed, workers, chunk,
+                                            doors, reveals):
+        done += size
+        tallies += chunk_tallies
+        yield done, tallies.copy()
+
+
+def parallel_estimate(n, switch, seed, estimator, workers=None, doors=3, reveals=1,
+                      chunk=CHUNK):
+    # Yields (trials_done, stats) like sequential_estimate(), in completion order.
+    check_doors(doors, reveals)
+    done = 0
+    stats = np.zeros(STAT_SIZES[estimator], dtype=np.int64)
+    for size, chunk_stats in _pool_chunks(estimate_chunk, n, seed, workers, chunk,
+                                          switch, estimator, doors, reveals):
+        done += size
+        stats += chunk_stats
+        yield done, stats.copy()
+
+
+def parallel_tournament(agents, rounds, seed, strategies=STRATEGIES, workers=None, doors=3,
+                        reveals=1, epsilon=DEFAULT_EPSILON, chunk=AGENT_CHUNK):
+    # Yields (agents_done, rounds, wins, switches) like sequential_tournament()
+    # each time one strategy's agent chunk has played every round. Each
+    # (strategy, chunk) is its own task, dealing the chunk's games itself.
+    check_doors(doors, reveals)
+    strategies = check_strategies(strategies, epsilon)
+    tasks = [
+        (s, tournament_chunk, (seed, i, size, rounds, (name,), doors, reveals, epsilon))
+        for i, size in enumerate(chunk_sizes(agents, chunk))
+        for s, name in enumerate(strategies)
+    ]
+    done = np.zeros(len(strategies), dtype=np.int64)
+    wins = np.zeros((len(strategies), rounds), dtype=np.int64)
+    switches = np.zeros_like(wins)
+    for s, (size, chunk_wins, chunk_switches) in _pool_tasks(tasks, workers):
+        done[s] += size
+        wins[s] += chunk_wins[0]
+        switches[s] += chunk_switches[0]
+        yield done.copy(), rounds, wins.copy(), switches.copy()
+
+
+def parallel_ensemble(replicates, n, switch, seed, workers=None, doors=3, reveals=1,
+                      points=ENSEMBLE_POINTS, chunk=REPLICATE_CHUNK):
+    # Yields (replicates_done, n, checkpoints, wins) like sequential_ensemble()
+    # each time a group of replicates has played every trial, the finished
+    # groups' rows stacked in completion order
+    check_doors(doors, reveals)
+    checkpoints = log_checkpoints(n, points)
+    tasks = [
+        (i, ensemble_chunk, (seed, i, size, n, switch, doors, reveals, points))
+        for i, size in enumerate(chunk_sizes(replicates, chunk))
+    ]
+    done, paths = 0, []
+    for _, (size, wins) in _pool_tasks(tasks, workers):
+        done += size
+        paths.append(wins)
+        yield done, n, checkpoints, np.vstack(paths)
+
+
+def simulate(n, switch, seed, workers=1, doors=3, reveals=1, chunk=CHUNK):
+    # Picks the engine: a pool only pays off once there is more than one chunk.
+    if workers > 1 and n > chunk:
+        return parallel_simulate(n, switch, seed, workers, doors, reveals, chunk)
+    return sequential_simulate(n, switch, seed, doors, reveals, chunk)
+
+
+def compare(n, seed, workers=1, doors=3, reveals=1, chunk=CHUNK):
+    # Stay, switch and random switching on the same trials; engine as in simulate()
+    if workers > 1 and n > chunk:
+        return parallel_compare(n, seed, workers, doors, reveals, chunk)
+    return sequential_compare(n, seed, doors, reveals, chunk)
+
+
+def estimate_run(n, switch, seed, estimator="plain", workers=1, doors=3, reveals=1,
+                 chunk=CHUNK):
+    # One estimator's (trials_done, stats); engine as in simulate()
+    if workers > 1 and n > chunk:
+        return parallel_estimate(n, switch, seed, estimator, workers, doors, reveals, chunk)
+    return sequential_estimate(n, switch, seed, estimator, doors, reveals, chunk)
+
+
+def tournament(agents, rounds, seed, strategies=STRATEGIES, workers=1, doors=3, reveals=1,
+               epsilon=DEFAULT_EPSILON, chunk=AGENT_CHUNK):
+    # Learning players' (agents_done, rounds_done, wins, switches); a pool
+    # once there is more than one (strategy, agent chunk) to share out
+    if workers > 1 and len(tuple(strategies)) * len(chunk_sizes(agents, chunk)) > 1:
+        return parallel_tournament(agents, rounds, seed, strategies, workers, doors,
+                                   reveals, epsilon, chunk)
+    return sequential_tournament(agents, rounds, seed, strategies, doors, reveals, epsilon,
+                                 chunk)
+
+
+def ensemble(replicates, n, switch, seed, workers=1, doors=3, reveals=1,
+             points=ENSEMBLE_POINTS, chunk=REPLICATE_CHUNK):
+    # R replicates' (replicates_done, trials_done, checkpoints, wins); a pool
+    # once there is more than one group of replicates
+    if workers > 1 and replicates > chunk:
+        return parallel_ensemble(replicates, n, switch, seed, workers, doors, reveals,
+                                 points, chunk)
+    return sequential_ensemble(replicates, n, switch, seed, doors, reveals, points, chunk)
@@ -0,0 +1,25 @@
+# Progress shared between a simulation thread and whoever displays it.
+#
+# The worker replaces the whole snapshot tuple in a single assignment, which
+# is atomic under the GIL, so there is no lock and no queue: readers poll at
+# their own pace and only ever see the newest complete update. Publishing costs
+# the worker one tuple and one attribute store, however often it is called.
+# published_at is stored next to it so a display can measure how long updates
+# wait before they are drawn; the pair is not atomic, which is fine for that.
+import time
+
+
+class RunProgress:
+    def __init__(self, n):
+        self.n = n
+        # (trials_done, wins, interval, final)
+        self.snapshot = (0, 0, None, False)
+        self.published_at = time.perf_counter()
+
+    def publish(self, done, wins, interval=None, final=False):
+        self.published_at = time.perf_counter()
+        self.snapshot = (done, wins, interval, final or done >= self.n)
+
+    @property
+    def finished(self):
+        return self.snapshot[3]
@@ -0,0 +1,64 @@
+# Counter-based random streams for the simulation core.
+#
+# Philox is a counter-based generator: its output for a given key and counter
+# is a pure function of the two, so a stream can be started at any point
+# without generating anything before it. The master seed picks the 128-bit
+# key, and chunk i of a run starts at counter i << 128 (the upper two words of
+# the 256-bit counter). Every chunk therefore has 2^128 blocks to itself
+# before it could reach the next one. Chunks can be generated out of order,
+# on any process or machine, and always come out the same. Other subsystems
+# (estimators, tournaments, ensembles) key their streams by tuples
+# (seed, subsystem, ...), which never share a key with each other or with a
+# plain seed.
+from functools import lru_cache
+
+import numpy as np
+
+
+RNG_ALGORITHM = "philox"
+
+
+def new_seed():
+    # Fresh 128-bit master seed from OS entropy
+    return int(np.random.SeedSequence().entropy)
+
+
+def _tuple_entropy(seed):
+    # Each part as its word count then its 32-bit words. SeedSequence pads
+    # short entropy with zeros and splits big ints into words, so (s, 1) and
+    # (s, 1, 0), or (2**32 + s, 1) and (s, 1, 1), would otherwise be one key.
+    entropy = []
+    for part in seed:
+        if part < 0:
+            raise ValueError(f"seed parts must be non-negative, got {part}")
+        words = []
+        while True:
+            words.append(part & 0xFFFFFFFF)
+            part >>= 32
+            if not part:
+                break
+        entropy += [len(words), *words]
+    return entropy
+
+
+@lru_cache(maxsize=64)
+def seed_key(seed):
+    # Mixes an integer seed of any size into a Philox key, so nearby seeds
+    # (1, 2, 3, ...) still get unrelated streams. A tuple (seed, stream, ...)
+    # names a stream of its own; the spawn key keeps those apart from plain
+    # integer seeds.
+    if isinstance(seed, tuple):
+        sequence = np.random.SeedSequence(_tuple_entropy(seed), spawn_key=(len(seed),))
+    else:
+        sequence = np.random.SeedSequence(seed)
+    words = sequence.generate_state(2, np.uint64)
+    return int(words[0]) | int(words[1]) << 64
+
+
+def chunk_rng(seed, index):
+    return np.random.Generator(np.random.Philox(key=seed_key(seed), counter=index << 128))
+
+
+def locate(trial, chunk):
+    # (chunk index, offset within the chunk) of a 0-based trial number
+    return divmod(trial, chunk)
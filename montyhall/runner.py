@@ -0,0 +1,215 @@
+# Long runs that can be paused, cancelled, checkpointed to disk and resumed.
+#
+# A seeded run is fully described by its parameters and the index of the next
+# chunk to play (chunk i always draws from chunk_rng(seed, i)), so that is the
+# RNG state a checkpoint stores. Chunks are always folded in index order, even
+# on a process pool, so a resumed run ends with exactly the totals an
+# uninterrupted one would have.
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import CHUNK, check_doors, play_chunk
+from .instrument import phase
+from .rng import RNG_ALGORITHM, new_seed
+
+
+# Version 2: chunk streams moved to counter-based Philox
+CHECKPOINT_VERSION = 2
+
+
+class RunControl:
+    # Cooperative stop / pause flags shared between a run and its owner
+    def __init__(self):
+        self._stop = threading.Event()
+        self._go = threading.Event()
+        self._go.set()
+
+    def cancel(self):
+        self._stop.set()
+        self._go.set()      # wake a paused run so it can see the stop
+
+    def pause(self):
+        self._go.clear()
+
+    def resume(self):
+        self._go.set()
+
+    @property
+    def cancelled(self):
+        return self._stop.is_set()
+
+    @property
+    def paused(self):
+        return not self._go.is_set()
+
+    def wait(self):
+        # Blocks while paused; False once the run should stop
+        self._go.wait()
+        return not self._stop.is_set()
+
+
+class SimulationRun:
+    def __init__(self, n, switch, seed=None, doors=3, reveals=1, chunk=CHUNK,
+                 next_chunk=0, done=0, wins=0):
+        check_doors(doors, reveals)
+        self.n = n
+        self.switch = switch
+        self.seed = new_seed() if seed is None else seed
+        self.doors = doors
+        self.reveals = reveals
+        self.chunk = chunk
+        self.next_chunk = next_chunk
+        self.done = done
+        self.wins = wins
+
+    @property
+    def finished(self):
+        return self.done >= self.n
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+    def to_dict(self):
+        return {
+            "version": CHECKPOINT_VERSION,
+            "n": self.n,
+            "switch": self.switch,
+            "doors": self.doors,
+            "reveals": self.reveals,
+            "chunk": self.chunk,
+            "done": self.done,
+            "wins": self.wins,
+            "rng": {
+                "algorithm": RNG_ALGORITHM,
+                "seed": self.seed,
+                "next_chunk": self.next_chunk,
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        # ValueError for anything but a consistent checkpoint of this version
+        version = state.get("version") if isinstance(state, dict) else None
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported checkpoint version: {version!r}")
+        try:
+            if state["rng"].get("algorithm") != RNG_ALGORITHM:
+                raise ValueError(f"unsupported RNG: {state['rng'].get('algorithm')!r}")
+            run = cls(
+                state["n"], state["switch"], state["rng"]["seed"], state["doors"],
+                state["reveals"], state["chunk"], state["rng"]["next_chunk"],
+                state["done"], state["wins"],
+            )
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"malformed checkpoint ({type(exc).__name__}: {exc})") from None
+        counts = (run.n, run.seed, run.doors, run.reveals, run.chunk, run.next_chunk,
+                  run.done, run.wins)
+        # Every chunk before next_chunk is folded, and only those
+        if (any(type(c) is not int for c in counts) or type(run.switch) is not bool
+                or run.chunk < 1 or not 0 <= run.wins <= run.done
+                or run.done != min(run.n, run.next_chunk * run.chunk)):
+            raise ValueError("malformed checkpoint: inconsistent counts")
+        return run
+
+    def save(self, path):
+        # Write-then-rename so a crash mid-write never leaves a torn checkpoint
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    # ------------------------------------------------------------------
+    # Playing
+    # ------------------------------------------------------------------
+    def _chunk_size(self, index):
+        return min(self.chunk, self.n - index * self.chunk)
+
+    def _fold(self, size, wins, instruments=None):
+        self.next_chunk += 1
+        self.done += size
+        self.wins += wins
+        if instruments is not None:
+            instruments.count("trials", size)
+
+    def run(self, control=None, progress=None, checkpoint=None, every=10.0,
+            workers=1, instruments=None):
+        # Plays until finished or cancelled and returns self.finished. The
+        # checkpoint file is written every `every` seconds, when pausing, and
+        # on the way out however the run ends. Phases are timed into
+        # `instruments` when given (see instrument.py).
+        control = control or RunControl()
+        last_save = time.monotonic()
+
+        def tick():
+            nonlocal last_save
+            if progress is not None:
+                progress.publish(self.done, self.wins)
+            if checkpoint and time.monotonic() - last_save >= every:
+                with phase(instruments, "checkpoint"):
+                    self.save(checkpoint)
+                last_save = time.monotonic()
+
+        def proceed():
+            if control.paused and checkpoint:
+                self.save(checkpoint)
+            return control.wait()
+
+        try:
+            if workers > 1 and self.n - self.done > self.chunk:
+                self._run_pool(control, workers, tick, proceed, instruments)
+            else:
+                while not self.finished and proceed():
+                    index = self.next_chunk
+                    with phase(instruments, "play"):
+                        played = play_chunk(self.seed, index, self._chunk_size(index),
+                                            self.switch, self.doors, self.reveals)
+                    self._fold(*played, instruments)
+                    tick()
+        finally:
+            if checkpoint:
+                with phase(instruments, "checkpoint"):
+                    self.save(checkpoint)
+            if progress is not None:
+                progress.publish(self.done, self.wins, final=True)
+        return self.finished
+
+    def _run_pool(self, control, workers, tick, proceed, instruments=None):
+        # Keeps a bounded window of chunks in flight and folds them in index
+        # order. Pausing simply stops submitting; the window drains.
+        total_chunks = -(-self.n // self.chunk)
+        ctx = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        pending = deque()
+        submitted = self.next_chunk
+        try:
+            while not self.finished:
+                while (len(pending) < 2 * workers and submitted < total_chunks
+                       and not control.paused and not control.cancelled):
+                    pending.append(pool.submit(
+                        play_chunk, self.seed, submitted, self._chunk_size(submitted),
+                        self.switch, self.doors, self.reveals,
+                    ))
+                    submitted += 1
+                if not pending:
+                    if not proceed():
+                        return
+                    continue
+                # Time spent blocked on the pool, not the workers' own time
+                with phase(instruments, "pool_wait"):
+                    played = pending.popleft().result()
+                self._fold(*played, instruments)
+                tick()
+                if control.cancelled:
+                    return
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
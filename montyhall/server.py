@@ -0,0 +1,369 @@
+# Local HTTP/JSON service, so other tools can get numbers without the GUI.
+#
+#   POST   /simulate          {"n", "switch": "yes"|"no"|"compare", "seed",
+#                             "doors", "reveals"} -> 202 {"id", ...}
+#   GET    /runs              every job the server still remembers
+#   GET    /runs/{id}         state and totals of one job
+#   GET    /runs/{id}/events  the same as server-sent events, one per chunk
+#   DELETE /runs/{id}         cancel a queued or running job
+#
+# Stdlib only: asyncio streams and a hand-rolled HTTP/1.1 subset (one request
+# per connection). Chunks are played on a shared process pool, so the event
+# loop only parses requests and adds up totals. Jobs wait in a bounded queue;
+# when it is full POST /simulate answers 503 with Retry-After instead of
+# piling up work. At most `concurrency` jobs run at a time and each keeps
+# `workers` chunks in flight, folded in index order, so a job's totals equal
+# a seeded simulate() (or compare()) run of the same parameters.
+import asyncio
+import json
+import multiprocessing
+import os
+import secrets
+import signal
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import CHUNK, COMPARE_FIELDS, check_doors, compare_chunk, play_chunk
+from .rng import new_seed
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8335
+DEFAULT_QUEUE = 64          # jobs waiting to run
+DEFAULT_CONCURRENCY = 4     # jobs running at once
+MAX_N = 10**12
+MAX_BODY = 64 * 1024
+KEEP_FINISHED = 1000        # finished jobs remembered for GET /runs/{id}
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+FINISHED = (DONE, CANCELLED, FAILED)
+
+
+def _ignore_sigint():
+    # Ctrl-C is for the server process, which shuts the pool down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.headers = list(headers)
+
+
+# ----------------------------------------------------------------------
+# Jobs
+# ----------------------------------------------------------------------
+class Job:
+    def __init__(self, n, mode, seed, doors, reveals):
+        self.id = secrets.token_hex(6)
+        self.n = n
+        self.mode = mode            # "yes", "no" or "compare"
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.state = QUEUED
+        self.error = None
+        self.done = 0
+        self.tallies = np.zeros(len(COMPARE_FIELDS) if mode == "compare" else 1,
+                                dtype=np.int64)
+        self.created = time.time()
+        self.started = self.finished = None
+        self.cancel_requested = False
+        self._changed = asyncio.Event()
+
+    def update(self, **changes):
+        # Wakes every events() subscriber; each then reads the newest state
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def events(self):
+        # Snapshots as the job changes. A slow reader skips the ones it
+        # missed rather than queueing them up.
+        while True:
+            changed = self._changed
+            yield self.to_dict()
+            if self.state in FINISHED:
+                return
+            await changed.wait()
+
+    def to_dict(self):
+        out = {
+            "id": self.id, "state": self.state, "n": self.n, "switch": self.mode,
+            "seed": self.seed, "doors": self.doors, "reveals": self.reveals,
+            "trials": self.done, "created": self.created, "started": self.started,
+            "finished": self.finished,
+        }
+        if self.mode == "compare":
+            out["tallies"] = {name: int(t) for name, t in zip(COMPARE_FIELDS, self.tallies)}
+        else:
+            out["wins"] = int(self.tallies[0])
+            out["win_rate"] = out["wins"] / self.done if self.done else None
+        if self.started:
+            elapsed = (self.finished or time.time()) - self.started
+            out["trials_per_s"] = self.done / elapsed if elapsed > 0 else None
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+def parse_job(body):
+    # A Job from a POST /simulate body; HTTPError 400 if it makes no sense
+    try:
+        params = json.loads(body or b"{}")
+    except ValueError as exc:
+        raise HTTPError(400, f"body is not JSON: {exc}")
+    if not isinstance(params, dict):
+        raise HTTPError(400, "body must be a JSON object")
+    unknown = set(params) - {"n", "switch", "seed", "doors", "reveals"}
+    if unknown:
+        raise HTTPError(400, f"unknown fields: {', '.join(sorted(unknown))}")
+
+    mode = params.get("switch", "yes")
+    if mode is True or mode is False:
+        mode = "yes" if mode else "no"
+    if mode not in ("yes", "no", "compare"):
+        raise HTTPError(400, "switch must be \"yes\", \"no\" or \"compare\"")
+    values = {}
+    for name, default, low in (("n", 10_000, 1), ("doors", 3, 3), ("reveals", 1, 0),
+                               ("seed", None, 0)):
+        value = params.get(name, default)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int)
+                                  or value < low):
+            raise HTTPError(400, f"{name} must be a whole number >= {low}")
+        values[name] = value
+    if values["n"] > MAX_N:
+        raise HTTPError(400, f"n must be at most {MAX_N:,}")
+    try:
+        check_doors(values["doors"], values["reveals"])
+    except ValueError as exc:
+        raise HTTPError(400, str(exc))
+    seed = new_seed() if values["seed"] is None else values["seed"]
+    return Job(values["n"], mode, seed, values["doors"], values["reveals"])
+
+
+# ----------------------------------------------------------------------
+# Service
+# ----------------------------------------------------------------------
+class SimulationService:
+    def __init__(self, workers=None, queue=DEFAULT_QUEUE, concurrency=DEFAULT_CONCURRENCY,
+                 chunk=CHUNK):
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.chunk = chunk
+        self.jobs = OrderedDict()
+        self._queue = asyncio.Queue(maxsize=queue)
+        self._pool = None
+        self._runners = []
+        self._server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        # Returns the port actually bound (pass port=0 for any free one)
+        # "spawn" as in parallel.py: workers never inherit the loop's state
+        self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                         mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_ignore_sigint)
+        self._runners = [asyncio.create_task(self._runner())
+                         for _ in range(self.concurrency)]
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for job in self.jobs.values():
+            if job.state not in FINISHED:
+                job.cancel_requested = True
+        for task in self._runners:
+            task.cancel()
+        await asyncio.gather(*self._runners, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    # Jobs -----------------------------------------------------------------
+    def submit(self, job):
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HTTPError(503, "job queue is full, try again later",
+                            [("Retry-After", "1")])
+        self.jobs[job.id] = job
+        self._forget_old()
+        return job
+
+    def cancel(self, job):
+        if job.state == QUEUED:
+            job.update(state=CANCELLED, finished=time.time())
+        elif job.state == RUNNING:
+            job.cancel_requested = True
+
+    def _forget_old(self):
+        finished = [i for i, j in self.jobs.items() if j.state in FINISHED]
+        for job_id in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+            del self.jobs[job_id]
+
+    async def _runner(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.state == QUEUED:
+                    await self._run(job)
+            except Exception as exc:
+                job.update(state=FAILED, error=str(exc), finished=time.time())
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job):
+        # Same scheme as SimulationRun._run_pool: a window of `workers` chunks
+        # in flight, results folded in index order
+        loop = asyncio.get_running_loop()
+        job.update(state=RUNNING, started=time.time())
+        full, rest = divmod(job.n, self.chunk)
+        sizes = [self.chunk] * full + ([rest] if rest else [])
+        if job.mode == "compare":
+            fn, extra = compare_chunk, (job.doors, job.reveals)
+        else:
+            fn, extra = play_chunk, (job.mode == "yes", job.doors, job.reveals)
+        pending = deque()
+        index = 0
+        try:
+            while index < len(sizes) or pending:
+                while index < len(sizes) and len(pending) < self.workers:
+                    pending.append(loop.run_in_executor(
+                        self._pool, fn, job.seed, index, sizes[index], *extra))
+                    index += 1
+                size, result = await pending.popleft()
+                if job.cancel_requested:
+                    break
+                job.update(done=job.done + size, tallies=job.tallies + result)
+        finally:
+            for future in pending:
+                future.cancel()
+        job.update(state=CANCELLED if job.cancel_requested else DONE,
+                   finished=time.time())
+
+    # HTTP -----------------------------------------------------------------
+    async def _handle(self, reader, writer):
+        try:
+            method, path, body = await _read_request(reader)
+            await self._route(method, path, body, writer)
+        except HTTPError as exc:
+            await _send_json(writer, exc.status, {"error": str(exc)}, exc.headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body, writer):
+        parts = [p for p in path.split("?", 1)[0].split("/") if p]
+        if parts == ["simulate"]:
+            _allow(method, "POST")
+            job = self.submit(parse_job(body))
+            await _send_json(writer, 202, job.to_dict(),
+                             [("Location", f"/runs/{job.id}")])
+        elif parts == ["runs"]:
+            _allow(method, "GET")
+            await _send_json(writer, 200, {
+                "queued": self._queue.qsize(),
+                "runs": [job.to_dict() for job in self.jobs.values()],
+            })
+        elif len(parts) in (2, 3) and parts[0] == "runs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, f"no run {parts[1]}")
+            if len(parts) == 3:
+                if parts[2] != "events":
+                    raise HTTPError(404, f"no such resource {path}")
+                _allow(method, "GET")
+                await _send_events(writer, job)
+            elif method == "DELETE":
+                self.cancel(job)
+                await _send_json(writer, 202, job.to_dict())
+            else:
+                _allow(method, "GET")
+                await _send_json(writer, 200, job.to_dict())
+        else:
+            raise HTTPError(404, f"no such resource {path}")
+
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large",
+           503: "Service Unavailable"}
+
+
+def _allow(method, allowed):
+    if method != allowed:
+        raise HTTPError(405, f"use {allowed}", [("Allow", allowed)])
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    try:
+        method, path, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    # Digits only: int() would also take "-3", " +3" and "1_0"
+    length = headers.get("content-length", "0")
+    if not (length.isascii() and length.isdigit()):
+        raise HTTPError(400, "bad Content-Length")
+    length = int(length)
+    if length > MAX_BODY:
+        raise HTTPError(413, f"body larger than {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, body
+
+
+def _head(status, content_type, headers=(), length=None):
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+             f"Content-Type: {content_type}", "Connection: close"]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _send_json(writer, status, payload, headers=()):
+    body = (json.dumps(payload) + "\n").encode()
+    writer.write(_head(status, "application/json", headers, len(body)) + body)
+    await writer.drain()
+
+
+async def _send_events(writer, job):
+    # Server-sent events: "progress" while it runs, then one "end"
+    writer.write(_head(200, "text/event-stream", [("Cache-Control", "no-cache")]))
+    async for snapshot in job.events():
+        kind = "end" if snapshot["state"] in FINISHED else "progress"
+        writer.write(f"event: {kind}\ndata: {json.dumps(snapshot)}\n\n".encode())
+        # drain() waits while the client is slow; updates made meanwhile
+        # collapse into the next snapshot
+        await writer.drain()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, queue=DEFAULT_QUEUE,
+                concurrency=DEFAULT_CONCURRENCY, ready=None):
+    # Runs until cancelled (Ctrl-C); ready(port) is called once listening
+    service = SimulationService(workers, queue, concurrency)
+    port = await service.start(host, port)
+    if ready is not None:
+        ready(port)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.stop()
@@ -0,0 +1,36 @@
+# Confidence intervals for win rates.
+import math
+
+
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(wins, n, z=Z_95):
+    # Wilson score interval: stays inside [0, 1] and behaves well near 0 and 1,
+    # unlike the normal approximation.
+    if n == 0:
+        return 0.0, 1.0
+    p = wins / n
+    z2 = z * z
+    centre = (p + z2 / (2 * n)) / (1 + z2 / n)
+    half = z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def trials_for_precision(p, epsilon, z=Z_95):
+    # Trials needed for a half-width of about epsilon at win rate p
+    p = min(max(p, 1e-6), 1 - 1e-6)
+    return math.ceil(z * z * p * (1 - p) / (epsilon * epsilon))
+
+
+def paired_difference_interval(only_a, only_b, n, z=Z_95):
+    # Difference in win rate between two strategies scored on the same n
+    # trials, from the trials only one of them won. Returns (diff, low, high);
+    # trials both won or both lost cancel out, which is what makes the
+    # interval narrower than comparing two independent runs.
+    if n == 0:
+        return 0.0, -1.0, 1.0
+    diff = (only_a - only_b) / n
+    var = max((only_a + only_b) / n - diff * diff, 0.0)
+    half = z * math.sqrt(var / n)
+    return diff, max(-1.0, diff - half), min(1.0, diff + half)
@@ -0,0 +1,77 @@
+# Parameter sweeps:  python -m montyhall sweep --n 1e6 1e7 --doors 3 4 5
+#
+# A sweep is a grid of (N, switch, doors, reveals, seed) cells. Each cell runs
+# on a process pool through the result cache, so cells seen before come back
+# at once and a larger N extends a smaller one instead of starting over.
+# Cells that share a cache entry (everything but N equal) are chained, smallest
+# N first, so the larger ones reuse what the smaller ones just stored; across
+# entries the cheapest cells are submitted first to give early feedback.
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import product
+
+from .cache import DEFAULT_MAX_BYTES, ResultCache, cached_simulate, config_key
+from .engine import CHUNK, check_doors, exact_win_probability
+from .stats import wilson_interval
+
+
+def grid(ns, switches=(True, False), doors=(3,), reveals=(1,), seeds=(0,)):
+    # Every valid combination; door/reveal pairs that cannot be played are skipped
+    cells = []
+    for n, switch, d, k, seed in product(ns, switches, doors, reveals, seeds):
+        try:
+            check_doors(d, k)
+        except ValueError:
+            continue
+        cells.append({"n": n, "switch": switch, "doors": d, "reveals": k, "seed": seed})
+    return cells
+
+
+def _cost(cell):
+    # Trials per second fall roughly with the number of doors
+    return cell["n"] * cell["doors"]
+
+
+def run_cell(cell, cache_path, max_bytes=DEFAULT_MAX_BYTES, chunk=CHUNK):
+    with ResultCache(cache_path, max_bytes) as cache:
+        done, wins, reused = cached_simulate(
+            cell["n"], cell["switch"], cell["seed"], cache,
+            cell["doors"], cell["reveals"], chunk,
+        )
+    low, high = wilson_interval(wins, done)
+    exact = exact_win_probability(cell["doors"], cell["reveals"], cell["switch"])
+    return dict(cell, trials=done, wins=wins, win_rate=wins / done,
+                ci_low=low, ci_high=high, exact=str(exact), exact_rate=float(exact),
+                reused=reused)
+
+
+def run_sweep(cells, cache_path, workers=1, max_bytes=DEFAULT_MAX_BYTES,
+              chunk=CHUNK):
+    # Yields one result dict per cell as it finishes
+    chains = defaultdict(list)
+    for cell in sorted(cells, key=_cost):
+        key = config_key(cell["seed"], cell["switch"], cell["doors"], cell["reveals"], chunk)
+        chains[key].append(cell)
+    heads = sorted(chains, key=lambda key: _cost(chains[key][0]))
+
+    if workers <= 1:
+        for key in heads:
+            for cell in chains[key]:
+                yield run_cell(cell, cache_path, max_bytes, chunk)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        running = {}
+        for key in heads:
+            running[pool.submit(run_cell, chains[key].pop(0), cache_path,
+                                max_bytes, chunk)] = key
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = running.pop(future)
+                if chains[key]:
+                    running[pool.submit(run_cell, chains[key].pop(0), cache_path,
+                                        max_bytes, chunk)] = key
+                yield future.result()
@@ -0,0 +1,206 @@
+# Per-trial traces of the classic 3-door game, one byte per trial.
+#
+#   bits 0-1  first pick      bits 4-5  winning door    bit 7  won
+#   bits 2-3  door Monty shows bit 6    switched
+#
+# Monty never shows the first pick, so a valid trace byte is never 0; an
+# all-zero byte marks space that has not been written yet. Stores live in a
+# growable NumPy buffer or in a .npy file opened as a memory map, and every
+# query below works a chunk at a time on the packed bytes, so a billion-trial
+# trace is never expanded into Python objects or unpacked all at once.
+import numpy as np
+
+from .engine import CHUNK, deal_batch
+from .rng import chunk_rng
+
+
+FIELDS = {
+    # name: (shift, mask)
+    "first_pick": (0, 0b11),
+    "shown":      (2, 0b11),
+    "winner":     (4, 0b11),
+    "switched":   (6, 0b1),
+    "won":        (7, 0b1),
+}
+
+
+def pack(first_pick, shown, winner, switched, won):
+    first_pick, shown, winner, switched, won = (
+        np.asarray(a, dtype=np.uint8) for a in (first_pick, shown, winner, switched, won)
+    )
+    return (first_pick | shown << 2 | winner << 4 | switched << 6 | won << 7).astype(np.uint8)
+
+
+def field(traces, name):
+    shift, mask = FIELDS[name]
+    return (np.asarray(traces, dtype=np.uint8) >> shift) & mask
+
+
+def unpack(traces):
+    return {name: field(traces, name) for name in FIELDS}
+
+
+def _counts(traces):
+    # (wins, switched, switch_wins) among packed traces
+    won_bit, switched_bit = 1 << 7, 1 << 6
+    return np.array([
+        np.count_nonzero(traces & won_bit),
+        np.count_nonzero(traces & switched_bit),
+        np.count_nonzero((traces & (won_bit | switched_bit)) == won_bit | switched_bit),
+    ], dtype=np.int64)
+
+
+def trace_batch(n, switch, rng):
+    # n traced trials; switch=None switches at random. deal_batch draws the
+    # first pick and the car first, like simulate_batch, so the wins match a
+    # seeded simulate() run of the same chunks exactly.
+    first_pick, shown, winner = deal_batch(n, rng)
+    if switch is None:
+        switched = rng.integers(0, 2, size=n, dtype=np.uint8)
+    else:
+        switched = np.full(n, switch, dtype=np.uint8)
+    won = (first_pick == winner) ^ switched.astype(bool)
+    return pack(first_pick, shown, winner, switched, won)
+
+
+def trace_chunk(seed, index, size, switch):
+    return trace_batch(size, switch, chunk_rng(seed, index))
+
+
+class TraceStore:
+    def __init__(self, capacity=1024, path=None):
+        # In memory the buffer doubles as it fills; with `path` it is a .npy
+        # memory map of exactly `capacity` trials
+        self.path = path
+        if path is None:
+            self._buf = np.zeros(capacity, dtype=np.uint8)
+        else:
+            self._buf = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8,
+                                                  shape=(capacity,))
+        self._len = 0
+        # Running (wins, switched, switch_wins) over every trial, kept up by
+        # extend() so tally() of the whole store is O(1)
+        self._totals = np.zeros(3, dtype=np.int64)
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        # Maps a saved trace; unwritten space at the end (a cancelled run) is
+        # left out by finding the first zero byte with a binary search
+        store = cls.__new__(cls)
+        store.path = path
+        store._buf = np.load(path, mmap_mode=mode)
+        lo, hi = 0, len(store._buf)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if store._buf[mid]:
+                lo = mid + 1
+            else:
+                hi = mid
+        store._len = lo
+        store._totals = None        # counted on the first whole-store tally()
+        return store
+
+    def __len__(self):
+        return self._len
+
+    @property
+    def nbytes(self):
+        return self._buf.nbytes
+
+    def extend(self, traces):
+        traces = np.asarray(traces, dtype=np.uint8)
+        end = self._len + len(traces)
+        if end > len(self._buf):
+            if self.path is not None:
+                raise ValueError(f"trace file {self.path} holds {len(self._buf)} trials")
+            self._buf = np.resize(self._buf, max(end, 2 * len(self._buf)))
+        self._buf[self._len:end] = traces
+        self._len = end
+        if self._totals is not None:
+            self._totals += _counts(traces)
+
+    def append(self, first_pick, shown, winner, switched, won):
+        self.extend(pack([first_pick], [shown], [winner], [switched], [won]))
+
+    def flush(self):
+        if self.path is not None:
+            self._buf.flush()
+
+    def close(self):
+        self.flush()
+
+    def __getitem__(self, index):
+        # Packed bytes (a view, no copy) for a slice, one int for an index
+        if isinstance(index, slice):
+            return self._buf[:self._len][index]
+        if not -self._len <= index < self._len:
+            raise IndexError("trace index out of range")
+        return int(self._buf[index % self._len])
+
+    def chunks(self, start=0, stop=None, chunk=CHUNK):
+        stop = self._len if stop is None else min(stop, self._len)
+        for lo in range(start, stop, chunk):
+            yield self._buf[lo:min(lo + chunk, stop)]
+
+    def field(self, name, start=0, stop=None):
+        # One field for a range of trials as a uint8 array
+        return field(self[start:stop], name)
+
+    def tally(self, start=0, stop=None):
+        # Aggregate counts over a range of trials; the whole store comes from
+        # the running totals
+        whole = start == 0 and (stop is None or stop >= self._len)
+        if whole and self._totals is not None:
+            trials, counts = self._len, self._totals
+        else:
+            trials, counts = 0, np.zeros(3, dtype=np.int64)
+            for part in self.chunks(start, stop):
+                trials += len(part)
+                counts += _counts(part)
+            if whole:
+                self._totals = counts
+        wins, switched, switch_wins = (int(c) for c in counts)
+        return {"trials": trials, "wins": wins, "switched": switched,
+                "switch_wins": switch_wins}
+
+    def door_counts(self, name, start=0, stop=None):
+        # How often each door appears in first_pick, shown or winner
+        counts = np.zeros(3, dtype=np.int64)
+        for part in self.chunks(start, stop):
+            counts += np.bincount(field(part, name), minlength=4)[:3]
+        return counts
+
+    def cumulative_wins(self, at):
+        # Wins among the first t trials for every t in the sorted list `at`
+        won_bit = 1 << 7
+        out, wins, done, i = [], 0, 0, 0
+        for part in self.chunks():
+            end = done + len(part)
+            while i < len(at) and at[i] <= end:
+                out.append(wins + int(np.count_nonzero(part[:at[i] - done] & won_bit)))
+                i += 1
+            wins += int(np.count_nonzero(part & won_bit))
+            done = end
+        out.extend([wins] * (len(at) - i))
+        return out
+
+
+def record(n, switch, seed, store, chunk=CHUNK, control=None, progress=None):
+    # Plays n seeded trials into `store`; returns (trials_done, wins)
+    done = wins = 0
+    index = 0
+    while done < n:
+        if control is not None and not control.wait():
+            break
+        size = min(chunk, n - done)
+        traces = trace_chunk(seed, index, size, switch)
+        store.extend(traces)
+        index += 1
+        done += size
+        wins += int(np.count_nonzero(traces & 1 << 7))
+        if progress is not None:
+            progress.publish(done, wins)
+    store.flush()
+    if progress is not None:
+        progress.publish(done, wins, final=True)
+    return done, wins
@@ -0,0 +1,64 @@
+# Comparing a bench report with a baseline, and refusing files that are not one.
+import importlib
+import json
+import sys
+
+import pytest
+
+from montyhall import bench
+from montyhall.bench import baseline_cases, compare
+from montyhall.cli import main
+
+
+def _result(engine, n, rate):
+    return {"engine": engine, "workers": 1, "n": n, "switch": True, "trials_per_s": rate}
+
+
+def test_compare_finds_regressions():
+    base = baseline_cases({"results": [_result("numpy", 10, 100.0), _result("numpy", 20, 100.0),
+                                       _result("python", 10, None)]})
+    report = {"results": [_result("numpy", 10, 95.0), _result("numpy", 20, 80.0),
+                          _result("python", 10, 5.0), _result("parallel", 10, 1.0)]}
+    rows, regressions = compare(report, base, 0.1)
+    assert [r["n"] for r, _, _ in rows] == [10, 20]
+    assert [(r["n"], round(change, 2)) for r, _, change in regressions] == [(20, -0.2)]
+
+
+@pytest.mark.parametrize("baseline", [
+    [], {}, {"results": 3}, {"results": [1]}, {"results": [{"engine": "numpy"}]},
+    {"results": [dict(_result("numpy", 10, 1.0), engine=["numpy"])]},
+    {"results": [_result("numpy", 10, "fast")]},
+])
+def test_malformed_baseline(baseline):
+    with pytest.raises(ValueError):
+        baseline_cases(baseline)
+
+
+def test_no_resource_module(monkeypatch):
+    # Windows has no resource module: bench must still import, and peak RSS
+    # is reported as missing
+    monkeypatch.setitem(sys.modules, "resource", None)
+    module = importlib.reload(bench)
+    try:
+        assert module.resource is None
+        assert module._peak_rss_kib() is None
+    finally:
+        monkeypatch.undo()
+        importlib.reload(bench)
+
+
+def test_missing_rss_is_shown_as_na(monkeypatch, capsys, tmp_path):
+    def run_case(engine, n, switch, workers, repeat=3):
+        return dict(_result(engine, n, 50.0), switch=switch, workers=workers, wins=0,
+                    elapsed_s=1.0, ns_per_trial=1.0, peak_rss_kib=None)
+
+    monkeypatch.setattr(bench, "run_case", run_case)
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": [_result("numpy", 10, 100.0)]}))
+    output = tmp_path / "report.json"
+    status = main(["bench", "--engines", "numpy", "--sizes", "10", "--workers", "1",
+                   "--output", str(output), "--baseline", str(baseline)])
+    out = capsys.readouterr().out
+    assert status == 1 and "REGRESSION" in out
+    assert [line.split()[-1] for line in out.splitlines()[1:3]] == ["n/a", "n/a"]
+    assert json.loads(output.read_text())["results"][0]["peak_rss_kib"] is None
@@ -0,0 +1,70 @@
+# The result cache: every answer equals an uncached run, repeats come from
+# the cache, and a longer run only plays the chunks past what is stored.
+import pytest
+
+from montyhall.cache import ResultCache, cached_simulate
+from montyhall.engine import CHUNK, sequential_simulate, win_marks
+from montyhall.parallel import simulate
+from montyhall.rng import chunk_rng
+
+
+def _uncached(n, switch, seed, doors=3, reveals=1):
+    *_, (done, wins) = sequential_simulate(n, switch, seed, doors, reveals)
+    return done, wins
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ResultCache(str(tmp_path / "cache.sqlite")) as cache:
+        yield cache
+
+
+class Progress:
+    def __init__(self):
+        self.updates = []
+
+    def publish(self, done, wins, interval=None, final=False):
+        self.updates.append((done, wins))
+
+
+def test_same_seed_same_answer_as_simulate(cache):
+    # The seed -> result contract: cached, a repeat from the cache and
+    # simulate() all agree
+    *_, (done, wins) = simulate(3_000_000, True, 42)
+    assert cached_simulate(3_000_000, True, 42, cache)[:2] == (done, wins)
+    assert cached_simulate(3_000_000, True, 42, cache) == (done, wins, done)
+
+
+def test_short_run_is_stored(cache):
+    first = cached_simulate(10_000, True, 1, cache)
+    again = cached_simulate(10_000, True, 1, cache)
+    assert first[:2] == again[:2] == _uncached(10_000, True, 1)
+    assert (first[2], again[2]) == (0, 10_000)
+
+
+@pytest.mark.parametrize("doors, reveals", [(3, 1), (5, 2), (4, 0)])
+def test_longer_run_replays_only_the_rest(cache, doors, reveals):
+    cached_simulate(2_500_000, False, 2, cache, doors, reveals)
+    done, wins, reused = cached_simulate(3_000_000, False, 2, cache, doors, reveals)
+    assert (done, wins) == _uncached(3_000_000, False, 2, doors, reveals)
+    assert reused == 2 * CHUNK
+    assert cached_simulate(3_000_000, False, 2, cache, doors, reveals)[2] == 3_000_000
+
+
+def test_shorter_run_after_longer_one(cache):
+    cached_simulate(2_500_000, True, 3, cache)
+    assert cached_simulate(1_500_000, True, 3, cache)[:2] == _uncached(1_500_000, True, 3)
+    # Its tail is not stored over the longer run's
+    assert cached_simulate(2_500_000, True, 3, cache)[2] == 2_500_000
+
+
+def test_progress_every(cache):
+    # ~n / every updates from inside the one chunk played, each the running
+    # total of that chunk's own games
+    progress = Progress()
+    done, wins, _ = cached_simulate(10_000, True, 4, cache, progress=progress, every=50)
+    marks = win_marks(10_000, True, chunk_rng(4, 0))
+    assert progress.updates[0] == (0, 0)
+    assert progress.updates[1:] == [(d, int(marks[:d].sum()))
+                                    for d in range(50, 10_001, 50)]
+    assert progress.updates[-1] == (done, wins)
@@ -0,0 +1,137 @@
+# Coordinator and workers on localhost: several workers, one that dies
+# holding a task and one whose task fails, must still give exactly the
+# single-node totals.
+import asyncio
+
+import pytest
+
+from montyhall import cluster
+from montyhall.engine import sequential_compare, sequential_simulate
+
+
+N = 24_000
+CHUNK = 1_000
+TASK_CHUNKS = 2             # 12 tasks, so every worker gets some
+
+
+def _run(coordinator, *workers):
+    # Starts the coordinator, then the coroutine factories workers(port);
+    # returns (result, what each worker returned or raised)
+    async def main():
+        port = await coordinator.start("127.0.0.1", 0)
+        running = [asyncio.create_task(w(port)) for w in workers]
+        result = await asyncio.wait_for(coordinator.wait(), 60)
+        outcomes = await asyncio.gather(*running, return_exceptions=True)
+        return result, outcomes
+    return asyncio.run(main())
+
+
+def _worker(name):
+    return lambda port: cluster.work("127.0.0.1", port, processes=1, name=name, wait=5)
+
+
+async def _hello(port, name):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await cluster._send(writer, {"type": "hello", "protocol": cluster.PROTOCOL,
+                                 "name": name, "slots": 2})
+    return reader, writer
+
+
+def _vanishing(port):
+    # Takes its tasks and disconnects without answering
+    async def run():
+        reader, writer = await _hello(port, "vanishing")
+        message = await cluster._receive(reader)
+        assert message["type"] == "task"
+        writer.close()
+    return run()
+
+
+def test_workers_match_single_node():
+    coordinator = cluster.Coordinator(N, "yes", seed=7, chunk=CHUNK,
+                                      task_chunks=TASK_CHUNKS)
+    result, outcomes = _run(coordinator, _worker("a"), _worker("b"), _worker("c"))
+    *_, (done, wins) = sequential_simulate(N, True, 7, chunk=CHUNK)
+    assert result["trials"] == done == N
+    assert result["wins"] == wins
+    assert result["workers"] == 3
+    assert sum(outcomes) == result["tasks"]
+
+
+def test_compare_matches_single_node():
+    coordinator = cluster.Coordinator(N, "compare", seed=3, doors=5, reveals=2,
+                                      chunk=CHUNK, task_chunks=TASK_CHUNKS)
+    result, _ = _run(coordinator, _worker("a"), _worker("b"))
+    *_, (_, tallies) = sequential_compare(N, 3, 5, 2, chunk=CHUNK)
+    assert list(result["tallies"].values()) == tallies.tolist()
+
+
+def test_lost_worker_is_reissued():
+    coordinator = cluster.Coordinator(N, "no", seed=11, chunk=CHUNK,
+                                      task_chunks=TASK_CHUNKS)
+    result, outcomes = _run(coordinator, _vanishing, _worker("a"), _worker("b"))
+    *_, (_, wins) = sequential_simulate(N, False, 11, chunk=CHUNK)
+    assert result["wins"] == wins
+    assert result["reissued"] >= 1
+    assert outcomes[0] is None
+
+
+def test_failing_worker_quits_and_is_reissued(monkeypatch):
+    play_range = cluster._play_range
+    calls = []
+
+    async def fail_first(loop, pool, task):
+        calls.append(task["task"])
+        if len(calls) == 1:
+            raise ValueError("broken worker")
+        return await play_range(loop, pool, task)
+
+    monkeypatch.setattr(cluster, "_play_range", fail_first)
+    coordinator = cluster.Coordinator(N, "yes", seed=5, chunk=CHUNK,
+                                      task_chunks=TASK_CHUNKS)
+    result, outcomes = _run(coordinator, _worker("a"), _worker("b"))
+    *_, (_, wins) = sequential_simulate(N, True, 5, chunk=CHUNK)
+    assert result["wins"] == wins
+    assert result["reissued"] >= 1
+    assert sum(isinstance(o, ValueError) for o in outcomes) == 1
+
+
+def test_failed_task_is_reported():
+    # A task the worker cannot play (two doors) must come back as an error
+    # message and end work(), not leave it heartbeating forever
+    seen = []
+
+    async def handle(reader, writer):
+        await cluster._receive(reader)
+        run = {"n": 10, "switch": "yes", "seed": 0, "doors": 2, "reveals": 1, "chunk": 10}
+        await cluster._send(writer, {"type": "task", "task": 0, "run": run, "first": 0,
+                                     "start": 0, "stop": 10})
+        while (message := await cluster._receive(reader)) is not None:
+            seen.append(message["type"])
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            with pytest.raises(ValueError):
+                await asyncio.wait_for(
+                    cluster.work("127.0.0.1", port, processes=1, wait=5), 30)
+            await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+    assert "error" in seen
+
+
+def test_wrong_token_is_refused():
+    coordinator = cluster.Coordinator(CHUNK, "yes", token="secret", chunk=CHUNK)
+
+    async def main():
+        port = await coordinator.start("127.0.0.1", 0)
+        try:
+            with pytest.raises(cluster.ProtocolError):
+                await cluster.work("127.0.0.1", port, processes=1, token="guess", wait=5)
+        finally:
+            await coordinator.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+# Ensemble paths: the checkpoint wins reduceat keeps must be a plain cumsum
+# of the same games sampled at the checkpoints, whatever block boundaries fall
+# between them, and a pool must give the sequential paths.
+import numpy as np
+import pytest
+
+from montyhall import ensemble
+from montyhall.ensemble import _group_paths, _results, log_checkpoints, sequential_ensemble
+from montyhall.parallel import parallel_ensemble
+from montyhall.rng import chunk_rng
+
+
+def _games(seed, index, replicates, n, switch, doors, reveals, block):
+    # Every game of one group, drawn block by block as _group_paths draws them
+    rng = chunk_rng((seed, ensemble._ENSEMBLE, 0), index)
+    blocks = [_results((replicates, min(block, n - start)), switch, rng, doors, reveals)
+              for start in range(0, n, block)]
+    return np.hstack(blocks)
+
+
+@pytest.mark.parametrize("checkpoints", [
+    log_checkpoints(100, 30),
+    np.array([1, 2, 3, 7, 14, 15, 21, 22, 60, 99, 100]),   # block ends, several per block
+    np.array([100]),
+])
+@pytest.mark.parametrize("switch, doors, reveals", [(True, 3, 1), (False, 4, 2),
+                                                    (True, 5, 1)])
+def test_checkpoints_are_a_cumsum(monkeypatch, checkpoints, switch, doors, reveals):
+    monkeypatch.setattr(ensemble, "TRIAL_BLOCK", 7)
+    replicates = 9
+    running = np.cumsum(_games(4, 1, replicates, 100, switch, doors, reveals, 7), axis=1)
+    expected = running[:, checkpoints - 1]
+    done = 0
+    for done, reached, wins in _group_paths(4, 1, replicates, switch, doors, reveals,
+                                            checkpoints):
+        assert wins.shape == (replicates, len(checkpoints))
+        assert reached == np.searchsorted(checkpoints, done, side="right")
+        assert np.array_equal(wins[:, :reached], expected[:, :reached])
+    assert done == 100 and np.array_equal(wins, expected)
+
+
+def test_memory_is_replicates_by_checkpoints(monkeypatch):
+    monkeypatch.setattr(ensemble, "TRIAL_BLOCK", 64)
+    checkpoints = log_checkpoints(5_000, 40)
+    for replicates_done, done, reached, wins in sequential_ensemble(300, 5_000, True, 2,
+                                                                    points=40, chunk=128):
+        assert replicates_done == 300
+        assert wins.shape == (300, len(reached))
+    assert done == 5_000 and np.array_equal(reached, checkpoints)
+
+
+def test_pool_matches_sequential():
+    *_, (replicates, done, checkpoints, wins) = sequential_ensemble(
+        600, 20_000, False, 8, doors=4, reveals=1, points=50, chunk=256)
+    *_, (pool_replicates, pool_done, pool_checkpoints, pool_wins) = parallel_ensemble(
+        600, 20_000, False, 8, 2, doors=4, reveals=1, points=50, chunk=256)
+    assert (pool_replicates, pool_done) == (replicates, done)
+    assert np.array_equal(pool_checkpoints, checkpoints)
+    # The pool stacks groups in completion order
+    assert np.array_equal(np.unique(pool_wins, axis=0), np.unique(wins, axis=0))
+    assert pool_wins.shape == wins.shape == (600, len(checkpoints))
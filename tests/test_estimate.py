@@ -0,0 +1,79 @@
+# The estimators against the exact answers: averaged over many seeds each one
+# must be unbiased, and the standard error it reports must match the spread
+# of its estimates from seed to seed.
+import math
+
+import numpy as np
+import pytest
+
+from montyhall.engine import exact_win_probability
+from montyhall.estimate import (
+    ESTIMATORS, estimate, estimate_chunk, exact_estimate, sequential_estimate,
+)
+
+
+SEEDS = 400
+N = 1_001                   # four chunks of 250 and one odd trial
+CHUNK = 250
+Z = 4.0
+
+
+def _runs(n, switch, estimator, doors, reveals, chunk=CHUNK):
+    # [(trials, win_rate, standard_error, exact)] of one run per seed
+    out = []
+    for seed in range(SEEDS):
+        *_, (done, stats) = sequential_estimate(n, switch, seed, estimator, doors, reveals,
+                                                chunk)
+        out.append((done, *estimate(stats, estimator, doors),
+                    exact_estimate(stats, estimator, switch, doors, reveals)))
+    return out
+
+
+@pytest.mark.parametrize("doors, reveals", [(3, 1), (4, 1), (5, 2), (4, 0)])
+@pytest.mark.parametrize("switch", [True, False])
+@pytest.mark.parametrize("estimator", ESTIMATORS)
+def test_unbiased_with_honest_errors(estimator, switch, doors, reveals):
+    exact = float(exact_win_probability(doors, reveals, switch))
+    done, rates, errors, exacts = (np.array(c) for c in zip(*_runs(N, switch, estimator,
+                                                                     doors, reveals)))
+    assert (done == (N - 1 if estimator == "antithetic" else N)).all()
+    spread = rates.std(ddof=1)
+    if exacts.all():
+        assert np.allclose(rates, exact, rtol=0, atol=1e-12) and (errors == 0).all()
+        return
+    assert not exacts.any()
+    assert abs(rates.mean() - exact) <= Z * spread / math.sqrt(SEEDS)
+    # The spread of a sample SD over 400 seeds is about 3.5%
+    assert 0.8 <= np.sqrt(np.mean(errors ** 2)) / spread <= 1.25
+
+
+def test_only_stratified_stay_or_one_door_is_exact():
+    for doors, reveals, switch, expected in [(3, 1, True, True), (3, 1, False, True),
+                                             (5, 2, False, True), (5, 2, True, False)]:
+        *_, (_, stats) = sequential_estimate(100, switch, 1, "stratified", doors, reveals)
+        assert exact_estimate(stats, "stratified", switch, doors, reveals) is expected
+    for estimator in ("plain", "antithetic"):
+        *_, (_, stats) = sequential_estimate(100, False, 1, estimator)
+        assert not exact_estimate(stats, estimator, False)
+
+
+def test_odd_antithetic_chunks():
+    # The odd trial out is neither played nor counted
+    assert estimate_chunk(1, 0, 1, True, "antithetic")[0] == 0
+    done, stats = estimate_chunk(1, 0, 3, True, "antithetic")
+    assert done == stats[0] == 2 and stats[1:].sum() == 1
+    rate, se = estimate(stats, "antithetic")
+    assert rate in (0, 0.5, 1) and math.isnan(se)
+    assert all(math.isnan(x) for x in estimate([0, 0, 0, 0], "antithetic"))
+
+
+@pytest.mark.parametrize("estimator, n", [("plain", 1), ("stratified", 2),
+                                          ("stratified", 4), ("antithetic", 3)])
+def test_fewer_trials_than_doors(estimator, n):
+    # Five doors: a stratified run this short samples at most one pick that
+    # hides the car, and is never exact, yet still unbiased
+    exact = float(exact_win_probability(5, 1, True))
+    done, rates, errors, exacts = zip(*_runs(n, True, estimator, 5, 1))
+    assert set(done) == {n - n % 2 if estimator == "antithetic" else n}
+    assert not any(exacts)
+    assert abs(np.mean(rates) - exact) <= Z * np.std(rates, ddof=1) / math.sqrt(SEEDS)
@@ -0,0 +1,99 @@
+# Seeded Monte Carlo against the exact answers: every estimate has to fall in
+# a Wilson interval around it. z = 4 keeps the check tight (about 1 in 16,000
+# for a correct engine) while leaving room for many combinations.
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from montyhall.engine import (
+    COMPARE_FIELDS, compare_batch, exact_win_probability, simulate_batch,
+)
+from montyhall.exact import exact_given, exact_outcomes
+from montyhall.rng import chunk_rng
+from montyhall.stats import wilson_interval
+
+
+N = 200_000
+Z = 4.0
+SEED = 335
+
+DOORS_REVEALS = [(3, 1), (3, 0), (4, 1), (4, 2), (5, 0), (6, 3), (10, 8), (300, 200)]
+
+
+def _agrees(wins, n, exact):
+    low, high = wilson_interval(wins, n, Z)
+    return low <= float(exact) <= high
+
+
+@pytest.mark.parametrize("doors, reveals", DOORS_REVEALS)
+@pytest.mark.parametrize("switch", [True, False])
+def test_simulate_batch(doors, reveals, switch):
+    rng = chunk_rng(SEED, doors * 1000 + reveals)
+    wins = simulate_batch(N, switch, rng, doors, reveals)
+    assert _agrees(wins, N, exact_win_probability(doors, reveals, switch))
+
+
+# The biased tree grows with the doors, so it only gets the smaller games
+HOSTS = [(d, k, "standard", None) for d, k in DOORS_REVEALS] + [
+    (d, k, "biased", bias) for d, k in DOORS_REVEALS if d <= 10 for bias in (1, 0.3)
+]
+
+
+@pytest.mark.parametrize("doors, reveals, host, bias", HOSTS)
+def test_compare_batch(doors, reveals, host, bias):
+    # A biased host changes which doors open, not how often staying or
+    # switching wins overall, so the simulated standard host matches both
+    tallies = dict(zip(COMPARE_FIELDS,
+                       compare_batch(N, chunk_rng(SEED, reveals), doors, reveals)))
+    exact = exact_outcomes(doors, reveals, host, bias)
+    for name in ("stay", "switch", "random"):
+        assert _agrees(int(tallies[name]), N, exact[name]), name
+    assert tallies["switch_only"] - tallies["stay_only"] == \
+        tallies["switch"] - tallies["stay"]
+
+
+def test_exact_win_probability_is_the_standard_host():
+    for doors, reveals in DOORS_REVEALS:
+        exact = exact_outcomes(doors, reveals)
+        assert exact["switch"] == exact_win_probability(doors, reveals, True)
+        assert exact["stay"] == exact_win_probability(doors, reveals, False)
+        assert exact["car_shown"] == 0
+
+
+def _random_host(n, doors, reveals, rng):
+    # (stay wins, switch wins, car shown) for a host who opens `reveals` of
+    # the unpicked doors at random; the pick is door 0
+    car = rng.integers(0, doors, size=n)
+    # Random keys per unpicked door; the smallest `reveals` are opened
+    keys = rng.random((n, doors - 1))
+    order = np.argsort(keys, axis=1) + 1
+    opened = order[:, :reveals]
+    shown = (opened == car[:, None]).any(axis=1)
+    closed = order[:, reveals:]
+    lands = closed[np.arange(n), rng.integers(0, doors - 1 - reveals, size=n)]
+    return (int(np.count_nonzero(~shown & (car == 0))),
+            int(np.count_nonzero(~shown & (lands == car))),
+            int(np.count_nonzero(shown)))
+
+
+@pytest.mark.parametrize("doors, reveals", [(3, 1), (4, 1), (4, 2), (5, 2), (6, 3)])
+def test_random_hosts(doors, reveals):
+    stay, switch, shown = _random_host(N, doors, reveals, chunk_rng(SEED + 1, doors))
+    fall = exact_outcomes(doors, reveals, "fall")
+    assert _agrees(stay, N, fall["stay"])
+    assert _agrees(switch, N, fall["switch"])
+    assert _agrees(shown, N, fall["car_shown"])
+    # The ignorant host replays games that showed the car
+    ignorant = exact_outcomes(doors, reveals, "ignorant")
+    assert _agrees(stay, N - shown, ignorant["stay"])
+    assert _agrees(switch, N - shown, ignorant["switch"])
+
+
+def test_biased_host_given_the_door_opened():
+    # Always opening the lowest goat door: seeing door 2 open means door 1
+    # hides the car, so switching wins for sure (the classic variant)
+    given = exact_given({2}, host="biased", bias=1)
+    assert given["switch"] == 1 and given["probability"] == Fraction(1, 3)
+    given = exact_given({1}, host="biased", bias=1)
+    assert given["stay"] == given["switch"] == Fraction(1, 2)
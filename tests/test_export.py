@@ -0,0 +1,75 @@
+# Every export format read back with load(): the same columns, in order,
+# with the same values. Arrow and Parquet need pyarrow and are skipped
+# without it.
+import numpy as np
+import pytest
+
+from montyhall.export import (
+    SERIES_COLUMNS, TableWriter, load, open_trace_writer, write_table,
+)
+from montyhall.trace import FIELDS, record, unpack
+
+
+FORMATS = [".csv", ".npy", ".arrow", ".feather", ".parquet"]
+
+
+def _needs(ext):
+    if ext in (".arrow", ".feather", ".parquet"):
+        pytest.importorskip("pyarrow")
+
+
+def _columns(loaded):
+    # {name: array} of whatever load() returned, in file order
+    if isinstance(loaded, dict):
+        return loaded
+    if isinstance(loaded, np.ndarray):
+        return {name: np.asarray(loaded[name]) for name in loaded.dtype.names}
+    return {name: loaded.column(name).to_numpy() for name in loaded.column_names}
+
+
+@pytest.mark.parametrize("ext", FORMATS)
+def test_series_round_trip(tmp_path, ext):
+    _needs(ext)
+    trials = np.arange(1, 1_001, dtype=np.int64) * 37
+    wins = (trials * 2) // 3
+    rates = wins / trials
+    path = str(tmp_path / f"series{ext}")
+    with TableWriter(path, SERIES_COLUMNS, len(trials)) as writer:
+        writer.append(trials[0], wins[0], rates[0])
+        # Streamed in uneven pieces, as a run writes it
+        for start, stop in ((1, 10), (10, 600), (600, 1_000)):
+            writer.extend(trials[start:stop], wins[start:stop], rates[start:stop])
+    columns = _columns(load(path))
+    assert list(columns) == [name for name, _ in SERIES_COLUMNS]
+    for name, expected in zip(columns, (trials, wins, rates)):
+        assert np.array_equal(columns[name], expected), name
+
+
+@pytest.mark.parametrize("ext", FORMATS)
+def test_summary_round_trip(tmp_path, ext):
+    _needs(ext)
+    rows = [{"switch": True, "doors": 3, "seed": 1, "win_rate": 2 / 3, "exact": "2/3"},
+            {"switch": False, "doors": 5, "seed": 2, "win_rate": 0.2, "exact": "1/5"}]
+    path = str(tmp_path / f"summary{ext}")
+    write_table(path, rows)
+    columns = _columns(load(path))
+    assert list(columns) == list(rows[0])
+    for name, values in columns.items():
+        assert list(values) == [row[name] for row in rows], name
+
+
+@pytest.mark.parametrize("ext", [".npy", ".arrow", ".parquet"])
+def test_trace_round_trip(tmp_path, ext):
+    _needs(ext)
+    path = str(tmp_path / f"trace{ext}")
+    store = open_trace_writer(path, 5_000)
+    done, wins = record(5_000, True, 3, store)
+    store.close()
+    loaded = load(path)
+    if ext == ".npy":
+        fields = unpack(np.asarray(loaded))
+    else:
+        fields = _columns(loaded)
+        assert list(fields) == list(FIELDS)
+    assert done == 5_000 and int(np.sum(fields["won"])) == wins
+    assert len(fields["won"]) == 5_000
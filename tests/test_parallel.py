@@ -0,0 +1,36 @@
+# A seeded run is bit-reproducible whatever the worker count: the pool plays
+# exactly the chunks the sequential loop does, only in completion order.
+import numpy as np
+
+from montyhall.engine import sequential_compare, sequential_simulate
+from montyhall.parallel import parallel_compare, parallel_simulate
+
+
+N = 95_000                  # nine chunks of 10,000 and a partial one
+CHUNK = 10_000
+
+
+def _steps(totals):
+    # (trials, wins) each yield added, sorted so the order chunks finished in
+    # does not matter
+    steps, before = [], (0, 0)
+    for done, wins in totals:
+        steps.append((done - before[0], wins - before[1]))
+        before = done, wins
+    return sorted(steps)
+
+
+def test_pool_plays_the_sequential_chunks():
+    sequential = list(sequential_simulate(N, True, 12, doors=5, reveals=2, chunk=CHUNK))
+    first = list(parallel_simulate(N, True, 12, 2, doors=5, reveals=2, chunk=CHUNK))
+    again = list(parallel_simulate(N, True, 12, 2, doors=5, reveals=2, chunk=CHUNK))
+    assert first[-1] == again[-1] == sequential[-1]
+    assert _steps(first) == _steps(again) == _steps(sequential)
+    assert [done for done, _ in first] == sorted(done for done, _ in first)
+
+
+def test_pool_compare_matches_sequential():
+    *_, (done, tallies) = sequential_compare(N, 4, 4, 1, chunk=CHUNK)
+    *_, (pool_done, pool_tallies) = parallel_compare(N, 4, 2, 4, 1, chunk=CHUNK)
+    assert pool_done == done
+    assert np.array_equal(pool_tallies, tallies)
@@ -0,0 +1,51 @@
+# Chunk streams: jumping straight to chunk i draws what a Philox started at
+# counter i << 128 draws, and seeds, keys and chunks never share a stream.
+import numpy as np
+import pytest
+
+from montyhall.rng import chunk_rng, locate, seed_key
+
+
+def _draws(rng, size=1_000):
+    return rng.integers(0, 2**63, size=size)
+
+
+@pytest.mark.parametrize("seed", [0, 7, 2**100, (7, 1, 0)])
+def test_chunk_is_philox_at_its_counter(seed):
+    for i in (0, 1, 5, 2**20):
+        by_hand = np.random.Generator(np.random.Philox(key=seed_key(seed), counter=i << 128))
+        assert np.array_equal(_draws(chunk_rng(seed, i)), _draws(by_hand))
+
+
+def test_jumping_ahead_is_the_same_as_playing_in_order():
+    # The same chunk drawn before or after others, or in a fresh generator
+    in_order = {i: _draws(chunk_rng(3, i)) for i in range(6)}
+    for i in (5, 2, 0, 4):
+        assert np.array_equal(_draws(chunk_rng(3, i)), in_order[i])
+
+
+# Plain seeds and the stream tuples estimators, tournaments and ensembles use,
+# including ones SeedSequence alone would give the same key
+SEEDS = [0, 1, 2, 5, 2**32 + 5, (5, 1), (5, 1, 0), (5, 2), (5, 2, 0), (5, 1, 1),
+         (2**32 + 5, 1), (1,), (1, 0)]
+
+
+def test_keys_are_distinct():
+    assert len({seed_key(seed) for seed in SEEDS}) == len(SEEDS)
+    with pytest.raises(ValueError):
+        seed_key((1, -1))
+
+
+def test_streams_do_not_overlap():
+    streams = [chunk_rng(seed, i) for seed in SEEDS[:8] for i in range(3)]
+    seen = np.concatenate([_draws(rng, 10_000) for rng in streams])
+    # 240,000 63-bit values: a repeat between streams would all but surely
+    # mean two of them are the same sequence
+    assert len(np.unique(seen)) == len(seen)
+
+
+def test_locate_round_trips():
+    for chunk in (1, 7, 2**20):
+        for trial in (0, 1, chunk - 1, chunk, 5 * chunk + 3, 10**12):
+            index, offset = locate(trial, chunk)
+            assert 0 <= offset < chunk and index * chunk + offset == trial
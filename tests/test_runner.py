@@ -0,0 +1,82 @@
+# Checkpoints: a run cancelled part way, saved and loaded again must finish
+# with exactly the totals of one that was never interrupted, on one process
+# or a pool; checkpoints it cannot trust are refused.
+import json
+
+import pytest
+
+from montyhall.engine import sequential_simulate
+from montyhall.runner import CHECKPOINT_VERSION, RunControl, SimulationRun
+
+
+N = 200_000
+CHUNK = 10_000
+
+
+class CancelAt:
+    # Progress sink that cancels the run once `stop` trials are done
+    def __init__(self, control, stop):
+        self.control = control
+        self.stop = stop
+
+    def publish(self, done, wins, interval=None, final=False):
+        if done >= self.stop:
+            self.control.cancel()
+
+
+def _interrupted(path, seed, workers):
+    control = RunControl()
+    run = SimulationRun(N, True, seed, doors=4, reveals=1, chunk=CHUNK)
+    assert not run.run(control, CancelAt(control, 5 * CHUNK), str(path), workers=workers)
+    return run
+
+
+@pytest.mark.parametrize("workers, resume_workers", [(1, 1), (2, 2), (2, 1), (1, 2)])
+def test_resumed_run_matches_uninterrupted(tmp_path, workers, resume_workers):
+    path = tmp_path / "run.json"
+    stopped = _interrupted(path, 9, workers)
+    assert 5 * CHUNK <= stopped.done < N
+
+    run = SimulationRun.load(str(path))
+    assert (run.done, run.wins, run.next_chunk) == (stopped.done, stopped.wins,
+                                                    stopped.next_chunk)
+    assert run.run(checkpoint=str(path), workers=resume_workers)
+    *_, (done, wins) = sequential_simulate(N, True, 9, doors=4, reveals=1, chunk=CHUNK)
+    assert (run.done, run.wins) == (done, wins)
+    assert SimulationRun.load(str(path)).finished
+
+
+def _checkpoint(tmp_path):
+    path = tmp_path / "run.json"
+    _interrupted(path, 3, 1)
+    return json.loads(path.read_text())
+
+
+def _broken(state):
+    yield dict(state, version=1)
+    yield dict(state, version=CHECKPOINT_VERSION + 1)
+    yield dict(state, rng=dict(state["rng"], algorithm="mt19937"))
+    yield {k: v for k, v in state.items() if k != "wins"}
+    yield dict(state, rng={"algorithm": state["rng"]["algorithm"]})
+    yield dict(state, rng=None)
+    yield dict(state, n="200000")
+    yield dict(state, switch=1)
+    yield dict(state, doors=2)
+    yield dict(state, wins=state["done"] + 1)
+    yield dict(state, done=state["done"] - 1)
+    yield dict(state, rng=dict(state["rng"], next_chunk=state["rng"]["next_chunk"] + 1))
+    yield dict(state, chunk=0)
+    yield [state]
+
+
+def test_bad_checkpoints_are_refused(tmp_path):
+    state = _checkpoint(tmp_path)
+    assert SimulationRun.from_dict(state).to_dict() == state
+    for broken in _broken(state):
+        with pytest.raises(ValueError):
+            SimulationRun.from_dict(broken)
+
+    path = tmp_path / "torn.json"
+    path.write_text(json.dumps(state)[:40])
+    with pytest.raises(ValueError):
+        SimulationRun.load(str(path))
@@ -0,0 +1,135 @@
+# The HTTP service on localhost: submitting a job, following it over
+# server-sent events, a full queue and requests it must turn away.
+import asyncio
+import json
+
+from montyhall import server
+from montyhall.engine import sequential_compare, sequential_simulate
+
+
+CHUNK = 1_000
+
+
+def _serve(test, **options):
+    # Runs test(port) against a fresh service and stops it afterwards
+    async def main():
+        service = server.SimulationService(**dict({"workers": 1, "chunk": CHUNK}, **options))
+        port = await service.start("127.0.0.1", 0)
+        try:
+            return await asyncio.wait_for(test(port), 60)
+        finally:
+            await service.stop()
+    return asyncio.run(main())
+
+
+async def _raw(port, data):
+    # Sends `data` as is; returns (status, headers, body bytes)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+async def _request(port, method, path, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode()
+    status, headers, body = await _raw(
+        port, f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n"
+              .encode() + body)
+    return status, headers, body
+
+
+async def _json(port, method, path, payload=None):
+    status, headers, body = await _request(port, method, path, payload)
+    return status, headers, json.loads(body)
+
+
+def _events(body):
+    # [(event, data)] from a text/event-stream body
+    out = []
+    for block in body.decode().split("\n\n"):
+        if block.strip():
+            kind, data = block.split("\n")
+            out.append((kind.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return out
+
+
+def test_submit_and_follow_events():
+    async def test(port):
+        status, headers, job = await _json(port, "POST", "/simulate",
+                                           {"n": 20_000, "seed": 5, "doors": 4})
+        assert status == 202
+        assert headers["Location"] == f"/runs/{job['id']}"
+        status, _, body = await _request(port, "GET", f"/runs/{job['id']}/events")
+        assert status == 200
+        status, _, final = await _json(port, "GET", f"/runs/{job['id']}")
+        return _events(body), final
+
+    events, final = _serve(test)
+    *progress, (kind, end) = events
+    assert kind == "end" and all(k == "progress" for k, _ in progress)
+    assert [e["trials"] for _, e in progress] == sorted(e["trials"] for _, e in progress)
+    *_, (done, wins) = sequential_simulate(20_000, True, 5, doors=4, chunk=CHUNK)
+    assert end["state"] == final["state"] == "done"
+    assert end["trials"] == done and end["wins"] == final["wins"] == wins
+
+
+def test_compare_with_no_reveals():
+    async def test(port):
+        status, _, job = await _json(port, "POST", "/simulate",
+                                     {"n": 5_000, "seed": 2, "switch": "compare",
+                                      "doors": 4, "reveals": 0})
+        assert status == 202
+        _, _, body = await _request(port, "GET", f"/runs/{job['id']}/events")
+        return _events(body)[-1][1]
+
+    end = _serve(test)
+    *_, (_, tallies) = sequential_compare(5_000, 2, 4, 0, chunk=CHUNK)
+    assert list(end["tallies"].values()) == tallies.tolist()
+
+
+def test_full_queue_answers_503():
+    # No runners, so the one queued job stays there
+    async def test(port):
+        first = await _json(port, "POST", "/simulate", {"n": 10})
+        second = await _json(port, "POST", "/simulate", {"n": 10})
+        return first, second
+
+    (status, _, _), (full, headers, error) = _serve(test, queue=1, concurrency=0)
+    assert status == 202
+    assert full == 503 and headers["Retry-After"] == "1" and "full" in error["error"]
+
+
+def test_bad_input():
+    bad_bodies = [
+        b"not json", b"[1, 2]", b'{"n": 0}', b'{"n": 1.5}', b'{"doors": 2}',
+        b'{"doors": 4, "reveals": 3}', b'{"reveals": -1}', b'{"switch": "maybe"}',
+        b'{"colour": "red"}',
+    ]
+
+    async def test(port):
+        out = []
+        for body in bad_bodies:
+            out.append(await _raw(port, b"POST /simulate HTTP/1.1\r\nContent-Length: "
+                                  + str(len(body)).encode() + b"\r\n\r\n" + body))
+        for length in (b"-3", b"abc", b"1_0", b" +4"):
+            out.append(await _raw(port, b"POST /simulate HTTP/1.1\r\nContent-Length: "
+                                  + length + b"\r\n\r\n{}"))
+        out.append(await _raw(port, b"garbage\r\n\r\n"))
+        return out, [await _request(port, "GET", "/simulate"),
+                     await _request(port, "GET", "/runs/nope"),
+                     await _request(port, "GET", "/nowhere")]
+
+    rejected, others = _serve(test)
+    for status, _, body in rejected:
+        assert status == 400 and json.loads(body)["error"]
+    assert [status for status, _, _ in others] == [405, 404, 404]
+
+
+def test_reveals_zero_is_allowed():
+    job = server.parse_job(b'{"doors": 3, "reveals": 0}')
+    assert (job.doors, job.reveals) == (3, 0)
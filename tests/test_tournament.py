@@ -0,0 +1,65 @@
+# Learning players: each strategy follows its own rule and ends where it
+# should, and a pool gives exactly the sequential curves.
+import numpy as np
+
+from montyhall.parallel import parallel_tournament
+from montyhall.rng import chunk_rng
+from montyhall.tournament import STRATEGIES, _Agents, _deal, sequential_tournament
+
+
+AGENTS = 2_000
+
+
+def _final(agents, rounds, seed, strategies, **options):
+    *_, (done, played, wins, switches) = sequential_tournament(agents, rounds, seed,
+                                                               strategies, **options)
+    assert played == rounds and (done == agents).all()
+    return wins / agents, switches / agents
+
+
+def test_win_stay_lose_shift_follows_its_rule():
+    agents, rounds = 500, 200
+    players = _Agents("win_stay_lose_shift", agents, chunk_rng(1, 0), 0.1)
+    stay_wins, switch_wins = _deal(chunk_rng(2, 0), rounds, agents, 3, 1)
+    before = None
+    for r in range(rounds):
+        players.draw(1)
+        switched = players.choose(0).copy()
+        if before is not None:
+            # Repeat after a win, change after a loss
+            assert np.array_equal(switched, before[0] == before[1])
+        won = (switched & switch_wins[r]) | (~switched & stay_wins[r])
+        players.learn(switched, won)
+        before = switched, won
+
+
+def test_win_stay_lose_shift_settles_at_two_thirds():
+    # It switches next round exactly when this round's switch won or stay
+    # lost, which is 2/3 whatever it did
+    _, switching = _final(AGENTS, 400, 3, ("win_stay_lose_shift",))
+    assert abs(switching[0, 100:].mean() - 2 / 3) < 0.01
+
+
+def test_greedy_without_exploring_ends_up_switching():
+    # Most agents settle on switching; the few whose early switches lost
+    # stay for good, since nothing makes them try switching again
+    _, switching = _final(AGENTS, 300, 4, ("epsilon_greedy",), epsilon=0)
+    assert abs(switching[0, 0] - 0.5) < 0.05
+    assert switching[0, -1] > 0.9
+    assert (np.diff(switching[0, 100:]) == 0).mean() > 0.5
+
+
+def test_thompson_switch_rate_tends_to_one():
+    _, switching = _final(AGENTS, 500, 5, ("thompson",))
+    early, late = switching[0, :20].mean(), switching[0, -20:].mean()
+    assert early < 0.8 < 0.97 < late
+
+
+def test_pool_matches_sequential():
+    options = dict(doors=4, reveals=1, epsilon=0.2, chunk=700)
+    *_, (done, rounds, wins, switches) = sequential_tournament(AGENTS, 150, 6, STRATEGIES,
+                                                               **options)
+    *_, (pool_done, pool_rounds, pool_wins, pool_switches) = parallel_tournament(
+        AGENTS, 150, 6, STRATEGIES, 2, **options)
+    assert np.array_equal(pool_done, done) and pool_rounds == rounds
+    assert np.array_equal(pool_wins, wins) and np.array_equal(pool_switches, switches)
@@ -0,0 +1,31 @@
+# TraceStore's running totals must agree with counting the bytes.
+import numpy as np
+
+from montyhall.trace import TraceStore, trace_chunk
+
+
+def _counted(store, start=0, stop=None):
+    # tally() the slow way, one trial at a time
+    traces = store[start:stop]
+    won, switched = (traces >> 7) & 1, (traces >> 6) & 1
+    return {"trials": len(traces), "wins": int(won.sum()), "switched": int(switched.sum()),
+            "switch_wins": int((won & switched).sum())}
+
+
+def test_running_totals(tmp_path):
+    store = TraceStore(capacity=4)
+    for i in range(5):
+        store.extend(trace_chunk(1, i, 1_000 + i, None))
+    store.append(0, 1, 2, True, True)
+    assert store.tally() == _counted(store)
+    assert store.tally(10, 2_500) == _counted(store, 10, 2_500)
+
+    path = str(tmp_path / "trace.npy")
+    saved = TraceStore(len(store) + 100, path)
+    saved.extend(store[:])
+    saved.flush()
+    opened = TraceStore.open(path, mode="r+")
+    assert len(opened) == len(store)
+    assert opened.tally() == store.tally()
+    opened.extend(np.asarray([0b11100001], dtype=np.uint8))
+    assert opened.tally() == _counted(opened)